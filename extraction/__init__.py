@@ -0,0 +1 @@
+"""Extraction helpers shared by the GST and TDS Streamlit tools."""
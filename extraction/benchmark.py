@@ -0,0 +1,154 @@
+"""Throughput benchmark of the extractors on synthetic PDFs.
+
+    python -m extraction.benchmark gstr3b-2025 form24q --files 20 --pages 6
+
+Generates PDFs of each document type with ``extraction.synthetic`` and times
+every stage separately: decoding the pages of GST returns, each table
+extractor on the decoded pages (``extract_tables_4A_4B``,
+``extract_table_4_2025``, ...), each reading and parsing function of the TDS
+tools (``extract_details_from_form24``, ``process_hdfc_bank``, ...) and the
+whole extraction of a file as the tools run it. Every stage runs over all
+files, the fastest of ``--repeat`` runs is reported as files/s and pages/s.
+
+Nothing is read from or written to the extraction cache or the corpus, and
+no network access is needed.
+"""
+import argparse
+import time
+from functools import partial
+from io import BytesIO
+from pathlib import Path
+
+import fitz  # PyMuPDF
+import pandas as pd
+import pdfplumber
+
+from extraction.cli import extractor_for, tables_for
+from extraction.corpus import CorpusPage
+from extraction.document import ParsedDocument, TextDocument
+from extraction.incremental import extract_document_tables
+from extraction.synthetic import GENERATORS
+from extraction.tds import (
+    extract_details_from_form24,
+    extract_details_from_pdf,
+    extract_pdf_details,
+    extract_table_from_pdf,
+    parse_hdfc_bank_text,
+    parse_income_tax_text,
+    process_hdfc_bank,
+    process_income_tax,
+)
+
+# Document type -> (function, untimed preparation of its input from a PDF file object)
+TDS_STAGES = {
+    "Form24Q": [(extract_details_from_form24, None)],
+    "Form26Q & Form27Q": [(extract_details_from_pdf, None), (extract_table_from_pdf, None)],
+    "HDFC Bank": [(process_hdfc_bank, None), (parse_hdfc_bank_text, process_hdfc_bank)],
+    "Income Tax Department with Tax Breakup": [
+        (process_income_tax, None),
+        (parse_income_tax_text, process_income_tax),
+    ],
+    "Income Tax Department without Tax Breakup": [(extract_pdf_details, None)],
+}
+
+
+def decode_document(doc_type, pdf_bytes):
+    """Pages of a GST return decoded the way its extractors read them, detached from the PDF."""
+    if doc_type == "GSTR-1":
+        return TextDocument.from_bytes(pdf_bytes)
+    with pdfplumber.open(BytesIO(pdf_bytes)) as pdf:
+        # No extractor reads the words, so they are not part of decoding
+        return ParsedDocument.from_pages([
+            CorpusPage(page.text, [], page.tables, page.table) for page in ParsedDocument(pdf).pages
+        ])
+
+
+def _identity(pdf_bytes):
+    return pdf_bytes
+
+
+def _pdf_file(pdf_bytes, prepare=None):
+    pdf_file = BytesIO(pdf_bytes)
+    return pdf_file if prepare is None else prepare(pdf_file)
+
+
+def benchmark_stages(doc_type):
+    """``(name, prepare, run)`` of every timed stage; ``prepare(pdf_bytes)`` builds the input of ``run`` untimed."""
+    tables = tables_for(doc_type)
+    if tables is not None:
+        decoded = partial(decode_document, doc_type)
+        stages = [("decode", _identity, decoded)]
+        for key, steps in tables.items():
+            stages.append((steps[0].__name__, decoded, partial(extract_document_tables, tables={key: steps})))
+    else:
+        stages = [
+            (func.__name__, partial(_pdf_file, prepare=prepare), func)
+            for func, prepare in TDS_STAGES[doc_type]
+        ]
+    stages.append(("end to end", _identity, extractor_for(doc_type)))
+    return stages
+
+
+def time_stage(prepare, run, pdfs, repeat=3):
+    """Fastest wall time in seconds of ``run`` over all PDFs, out of ``repeat`` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        inputs = [prepare(pdf_bytes) for pdf_bytes in pdfs]
+        start = time.perf_counter()
+        for item in inputs:
+            run(item)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def page_count(pdf_bytes):
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as pdf:
+        return pdf.page_count
+
+
+def run_benchmark(name, files=5, pages=3, repeat=3, seed=0):
+    """Rows of the report for one command-line document type name."""
+    doc_type, generate = GENERATORS[name]
+    pdfs = [generate(pages, seed + number) for number in range(files)]
+    total_pages = sum(page_count(pdf_bytes) for pdf_bytes in pdfs)
+    rows = []
+    for stage, prepare, run in benchmark_stages(doc_type):
+        seconds = time_stage(prepare, run, pdfs, repeat)
+        rows.append({
+            "Document": doc_type,
+            "Stage": stage,
+            "Files": files,
+            "Pages": total_pages,
+            "Seconds": seconds,
+            "Files/s": files / seconds if seconds else float("inf"),
+            "Pages/s": total_pages / seconds if seconds else float("inf"),
+        })
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m extraction.benchmark", description="Time the extractors on synthetic PDFs.")
+    parser.add_argument("doc_types", nargs="*", metavar="doc_type", help=f"document types to benchmark: {', '.join(GENERATORS)} (default: all)")
+    parser.add_argument("-n", "--files", type=int, default=5, help="PDFs per document type (default: %(default)s)")
+    parser.add_argument("-p", "--pages", type=int, default=3, help="minimum pages per PDF (default: %(default)s)")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="runs per stage, the fastest is reported (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first generated PDF (default: %(default)s)")
+    parser.add_argument("-o", "--output", type=Path, help="also write the report to this CSV file")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.doc_types if name not in GENERATORS]
+    if unknown:
+        parser.error(f"unknown document type: {', '.join(unknown)}")
+
+    rows = []
+    for name in args.doc_types or GENERATORS:
+        rows.extend(run_benchmark(name, args.files, args.pages, args.repeat, args.seed))
+    report = pd.DataFrame(rows)
+    print(report.to_string(index=False, float_format=lambda value: f"{value:.3f}"))
+    if args.output:
+        report.to_csv(args.output, index=False)
+        print(f"Wrote {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,146 @@
+"""Disk-backed cache of extraction results keyed by PDF content.
+
+The same returns and challans are uploaded again and again, so results are
+stored under the SHA-256 of the PDF bytes together with the extractor version
+of the document type. GSTR-1 and GSTR-3B results are stored table by table,
+each under the fingerprint of its own extractor (see
+``extraction.incremental``), so a changed extractor only invalidates its
+table. Entries are pickles in a shared directory, which keeps
+them across Streamlit restarts and between sessions. The directory is bounded
+in size and the least recently used entries are removed first.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = Path(os.environ.get("EXTRACTION_CACHE_DIR", Path.home() / ".cache" / "tds_gst_extraction"))
+DEFAULT_MAX_BYTES = int(os.environ.get("EXTRACTION_CACHE_MAX_MB", "512")) * 1024 * 1024
+
+# Bump a version whenever the extractors of that document type change,
+# so results produced by the old code are no longer returned. The tables
+# of GST returns are versioned by the fingerprints of their extractors.
+EXTRACTOR_VERSIONS = {
+    "Form24Q": "2",
+    "Form26Q & Form27Q": "2",
+    "HDFC Bank": "2",
+    "Income Tax Department with Tax Breakup": "1",
+    "Income Tax Department without Tax Breakup": "1",
+}
+
+
+def content_hash(data):
+    """SHA-256 hex digest of the PDF bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class ExtractionCache:
+    """Size-bounded LRU cache of extraction results on disk."""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._size = None
+
+    def _path(self, *key):
+        key = hashlib.sha256("\0".join(key).encode()).hexdigest()
+        return self.directory / f"{key}.pkl"
+
+    def get(self, doc_type, digest):
+        """Return the cached result for a document, or None."""
+        return self._load(self._path(doc_type, EXTRACTOR_VERSIONS[doc_type], digest))
+
+    def put(self, doc_type, digest, result):
+        """Cache the result for a document, unless it is a TDS extractor's "Error" frame."""
+        # Failures may depend on the environment or be fixed without a version bump,
+        # so they are extracted again next time rather than served from the cache
+        if "Error" in getattr(result, "columns", ()):
+            return
+        self._store(self._path(doc_type, EXTRACTOR_VERSIONS[doc_type], digest), result)
+
+    def get_table(self, doc_type, table, version, digest):
+        """Return one cached table of a document, extracted by the extractor ``version``, or None."""
+        return self._load(self._path(doc_type, table, version, digest))
+
+    def put_table(self, doc_type, table, version, digest, value):
+        self._store(self._path(doc_type, table, version, digest), value)
+
+    def _load(self, path):
+        try:
+            with open(path, "rb") as f:
+                result = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            path.unlink(missing_ok=True)
+            return None
+        # The modification time is the recency used for eviction
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return result
+
+    def _store(self, path, result):
+        try:
+            replaced = path.stat().st_size
+        except FileNotFoundError:
+            replaced = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        if self._size is None:
+            self._size = self._disk_usage()
+        else:
+            self._size += path.stat().st_size - replaced
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def get_or_extract(self, doc_type, data, extract, digest=None):
+        """Return the cached result for ``data`` or run ``extract()`` and cache it.
+
+        Results reporting an error are returned but not cached. Pass ``digest`` when the content hash of ``data`` is already known.
+        """
+        if digest is None:
+            digest = content_hash(data)
+        result = self.get(doc_type, digest)
+        if result is None:
+            result = extract()
+            self.put(doc_type, digest, result)
+        return result
+
+    def _entries(self):
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".pkl"):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _disk_usage(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        # Other sessions share the directory, so recount before deleting anything
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._size = total
@@ -0,0 +1,281 @@
+"""Headless batch extraction of whole folders of GSTR and TDS PDFs.
+
+    python -m extraction gstr3b-2025 "clients/Q1/**/*.pdf" -o q1_gstr3b.xlsx --workers 8
+
+Takes files, directories (searched recursively for PDFs) or glob patterns,
+runs the same extractors as the Streamlit tools in a pool of worker
+processes, reuses the on-disk extraction cache, and writes either the
+workbook the tools offer for download, streamed row by row, or one CSV,
+Parquet or Arrow file per sheet. A summary of throughput and failed files is
+printed at the end; the exit status is 1 when any file failed.
+
+With ``--corpus`` the decoded pages of GSTR-1 and GSTR-3B PDFs are kept in the
+raw-text corpus, and ``--replay`` runs the current extractors over every
+document of the type in the corpus without opening any PDF:
+
+    python -m extraction gstr3b-2025 --replay -o gstr3b_2025_replayed.xlsx
+"""
+import argparse
+import glob
+import sys
+import time
+from functools import partial
+from io import BytesIO
+from pathlib import Path
+
+import pandas as pd
+
+from extraction.cache import ExtractionCache, content_hash
+from extraction.corpus import DEFAULT_CORPUS_DIR, Corpus, replay_document
+from extraction.export import EXPORT_FORMATS, file_stem, frame_bytes, write_workbook
+from extraction.gstr1 import GSTR1_TABLES, extract_gstr1, extract_gstr1_document, gstr1_frames
+from extraction.gstr3b import GSTR3B_TABLES, extract_gstr3b, extract_gstr3b_document, gstr3b_frames
+from extraction.incremental import cached_tables, store_tables
+from extraction.money import rupees_frame
+from extraction.parallel import DEFAULT_WORKERS, extract_in_pool
+from extraction.tds import extract_tds_document
+from extraction.warehouse import DEFAULT_WAREHOUSE_PATH, Warehouse
+
+# Command-line name -> document type as selected in the Streamlit tools
+DOC_TYPES = {
+    "gstr1": "GSTR-1",
+    "gstr3b-2024": "GSTR-3B 2024",
+    "gstr3b-2025": "GSTR-3B 2025",
+    "form24q": "Form24Q",
+    "form26q": "Form26Q & Form27Q",
+    "hdfc": "HDFC Bank",
+    "itd-breakup": "Income Tax Department with Tax Breakup",
+    "itd": "Income Tax Department without Tax Breakup",
+}
+
+
+def _extract_tds(pdf_bytes, doc_type):
+    return extract_tds_document(BytesIO(pdf_bytes), doc_type)
+
+
+def extractor_for(doc_type, corpus=None, cache=None):
+    """Picklable ``extract(pdf_bytes)`` for the document type.
+
+    GST returns are kept in ``corpus`` and only their tables missing from
+    ``cache`` are extracted.
+    """
+    if doc_type == "GSTR-1":
+        return partial(extract_gstr1, corpus=corpus, cache=cache)
+    if doc_type.startswith("GSTR-3B"):
+        return partial(extract_gstr3b, year=doc_type.split()[-1], corpus=corpus, cache=cache)
+    return partial(_extract_tds, doc_type=doc_type)
+
+
+def tables_for(doc_type):
+    """Table extractors of a GST return (see ``extraction.incremental``), or None for TDS documents."""
+    if doc_type == "GSTR-1":
+        return GSTR1_TABLES
+    if doc_type.startswith("GSTR-3B"):
+        return GSTR3B_TABLES[doc_type.split()[-1]]
+    return None
+
+
+def document_extractor_for(doc_type):
+    """Picklable ``extract(doc)`` for a document rebuilt from the corpus, or None for TDS documents."""
+    if doc_type == "GSTR-1":
+        return extract_gstr1_document
+    if doc_type.startswith("GSTR-3B"):
+        return partial(extract_gstr3b_document, year=doc_type.split()[-1])
+    return None
+
+
+def _extract_file(extract, path):
+    """Read and extract one PDF in a worker; failures are returned, not raised."""
+    try:
+        return extract(Path(path).read_bytes()), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def collect_pdfs(inputs):
+    """PDF paths named by files, directories or glob patterns, without duplicates."""
+    paths = []
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            paths.extend(sorted(path.rglob("*.pdf"), key=str))
+        elif path.is_file():
+            paths.append(path)
+        else:
+            paths.extend(sorted(Path(match) for match in glob.glob(item, recursive=True)))
+    return list(dict.fromkeys(p.resolve() for p in paths if p.suffix.lower() == ".pdf"))
+
+
+def build_sheets(doc_type, file_names, results):
+    """Sheet name -> DataFrame, the same sheets the Streamlit tools export."""
+    if doc_type == "GSTR-1":
+        df, df_4A, df_4B = gstr1_frames(file_names, results)
+        return {"Total Liability": df, "Table 4A": df_4A, "Table 4B": df_4B}
+    if doc_type.startswith("GSTR-3B"):
+        general_df, table_3_1, table_4, table_6_1, combined_df = gstr3b_frames(
+            file_names, results, doc_type.split()[-1]
+        )
+        return {
+            "Combined Data": combined_df,
+            "General Details": general_df,
+            "Table 3.1": table_3_1,
+            "Table 4": table_4,
+            "Table 6.1": table_6_1,
+        }
+    return {"Extracted Data": pd.concat(results, ignore_index=True)}
+
+
+def write_output(sheets, output, fmt):
+    """Write the sheets as one workbook, or as one CSV/Parquet/Arrow file per sheet into the ``output`` directory."""
+    if fmt == "xlsx":
+        write_workbook({name: rupees_frame(df) for name, df in sheets.items()}, output)
+        return [output]
+
+    output.mkdir(parents=True, exist_ok=True)
+    written = []
+    for name, df in sheets.items():
+        path = output / (file_stem(name) + EXPORT_FORMATS[fmt])
+        path.write_bytes(frame_bytes(rupees_frame(df), fmt))
+        written.append(path)
+    return written
+
+
+def run_batch(doc_type, paths, max_workers=DEFAULT_WORKERS, cache=None, corpus=None, progress=None):
+    """Extract every PDF; returns ``(file_names, results, digests, failures, cache_hits)``.
+
+    ``failures`` is a list of ``(path, error)``; the names, results and content
+    digests only cover the files that were extracted successfully, in input order.
+    Files found in the cache are not decoded, so they are not added to ``corpus``;
+    of GST returns only the tables missing from the cache are extracted.
+    """
+    tables = tables_for(doc_type)
+    results = [None] * len(paths)
+    failures = []
+    pending = []
+    digests = {}
+    missing = {}
+    cache_hits = 0
+    for index, path in enumerate(paths):
+        digests[index] = content_hash(path.read_bytes())
+        if cache is not None:
+            if tables is None:
+                cached = cache.get(doc_type, digests[index])
+            else:
+                cached, missing[index] = cached_tables(cache, doc_type, digests[index], tables)
+                cached = None if missing[index] else cached
+            if cached is not None:
+                results[index] = cached
+                cache_hits += 1
+                continue
+        pending.append(index)
+
+    outcomes = extract_in_pool(
+        partial(_extract_file, extractor_for(doc_type, corpus, cache)),
+        [str(paths[index]) for index in pending],
+        max_workers=max_workers,
+        on_result=progress,
+    )
+    for index, (result, error) in zip(pending, outcomes):
+        if error is not None:
+            failures.append((paths[index], error))
+            continue
+        results[index] = result
+        if cache is not None and tables is None:
+            cache.put(doc_type, digests[index], result)
+        elif cache is not None:
+            store_tables(cache, doc_type, digests[index], tables, result, keys=missing[index])
+
+    done = [index for index, result in enumerate(results) if result is not None]
+    return (
+        [paths[index].name for index in done],
+        [results[index] for index in done],
+        [digests[index] for index in done],
+        failures,
+        cache_hits,
+    )
+
+
+def run_replay(doc_type, corpus, max_workers=DEFAULT_WORKERS, progress=None):
+    """Extract every document of the type stored in the corpus; returns ``(file_names, results, digests, failures)``.
+
+    The corpus does not know the original file names, so each document is
+    named by its content hash.
+    """
+    digests = corpus.digests(doc_type)
+    outcomes = extract_in_pool(
+        partial(replay_document, corpus, doc_type, document_extractor_for(doc_type)),
+        digests,
+        max_workers=max_workers,
+        on_result=progress,
+    )
+    done = [(digest, result) for digest, (result, error) in zip(digests, outcomes) if error is None]
+    failures = [(digest, error) for digest, (result, error) in zip(digests, outcomes) if error is not None]
+    return [digest for digest, _ in done], [result for _, result in done], [digest for digest, _ in done], failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m extraction", description="Batch-extract GSTR and TDS PDFs.")
+    parser.add_argument("doc_type", choices=DOC_TYPES, help="document type of every input PDF")
+    parser.add_argument("inputs", nargs="*", help="PDF files, directories or glob patterns")
+    parser.add_argument("-o", "--output", type=Path, help="workbook path, or directory for the other formats")
+    parser.add_argument("-f", "--format", choices=["xlsx", *EXPORT_FORMATS], default="xlsx", help="output format (default: xlsx)")
+    parser.add_argument("-w", "--workers", type=int, default=DEFAULT_WORKERS, help="worker processes (default: %(default)s)")
+    parser.add_argument("--no-cache", action="store_true", help="neither read nor fill the extraction cache")
+    parser.add_argument(
+        "--warehouse", nargs="?", type=Path, const=DEFAULT_WAREHOUSE_PATH, metavar="PATH",
+        help="also store the results in the warehouse database (default: %(const)s)",
+    )
+    parser.add_argument(
+        "--corpus", nargs="?", type=Path, const=DEFAULT_CORPUS_DIR, metavar="DIR",
+        help="keep the decoded pages of GST returns in the raw-text corpus and reuse them (default: %(const)s)",
+    )
+    parser.add_argument(
+        "--replay", action="store_true",
+        help="instead of reading PDFs, extract every document of the type stored in the corpus",
+    )
+    args = parser.parse_intermixed_args(argv)
+
+    doc_type = DOC_TYPES[args.doc_type]
+    if (args.corpus or args.replay) and document_extractor_for(doc_type) is None:
+        parser.error("the corpus only covers GSTR-1 and GSTR-3B returns")
+    corpus = Corpus(args.corpus or DEFAULT_CORPUS_DIR) if args.corpus or args.replay else None
+    if args.replay:
+        if args.inputs:
+            parser.error("--replay takes no inputs")
+        paths = corpus.digests(doc_type)
+        if not paths:
+            parser.error(f"no {doc_type} documents in the corpus")
+    else:
+        paths = collect_pdfs(args.inputs)
+        if not paths:
+            parser.error("no PDF files found")
+    output = args.output or Path(f"{args.doc_type}_extracted" + (".xlsx" if args.format == "xlsx" else ""))
+
+    def progress(done, total):
+        print(f"\rExtracted {done}/{total}", end="" if done < total else "\n", file=sys.stderr, flush=True)
+
+    start = time.perf_counter()
+    if args.replay:
+        # Replays exist to run changed extractors, so cached results are never used
+        file_names, results, digests, failures = run_replay(doc_type, corpus, max_workers=args.workers, progress=progress)
+        cache_hits = 0
+    else:
+        file_names, results, digests, failures, cache_hits = run_batch(
+            doc_type, paths, max_workers=args.workers,
+            cache=None if args.no_cache else ExtractionCache(),
+            corpus=corpus,
+            progress=progress,
+        )
+    elapsed = time.perf_counter() - start
+
+    if args.warehouse and results:
+        Warehouse(args.warehouse).store(doc_type, file_names, results, digests)
+    written = write_output(build_sheets(doc_type, file_names, results), output, args.format) if results else []
+
+    print(f"{doc_type}: {len(paths)} files, {len(results)} extracted ({cache_hits} from cache), {len(failures)} failed")
+    print(f"{elapsed:.1f}s, {len(paths) / elapsed if elapsed else 0:.1f} files/s with {args.workers} workers")
+    for path in written:
+        print(f"Wrote {path}")
+    for path, error in failures:
+        print(f"FAILED {path}: {error}", file=sys.stderr)
+    return 1 if failures else 0
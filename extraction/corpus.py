@@ -0,0 +1,122 @@
+"""Compressed corpus of the raw text decoded from each PDF.
+
+Extraction rules keep changing, and running a fixed extractor over past
+returns used to mean decoding every PDF with pdfplumber again. The corpus
+keeps what the extractors read from a PDF, keyed by document type and the
+SHA-256 of the PDF bytes: the text, words with their bounding boxes and table
+grids of every pdfplumber page of a GSTR-3B, and the PyMuPDF text of every
+page of a GSTR-1. ``Corpus.get`` rebuilds the ``ParsedDocument`` or
+``TextDocument`` the extractors take, so updated extractors can be replayed
+over the whole corpus (``python -m extraction ... --replay``) at the speed
+of text processing.
+
+Entries are gzip-compressed JSON files, one per document, in a persistent
+directory shared by the tools and the command line. Unlike the extraction
+cache the corpus is never evicted.
+"""
+import gzip
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+
+from extraction.document import ParsedDocument, TextDocument
+
+DEFAULT_CORPUS_DIR = Path(os.environ.get(
+    "EXTRACTION_CORPUS_DIR", Path.home() / ".local" / "share" / "tds_gst_extraction" / "corpus"
+))
+
+# Bump whenever the stored page format changes; older entries are then decoded again
+CORPUS_FORMAT = 1
+
+
+class CorpusPage:
+    """A pdfplumber page as stored in the corpus, with the attributes of ``ParsedPage``."""
+
+    __slots__ = ("text", "words", "tables", "table")
+
+    def __init__(self, text, words, tables, table):
+        self.text = text
+        self.words = words
+        self.tables = tables
+        self.table = table
+
+
+def _page_records(doc):
+    """JSON-ready pages of a document; every pdfplumber extraction is run here if it was not yet."""
+    if isinstance(doc, TextDocument):
+        return "pymupdf", list(doc.pages)
+    return "pdfplumber", [
+        {"text": page.text, "words": page.words, "tables": page.tables, "table": page.table}
+        for page in doc.pages
+    ]
+
+
+def _document(kind, pages):
+    if kind == "pymupdf":
+        return TextDocument(pages)
+    return ParsedDocument.from_pages([CorpusPage(**page) for page in pages])
+
+
+class Corpus:
+    """Directory of decoded PDF pages, one compressed entry per document type and content hash."""
+
+    def __init__(self, directory=DEFAULT_CORPUS_DIR):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _folder(self, doc_type):
+        return self.directory / re.sub(r"[^\w.-]+", "_", doc_type)
+
+    def _path(self, doc_type, digest):
+        return self._folder(doc_type) / digest[:2] / f"{digest}.json.gz"
+
+    def get(self, doc_type, digest):
+        """The stored document for a PDF, ready for the extractors, or None."""
+        path = self._path(doc_type, digest)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, ValueError):
+            path.unlink(missing_ok=True)
+            return None
+        if entry.get("format") != CORPUS_FORMAT:
+            return None
+        return _document(entry["kind"], entry["pages"])
+
+    def put(self, doc_type, digest, doc):
+        """Store the pages of a ``ParsedDocument`` or ``TextDocument``.
+
+        A ``ParsedDocument`` must still be backed by its open PDF: pages are
+        stored with their words and table grids, which are extracted here if
+        the extractors did not need them.
+        """
+        kind, pages = _page_records(doc)
+        path = self._path(doc_type, digest)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.open(raw, "wt", encoding="utf-8") as f:
+                json.dump({"format": CORPUS_FORMAT, "kind": kind, "pages": pages}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def digests(self, doc_type):
+        """Content hashes of the stored documents of a type, sorted."""
+        return sorted(path.name.removesuffix(".json.gz") for path in self._folder(doc_type).glob("*/*.json.gz"))
+
+
+def replay_document(corpus, doc_type, extract_document, digest):
+    """Run ``extract_document(doc)`` on a stored document; failures are returned, not raised."""
+    try:
+        doc = corpus.get(doc_type, digest)
+        if doc is None:
+            return None, "not in the corpus"
+        return extract_document(doc), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
@@ -0,0 +1,140 @@
+"""Parse-once views of uploaded PDFs.
+
+pdfplumber recomputes the page layout every time ``extract_text()`` or
+``extract_tables()`` is called, so the GSTR-3B extractors used to pay for the
+same work several times per page. ``ParsedDocument`` runs each extraction at
+most once per page and is shared by every table extractor.
+
+GSTR-1 extraction only needs plain text, which ``TextDocument`` decodes once
+per file with PyMuPDF for all of the GSTR-1 field and table extractors. Very
+long returns can be decoded in page ranges by several processes.
+
+Both can also be rebuilt from the pages stored in the raw-text corpus (see
+``extraction.corpus``) without opening the PDF again.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from functools import cached_property
+from itertools import repeat
+
+import fitz  # PyMuPDF
+
+from extraction.sections import AnchorMap
+from extraction.timing import PDF_OPEN, TABLE_EXTRACTION, TEXT_EXTRACTION, stage
+
+# Below this many pages, starting worker processes costs more than it saves
+PAGE_SHARD_MIN_PAGES = 64
+
+
+class ParsedPage:
+    """Text, words and table grids of a single pdfplumber page, computed on first use."""
+
+    def __init__(self, page):
+        self._page = page
+
+    @cached_property
+    def text(self):
+        with stage(TEXT_EXTRACTION):
+            return self._page.extract_text() or ""
+
+    @cached_property
+    def words(self):
+        with stage(TEXT_EXTRACTION):
+            return self._page.extract_words()
+
+    @cached_property
+    def _found_tables(self):
+        with stage(TABLE_EXTRACTION):
+            return self._page.find_tables()
+
+    @cached_property
+    def tables(self):
+        """Same grids as ``page.extract_tables()``."""
+        found = self._found_tables
+        with stage(TABLE_EXTRACTION):
+            return [table.extract() for table in found]
+
+    @cached_property
+    def table(self):
+        """Same grid as ``page.extract_table()``: the largest table on the page."""
+        if not self._found_tables:
+            return None
+        # pdfplumber ranks by number of cells, then by top-left position
+        ranked = sorted(
+            zip(self._found_tables, self.tables),
+            key=lambda pair: (-len(pair[0].cells), pair[0].bbox[1], pair[0].bbox[0]),
+        )
+        return ranked[0][1]
+
+
+class ParsedDocument:
+    """All pages of an open pdfplumber PDF, each parsed at most once.
+
+    Use it inside the ``with pdfplumber.open(...)`` block of the PDF it wraps.
+    """
+
+    def __init__(self, pdf):
+        self.pages = [ParsedPage(page) for page in pdf.pages]
+        self._anchor_maps = {}
+
+    @classmethod
+    def from_pages(cls, pages):
+        """Document over already parsed pages, objects with the attributes of ``ParsedPage``."""
+        doc = cls.__new__(cls)
+        doc.pages = pages
+        doc._anchor_maps = {}
+        return doc
+
+    @cached_property
+    def text(self):
+        """Text of all non-empty pages joined by newlines."""
+        return "\n".join(page.text for page in self.pages if page.text)
+
+    def anchor_map(self, anchors):
+        """``AnchorMap`` of the pages for the ``anchors`` pattern, built once per pattern."""
+        if anchors not in self._anchor_maps:
+            self._anchor_maps[anchors] = AnchorMap([page.text for page in self.pages], anchors)
+        return self._anchor_maps[anchors]
+
+
+def _page_texts(pdf_bytes, start, stop):
+    """Decode pages ``start`` to ``stop - 1``; runs in a worker process."""
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as pdf:
+        return [pdf[number].get_text("text") for number in range(start, stop)]
+
+
+class TextDocument:
+    """Plain text of every page of a PDF, decoded once with PyMuPDF."""
+
+    def __init__(self, pages):
+        self.pages = pages
+
+    @classmethod
+    def from_bytes(cls, pdf_bytes, max_workers=1):
+        """Decode every page of the PDF.
+
+        With ``max_workers`` above one, documents of at least
+        ``PAGE_SHARD_MIN_PAGES`` pages are split into contiguous page ranges
+        that are decoded in parallel and stitched back together in page order.
+        Section anchors are searched in the stitched text, so a section that
+        starts in one range and ends in the next is still found.
+        """
+        with stage(PDF_OPEN):
+            pdf = fitz.open(stream=pdf_bytes, filetype="pdf")
+        with pdf:
+            page_count = pdf.page_count
+            if max_workers <= 1 or page_count < PAGE_SHARD_MIN_PAGES:
+                with stage(TEXT_EXTRACTION):
+                    return cls([page.get_text("text") for page in pdf])
+
+        shard_size = -(-page_count // max_workers)
+        starts = list(range(0, page_count, shard_size))
+        stops = [min(start + shard_size, page_count) for start in starts]
+        # The workers open their own copies; waiting for them counts as text extraction
+        with stage(TEXT_EXTRACTION), ProcessPoolExecutor(max_workers=len(starts)) as pool:
+            shards = pool.map(_page_texts, repeat(pdf_bytes), starts, stops)
+            return cls([text for shard in shards for text in shard])
+
+    @cached_property
+    def text(self):
+        """Text of all pages joined by newlines."""
+        return "\n".join(self.pages)
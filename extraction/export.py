@@ -0,0 +1,190 @@
+"""Downloadable exports of the extracted frames.
+
+Exports are built in memory for each session, so concurrent sessions on a
+shared server never write to, or read back, a common file in the working
+directory. Workbooks for the download buttons are only generated when a
+download is clicked (``deferred_workbook``) and are reused while the
+selection they were built for stays the same.
+
+Large workbooks are streamed by ``write_workbook`` through an openpyxl
+write-only workbook, which writes each row out as it is appended instead of
+keeping every cell as an object until the workbook is saved.
+
+For re-import into analytics tools the same frames are also exported as
+CSV, Parquet or Arrow IPC files (``frame_bytes``), one file per sheet and
+zipped for multi-sheet views (``archive_bytes``), with one type per column
+(``typed_frame``). Parquet and Arrow need pyarrow.
+"""
+import hashlib
+import json
+import zipfile
+from io import BytesIO
+
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, Side
+
+from extraction.money import GSTR1_AMOUNT_COLUMNS, MONEY_COLUMNS
+from extraction.timing import EXCEL_WRITING, stage
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - pyarrow ships with streamlit
+    pa = None
+
+# Columnar formats -> file extension; Parquet and Arrow only with pyarrow
+EXPORT_FORMATS = {"csv": ".csv"}
+if pa is not None:
+    EXPORT_FORMATS.update({"parquet": ".parquet", "arrow": ".arrow"})
+
+# Workbooks with at least this many rows in total are streamed
+STREAMING_ROWS = 50_000
+# Rows converted to cell values at a time while streaming
+CHUNK_ROWS = 10_000
+
+_THIN = Side(style="thin")
+
+
+def _header_cell(sheet, column):
+    """Header cell styled like the ones pandas writes."""
+    cell = WriteOnlyCell(sheet, value=str(column))
+    cell.font = Font(bold=True)
+    cell.border = Border(left=_THIN, right=_THIN, top=_THIN, bottom=_THIN)
+    cell.alignment = Alignment(horizontal="center", vertical="top")
+    return cell
+
+
+def _cell_values(chunk):
+    """Rows of the chunk as lists of plain values; missing values are left blank."""
+    values = chunk.to_numpy(dtype=object)
+    values[pd.isna(values)] = None
+    return values.tolist()
+
+
+def write_workbook(sheets, output):
+    """Stream sheet name -> DataFrame into an .xlsx at ``output``, a path or a binary file.
+
+    Rows are converted and appended ``CHUNK_ROWS`` at a time to a write-only
+    workbook, so memory use does not grow with the number of rows written.
+    """
+    with stage(EXCEL_WRITING):
+        workbook = Workbook(write_only=True)
+        for name, df in sheets.items():
+            sheet = workbook.create_sheet(name)
+            sheet.append([_header_cell(sheet, column) for column in df.columns])
+            for start in range(0, len(df), CHUNK_ROWS):
+                for row in _cell_values(df.iloc[start:start + CHUNK_ROWS]):
+                    sheet.append(row)
+        workbook.save(output)
+
+
+def workbook_bytes(sheets, streaming=None):
+    """Sheet name -> DataFrame as an in-memory .xlsx workbook.
+
+    ``streaming`` defaults to streaming when the sheets hold at least
+    ``STREAMING_ROWS`` rows together.
+    """
+    if streaming is None:
+        streaming = sum(len(df) for df in sheets.values()) >= STREAMING_ROWS
+    output = BytesIO()
+    if streaming:
+        write_workbook(sheets, output)
+    else:
+        with stage(EXCEL_WRITING), pd.ExcelWriter(output, engine="openpyxl") as writer:
+            for name, df in sheets.items():
+                df.to_excel(writer, sheet_name=name, index=False)
+    output.seek(0)
+    return output
+
+
+def selection_hash(*parts):
+    """Digest of whatever identifies an export, such as the batch and the filter selection."""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def deferred_export(cache, key, build, max_entries=8):
+    """Callable for ``st.download_button`` that runs ``build()`` when the button is clicked.
+
+    The bytes are kept in ``cache``, a dict held in the session state, under
+    ``key``; beyond ``max_entries`` the oldest export is dropped.
+    """
+    def generate():
+        if key not in cache:
+            while len(cache) >= max_entries:
+                cache.pop(next(iter(cache)))
+            cache[key] = build()
+        return cache[key]
+    return generate
+
+
+def deferred_workbook(cache, key, sheets, max_entries=8):
+    """``deferred_export`` of the sheets as an .xlsx workbook."""
+    return deferred_export(cache, key, lambda: workbook_bytes(sheets).getvalue(), max_entries)
+
+
+def file_stem(sheet_name):
+    """File name for a sheet exported on its own, e.g. "Table 3.1" -> "Table_3_1"."""
+    return sheet_name.replace(" ", "_").replace(".", "_")
+
+
+def _rupee_amounts(values):
+    """Float64 rupees of an amount column, or None if a non-blank cell is not an amount.
+
+    Comma-grouped text such as ``"1,470,735.15"`` is parsed; blank cells,
+    such as the separator rows of the combined sheets, become nulls.
+    """
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype("float64")
+    text = values.astype("string").str.replace(",", "", regex=False).str.strip()
+    blank = text.isna() | (text == "")
+    numbers = pd.to_numeric(text.mask(blank), errors="coerce")
+    if (numbers.isna() & ~blank).any():
+        return None
+    return numbers.astype("float64")
+
+
+def typed_frame(df):
+    """Copy of ``df`` with one type per column, for the columnar formats.
+
+    Amount columns of the GSTR-3B and GSTR-1 frames become float64 rupees.
+    A column is only converted when every non-blank cell is an amount, so no
+    value is lost. Other columns holding Python objects (text, or text mixed
+    with numbers) become strings.
+    """
+    df = df.copy()
+    for column in df.columns:
+        if column in MONEY_COLUMNS or column in GSTR1_AMOUNT_COLUMNS:
+            amounts = _rupee_amounts(df[column])
+            if amounts is not None:
+                df[column] = amounts
+                continue
+        if df[column].dtype == object:
+            df[column] = df[column].astype("string")
+    return df
+
+
+def frame_bytes(df, fmt):
+    """One frame as CSV, Parquet or Arrow IPC file bytes, typed by ``typed_frame``."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format {fmt!r}; available: {', '.join(EXPORT_FORMATS)}")
+    df = typed_frame(df)
+    if fmt == "csv":
+        return df.to_csv(index=False).encode("utf-8")
+    output = BytesIO()
+    if fmt == "parquet":
+        df.to_parquet(output, index=False)
+    else:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        with pa.ipc.new_file(output, table.schema) as writer:
+            writer.write_table(table)
+    return output.getvalue()
+
+
+def archive_bytes(sheets, fmt):
+    """Sheet name -> DataFrame as a zip holding one ``fmt`` file per sheet."""
+    output = BytesIO()
+    with zipfile.ZipFile(output, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, df in sheets.items():
+            archive.writestr(file_stem(name) + EXPORT_FORMATS[fmt], frame_bytes(df, fmt))
+    return output.getvalue()
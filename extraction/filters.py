@@ -0,0 +1,67 @@
+"""Filter index for the Month/State/GSTIN/Legal Name/Financial Year filters.
+
+The Streamlit tools filter a batch of returns on columns of its general
+details and show the matching rows of every table of the batch. Widget
+changes rerun the whole script, so ``FilterIndex`` is built once per batch:
+each filter column is encoded as categorical codes and every table row is
+mapped to the file it came from. Applying a selection is then one boolean
+lookup per column, intersected into a single row mask that all tables share.
+"""
+import numpy as np
+import pandas as pd
+
+# General details column -> filter label, in the order the filters are shown
+GSTR3B_FILTERS = {
+    "Period": "Filter by Month",
+    "State": "Filter by State",
+    "GSTIN": "Filter by GSTIN",
+    "Legal Name": "Filter by Legal Name",
+    "Financial Year": "Filter by Financial Year",
+}
+
+
+def _lookup(size, positions):
+    """Boolean array with ``positions`` set and one extra False slot that code -1 selects."""
+    selected = np.zeros(size + 1, dtype=bool)
+    selected[positions[positions >= 0]] = True
+    return selected
+
+
+class FilterIndex:
+    """Categorical codes of the filter columns and the file of every table row.
+
+    ``general_df`` has one row per uploaded file, in the order of
+    ``file_names``; ``tables`` maps a table name to a frame with a
+    "File Name" column.
+    """
+
+    def __init__(self, general_df, file_names, columns, tables):
+        self.general_df = general_df
+        self.tables = tables
+        self.codes = {}
+        self.categories = {}
+        for column in columns:
+            # Missing values get code -1 and never match a selection
+            self.codes[column], self.categories[column] = pd.factorize(general_df[column])
+        # Names may repeat across uploads; a table row belongs to every file with its name
+        self.file_codes, self.file_names = pd.factorize(pd.Index(file_names))
+        self.table_files = {name: self.file_names.get_indexer(table["File Name"]) for name, table in tables.items()}
+
+    def options(self, column):
+        """Distinct values of the column, in order of first appearance."""
+        return self.categories[column].tolist()
+
+    def mask(self, selections):
+        """Rows of the general details whose value is selected in every column of ``selections``."""
+        mask = np.ones(len(self.general_df), dtype=bool)
+        for column, selected in selections.items():
+            categories = self.categories[column]
+            mask &= _lookup(len(categories), categories.get_indexer(selected))[self.codes[column]]
+        return mask
+
+    def apply(self, selections):
+        """The selected general details rows and, per table, the rows of the selected files."""
+        mask = self.mask(selections)
+        files = _lookup(len(self.file_names), self.file_codes[mask])
+        tables = {name: table[files[self.table_files[name]]] for name, table in self.tables.items()}
+        return self.general_df[mask], tables
@@ -0,0 +1,152 @@
+"""GSTR-1 extractors: header details, total liability and Tables 4A/4B."""
+from contextlib import nullcontext
+
+import pandas as pd
+
+from extraction.common import GST_STATE_CODES
+from extraction.document import TextDocument
+from extraction.incremental import extract_document_tables, extract_incremental
+from extraction.patterns import GSTR1
+from extraction.sections import SectionIndex
+
+
+# GSTR-1 Functions
+def extract_details(doc):
+    details = {"GSTIN": "", "State": "", "Legal Name": "", "Month": "", "Financial Year": ""}
+   
+    for text in doc.pages:
+        if text:
+            gstin_match = GSTR1.gstin.search(text)
+            if gstin_match:
+                details["GSTIN"] = gstin_match.group(1)
+                details["State"] = GST_STATE_CODES.get(details["GSTIN"][:2], "Unknown")
+           
+            legal_name_match = GSTR1.legal_name.search(text)
+            if legal_name_match:
+                details["Legal Name"] = legal_name_match.group(1).strip()
+           
+            month_match = GSTR1.tax_period.search(text)
+            if month_match:
+                details["Month"] = month_match.group(1).strip()
+           
+            fy_match = GSTR1.financial_year.search(text)
+            if fy_match:
+                details["Financial Year"] = fy_match.group(1).strip()
+           
+            break
+    return details
+ 
+def extract_total_liability(doc):
+    text = doc.text
+   
+    match = GSTR1.total_liability.search(text)
+   
+    if match:
+        return [match.group(1), match.group(2), match.group(3), match.group(4), match.group(5)]
+    return ["Not Found", "", "", "", ""]
+
+TABLE_4A_TITLE = "4A - Taxable outward supplies made to registered persons"
+TABLE_4B_TITLE = "4B - Taxable outward supplies made to registered persons attracting tax on reverse charge"
+
+# New function to extract Tables 4A and 4B
+def extract_tables_4A_4B(doc):
+    tables = {
+        "4A": {
+            "description": "Taxable outward supplies made to registered persons (other than reverse charge supplies)",
+            "title": "B2B Regular",
+            "data": None
+        },
+        "4B": {
+            "description": "Taxable outward supplies made to registered persons attracting tax on reverse charge",
+            "title": "B2B Reverse charge",
+            "data": None
+        }
+    }
+    
+    sections = SectionIndex(doc.text, GSTR1.section_heading)
+    
+    # Extract Table 4A
+    section_4A = sections.section(TABLE_4A_TITLE)
+    match_4A = GSTR1.table_total.search(section_4A) if section_4A else None
+    
+    if match_4A:
+        tables["4A"]["data"] = {
+            "No. of records": match_4A.group(1),
+            "Value": match_4A.group(2),
+            "Integrated Tax": match_4A.group(3),
+            "Central Tax": match_4A.group(4),
+            "State/UT Tax": match_4A.group(5),
+            "Cess": match_4A.group(6)
+        }
+    
+    # Extract Table 4B
+    section_4B = sections.section(TABLE_4B_TITLE)
+    match_4B = GSTR1.table_total.search(section_4B) if section_4B else None
+    
+    if match_4B:
+        tables["4B"]["data"] = {
+            "No. of records": match_4B.group(1),
+            "Value": match_4B.group(2),
+            "Integrated Tax": match_4B.group(3),
+            "Central Tax": match_4B.group(4),
+            "State/UT Tax": match_4B.group(5),
+            "Cess": match_4B.group(6)
+        }
+    
+    return tables
+
+# Result key -> extractor; every GSTR-1 extractor reads the plain text of the pages
+GSTR1_TABLES = {
+    "details": (extract_details,),
+    "total_liability": (extract_total_liability,),
+    "tables_4A_4B": (extract_tables_4A_4B,),
+}
+
+# Every GSTR-1 extractor on a decoded document, or one rebuilt from the corpus
+def extract_gstr1_document(doc):
+    return extract_document_tables(doc, GSTR1_TABLES)
+
+# Single entry point for GSTR-1: decode the PDF once and run the extractors of the tables
+# missing from the cache on that text. Large returns are decoded by up to max_workers
+# processes; with a corpus, PDFs decoded before are replayed from their stored pages
+# and new ones are added to it.
+def extract_gstr1(pdf_bytes, max_workers=1, corpus=None, cache=None):
+    def open_document(pdf_bytes):
+        return nullcontext(TextDocument.from_bytes(pdf_bytes, max_workers=max_workers))
+    return extract_incremental("GSTR-1", pdf_bytes, GSTR1_TABLES, open_document, corpus, cache)
+
+# Batch frames: Total Liability, Table 4A and Table 4B, one row per file
+def gstr1_frames(file_names, results):
+    data = []
+    table_4A_data = []
+    table_4B_data = []
+    for file_name, gstr1 in zip(file_names, results):
+        details = gstr1["details"]
+        data.append([file_name] + list(details.values()) + gstr1["total_liability"])
+
+        tables_4A_4B = gstr1["tables_4A_4B"]
+        for table, rows in (("4A", table_4A_data), ("4B", table_4B_data)):
+            table_data = tables_4A_4B[table]["data"]
+            if table_data:
+                rows.append([
+                    file_name,
+                    details["GSTIN"],
+                    details["State"],
+                    details["Legal Name"],
+                    details["Month"],
+                    details["Financial Year"],
+                    table_data["No. of records"],
+                    table_data["Value"],
+                    table_data["Integrated Tax"],
+                    table_data["Central Tax"],
+                    table_data["State/UT Tax"],
+                    table_data["Cess"]
+                ])
+
+    columns = ["File Name", "GSTIN", "State", "Legal Name", "Month", "Financial Year", "Taxable Value", "IGST", "CGST", "SGST", "Cess"]
+    columns_4AB = ["File Name", "GSTIN", "State", "Legal Name", "Month", "Financial Year", "No. of records", "Value", "Integrated Tax", "Central Tax", "State/UT Tax", "Cess"]
+    return (
+        pd.DataFrame(data, columns=columns),
+        pd.DataFrame(table_4A_data, columns=columns_4AB),
+        pd.DataFrame(table_4B_data, columns=columns_4AB),
+    )
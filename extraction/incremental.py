@@ -0,0 +1,71 @@
+"""Table-by-table extraction of GST returns with per-extractor caching.
+
+A return is extracted by one extractor per table. ``tables`` maps each key
+of the result (``"table_6_1"``, ``"details"``, ...) to the steps that produce
+it: an extractor taking the parsed document, optionally followed by
+conversions of its output, such as ``paise_frame``. Each table is cached
+under the ``fingerprint`` of its steps, so after a change to
+``extract_table_6_1_2025`` a re-run only extracts Table 6.1 again and reuses
+the cached general details and Tables 3.1 and 4. A PDF is decoded (or read
+from the corpus) only when at least one of its tables is missing.
+"""
+from extraction.cache import content_hash
+from extraction.timing import DATAFRAME_BUILDING, stage
+from extraction.versions import fingerprint
+
+
+def table_versions(tables):
+    """Result key -> fingerprint of the steps producing it."""
+    return {key: fingerprint(*steps) for key, steps in tables.items()}
+
+
+def cached_tables(cache, doc_type, digest, tables):
+    """``(found, missing)``: the cached tables of a document and the keys that must be extracted."""
+    found = {}
+    for key, version in table_versions(tables).items():
+        value = cache.get_table(doc_type, key, version, digest)
+        if value is not None:
+            found[key] = value
+    return found, [key for key in tables if key not in found]
+
+
+def store_tables(cache, doc_type, digest, tables, result, keys=None):
+    """Cache the tables ``keys`` (default: all) of an extraction result."""
+    versions = table_versions(tables)
+    for key in tables if keys is None else keys:
+        cache.put_table(doc_type, key, versions[key], digest, result[key])
+
+
+def extract_document_tables(doc, tables):
+    """Run the steps of every table on a parsed document."""
+    result = {}
+    for key, (extract, *conversions) in tables.items():
+        value = extract(doc)
+        for convert in conversions:
+            with stage(DATAFRAME_BUILDING):
+                value = convert(value)
+        result[key] = value
+    return result
+
+
+def extract_incremental(doc_type, pdf_bytes, tables, open_document, corpus=None, cache=None):
+    """Extract the tables of one PDF, reusing cached tables and the corpus.
+
+    Only the tables missing from ``cache`` are extracted; ``open_document(pdf_bytes)``
+    is a context manager yielding the parsed document and is only entered when
+    the PDF is not in ``corpus``. Newly extracted tables are not cached here,
+    so that worker processes never write to the cache; see ``store_tables``.
+    """
+    digest = content_hash(pdf_bytes) if corpus is not None or cache is not None else None
+    result, missing = cached_tables(cache, doc_type, digest, tables) if cache is not None else ({}, list(tables))
+    if missing:
+        missing = {key: tables[key] for key in missing}
+        doc = corpus.get(doc_type, digest) if corpus is not None else None
+        if doc is not None:
+            result.update(extract_document_tables(doc, missing))
+        else:
+            with open_document(pdf_bytes) as doc:
+                result.update(extract_document_tables(doc, missing))
+                if corpus is not None:
+                    corpus.put(doc_type, digest, doc)
+    return {key: result[key] for key in tables}
@@ -0,0 +1,99 @@
+"""Amounts as int64 paise.
+
+Summing float rupees across thousands of returns accumulates rounding
+error, and every float round trip through ``"{:,.2f}"`` can shift a paisa.
+Extracted GSTR-3B tables therefore carry their amount columns as int64
+paise, so aggregation is exact integer arithmetic. Frames are converted back
+to rupees only when they are rendered or exported (``rupees_frame``).
+"""
+from decimal import ROUND_HALF_EVEN, Decimal, InvalidOperation
+
+import numpy as np
+import pandas as pd
+
+# Amount columns of the GSTR-3B tables and combined sheets
+MONEY_COLUMNS = frozenset([
+    # Table 3.1
+    "Total Taxable Value", "Integrated Tax", "Central Tax", "State/UT Tax", "Cess",
+    # Table 4
+    "Integrated tax", "Central tax", "State/UT tax",
+    # Table 6.1
+    "Total tax payable", "Tax payable", "Adjustment of negative liability", "Net Tax Payable",
+    "Tax paid through ITC - Integrated tax", "Tax paid through ITC - Central tax",
+    "Tax paid through ITC - State/UT tax", "Tax paid through ITC - Cess",
+    "Tax paid in cash", "Interest paid in cash", "Late fee paid in cash",
+    # Combined sheets
+    "Total Tax Payable", "Tax Paid Through ITC", "Tax Payable", "Adjustment of Negative Liability",
+    "Tax Paid Through ITC - Integrated", "Tax Paid Through ITC - Central",
+    "Tax Paid Through ITC - State/UT", "Tax Paid Through ITC - Cess",
+    "Tax Paid in Cash", "Interest Paid in Cash", "Late Fee Paid in Cash",
+])
+
+# Amount columns of the GSTR-1 frames, kept as the comma-grouped rupee text of the return
+GSTR1_AMOUNT_COLUMNS = frozenset([
+    # Total Liability
+    "Taxable Value", "IGST", "CGST", "SGST", "Cess",
+    # Tables 4A and 4B
+    "Value", "Integrated Tax", "Central Tax", "State/UT Tax",
+])
+
+
+def to_paise(rupees):
+    """Float rupees (a scalar or an array/Series) rounded to int64 paise."""
+    return np.rint(np.asarray(rupees, dtype=np.float64) * 100).astype(np.int64)
+
+
+def parse_paise(amount_str):
+    """Paise of a plain decimal string such as ``"12345678.50"``, or None.
+
+    The string is rounded to the paisa in decimal, without going through a
+    float.
+    """
+    try:
+        amount = Decimal(amount_str)
+    except (InvalidOperation, TypeError):
+        return None
+    if not amount.is_finite():
+        return None
+    return int((amount * 100).to_integral_value(ROUND_HALF_EVEN))
+
+
+def format_rupees(paise):
+    """``"{:,.2f}"`` of the amount, computed from the integer paise."""
+    rupees, paisa = divmod(abs(int(paise)), 100)
+    return f"{'-' if paise < 0 else ''}{rupees:,}.{paisa:02d}"
+
+
+def paise_frame(df):
+    """Copy of ``df`` with its float rupee amount columns as int64 paise.
+
+    Columns with missing amounts become nullable ``Int64`` so blanks stay blank.
+    """
+    df = df.copy()
+    for column in MONEY_COLUMNS.intersection(df.columns):
+        rupees = pd.to_numeric(df[column]).astype(np.float64)
+        if rupees.isna().any():
+            df[column] = pd.array(np.rint(rupees.to_numpy() * 100), dtype="Int64")
+        else:
+            df[column] = to_paise(rupees)
+    return df
+
+
+def rupees_frame(df):
+    """Copy of ``df`` with its paise amount columns in rupees, for rendering and export.
+
+    Non-numeric cells, such as the blank separator rows of the combined
+    sheets, are kept as they are, and so are text columns: the GSTR-1
+    frames share column names with Table 3.1 but hold rupee text.
+    """
+    df = df.copy()
+    for column in MONEY_COLUMNS.intersection(df.columns):
+        values = df[column]
+        if pd.api.types.is_string_dtype(values):
+            continue
+        if pd.api.types.is_integer_dtype(values):
+            df[column] = (values / 100).astype(np.float64)
+        else:
+            numbers = pd.to_numeric(values, errors="coerce")
+            df[column] = values.where(numbers.isna(), numbers / 100)
+    return df
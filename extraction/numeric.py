@@ -0,0 +1,55 @@
+"""Vectorized conversion of extracted amount strings to numbers.
+
+The scalar helpers in ``extraction.gstr3b`` convert one cell per Python call.
+These functions apply the same rules to whole columns in one pass with
+Arrow compute kernels, for tables that are converted column-wise or
+concatenated across many returns. Without pyarrow they fall back to the
+scalar rules cell by cell.
+"""
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pragma: no cover - pyarrow ships with streamlit
+    pa = pc = None
+
+# What float() accepts once surrounding whitespace is stripped, apart from inf/nan
+_NUMBER = r"^[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?$"
+
+
+def _strings(values):
+    """Arrow string array of the values; anything that is not a string becomes null."""
+    return pa.array([value if isinstance(value, str) else None for value in values], type=pa.string())
+
+
+def _drop(strings, *markers):
+    """Remove every marker; markers that occur nowhere cost only a scan, not a rewrite."""
+    for marker in markers:
+        if pc.any(pc.match_substring(strings, marker)).as_py():
+            strings = pc.replace_substring(strings, marker, "")
+    return strings
+
+
+def _to_float(strings):
+    """float() of every string that is a plain number, 0.0 for the rest and for nulls."""
+    strings = pc.utf8_trim_whitespace(strings)
+    valid = pc.fill_null(pc.match_substring_regex(strings, _NUMBER), False)
+    return pc.cast(pc.if_else(valid, strings, "0"), pa.float64()).to_numpy(zero_copy_only=False)
+
+
+def clean_numeric_column(values):
+    """``clean_numeric_value`` on every value: "E"/"F" markers and commas are dropped, anything unparsable is 0.0."""
+    values = list(values)
+    if pa is None:
+        from extraction.gstr3b import clean_numeric_value
+        return np.array([clean_numeric_value(value) for value in values], dtype=np.float64)
+
+    return _to_float(_drop(_strings(values), "E", "F", ","))
+
+
+def clean_numeric_frame(frame):
+    """All cells of ``frame`` cleaned in a single pass; index and columns are kept."""
+    cleaned = clean_numeric_column(frame.to_numpy(dtype=object).ravel())
+    return pd.DataFrame(cleaned.reshape(frame.shape), index=frame.index, columns=frame.columns)
@@ -0,0 +1,37 @@
+"""Fan per-file extraction out to a pool of worker processes.
+
+pdfplumber is pure Python and CPU bound, so one process can only use one
+core. ``extract_in_pool`` runs the per-file extractor in several processes and
+returns the results in upload order.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+DEFAULT_WORKERS = int(os.environ.get("EXTRACTION_WORKERS", os.cpu_count() or 1))
+
+
+def extract_in_pool(extract, documents, max_workers=DEFAULT_WORKERS, on_result=None):
+    """Return ``[extract(pdf_bytes) for pdf_bytes in documents]`` computed in parallel.
+
+    ``on_result(done, total)`` is called in this process every time a file
+    finishes. ``extract`` is pickled to the workers, so it must be importable:
+    a function from the ``extraction`` package, or a ``functools.partial`` of
+    one. With a single worker the files are extracted in this process.
+    """
+    total = len(documents)
+    results = [None] * total
+    workers = min(max_workers, total)
+    if workers <= 1:
+        for index, pdf_bytes in enumerate(documents):
+            results[index] = extract(pdf_bytes)
+            if on_result:
+                on_result(index + 1, total)
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(extract, pdf_bytes): index for index, pdf_bytes in enumerate(documents)}
+        for done, future in enumerate(as_completed(futures), 1):
+            results[futures[future]] = future.result()
+            if on_result:
+                on_result(done, total)
+    return results
@@ -0,0 +1,205 @@
+"""Compiled regular expressions of every extractor, grouped by form and layout.
+
+All patterns are compiled once at import instead of on every call. Outside
+of stage timings a call goes straight to the compiled regex. While stage
+timings are active (see ``extraction.timing``), every call of a
+``Pattern`` is counted with its matches and the time spent in the regex
+engine, both as "regex matching" and per pattern, so the timings returned
+with each extracted file show which patterns are hot, also for files
+extracted in pool workers.
+"""
+import re
+import time
+
+from extraction.timing import active_timings
+
+
+def _timed(method, *args):
+    start = time.perf_counter()
+    result = method(*args)
+    return result, time.perf_counter() - start
+
+
+class Pattern:
+    """A compiled regex whose calls are counted in the active stage timings."""
+
+    __slots__ = ("group", "name", "regex")
+
+    def __init__(self, group, name, pattern, flags=0):
+        self.group = group
+        self.name = name
+        self.regex = re.compile(pattern, flags)
+
+    def search(self, string):
+        timings = active_timings()
+        if timings is None:
+            return self.regex.search(string)
+        match, seconds = _timed(self.regex.search, string)
+        timings.add_pattern(self.group, self.name, seconds, match is not None)
+        return match
+
+    def match(self, string):
+        timings = active_timings()
+        if timings is None:
+            return self.regex.match(string)
+        match, seconds = _timed(self.regex.match, string)
+        timings.add_pattern(self.group, self.name, seconds, match is not None)
+        return match
+
+    def findall(self, string):
+        timings = active_timings()
+        if timings is None:
+            return self.regex.findall(string)
+        found, seconds = _timed(self.regex.findall, string)
+        timings.add_pattern(self.group, self.name, seconds, len(found))
+        return found
+
+    def finditer(self, string):
+        """All matches as a list, so the whole scan is timed."""
+        timings = active_timings()
+        if timings is None:
+            return list(self.regex.finditer(string))
+        found, seconds = _timed(list, self.regex.finditer(string))
+        timings.add_pattern(self.group, self.name, seconds, len(found))
+        return found
+
+    def sub(self, repl, string):
+        timings = active_timings()
+        if timings is None:
+            return self.regex.sub(repl, string)
+        (result, count), seconds = _timed(self.regex.subn, repl, string)
+        timings.add_pattern(self.group, self.name, seconds, count)
+        return result
+
+    def __repr__(self):
+        return f"Pattern({self.group!r}, {self.name!r}, {self.regex.pattern!r})"
+
+
+class PatternGroup:
+    """The patterns of one form or layout, available as attributes."""
+
+    def __init__(self, name):
+        self.name = name
+        self.patterns = {}
+
+    def add(self, name, pattern, flags=0):
+        if name in self.patterns:
+            raise ValueError(f"Pattern {name!r} is already registered in {self.name!r}")
+        self.patterns[name] = Pattern(self.name, name, pattern, flags)
+        return self.patterns[name]
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__["patterns"][name]
+        except KeyError:
+            raise AttributeError(f"{self.name!r} has no pattern {name!r}") from None
+
+    def __iter__(self):
+        return iter(self.patterns.values())
+
+
+# A number of four columns in the GSTR-3B Table 4 text fallbacks
+_AMOUNT = r"(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)"
+_FOUR_AMOUNTS = r"\s+".join([_AMOUNT] * 4)
+_FOUR_VALUES = r"\s+".join([r"([\d,]+\.?\d*)"] * 4)
+_FIVE_DECIMALS = r"\s+".join([r"([\d,]+\.\d+)"] * 5)
+
+# GSTR-1
+GSTR1 = PatternGroup("GSTR-1")
+GSTR1.add("gstin", r'GSTIN\s*[:\-]?\s*(\d{2}[A-Z0-9]{13})')
+GSTR1.add("legal_name", r'Legal name of the registered person\s*[:\-]?\s*(.*)')
+GSTR1.add("tax_period", r'Tax period\s*[:\-]?\s*(\w+)')
+GSTR1.add("financial_year", r'Financial year\s*[:\-]?\s*(\d{4}-\d{2})')
+GSTR1.add("total_liability", r"Total Liability \(Outward supplies other than Reverse charge\)\s+" + _FIVE_DECIMALS)
+# Section headings such as "4A - ..." start a line; sections are bounded by the next one
+GSTR1.add("section_heading", r"^(\d{1,2}[A-Z]?) - ", re.MULTILINE)
+GSTR1.add("table_total", r"Total\s+(\d+)\s+Invoice\s+" + _FIVE_DECIMALS)
+
+# GSTR-3B, both layouts
+GSTR3B = PatternGroup("GSTR-3B")
+GSTR3B.add("gstin", r"GSTIN(?:\s+of\s+the\s+supplier)?\s+([A-Z0-9]+)")
+GSTR3B.add("legal_name", r"Legal name of the registered person\s+(.+)")
+GSTR3B.add("arn_date", r"Date of ARN\s+([\d/]+)")
+GSTR3B.add("financial_year", r"Year\s+(\d{4}-\d{2})")
+GSTR3B.add("period", r"Period\s+([A-Za-z]+)")
+GSTR3B.add("row_numbers", r'[\d,]+\.?\d*')
+# Every section heading the extractors look for; longer headings first so
+# "6.1 Payment of tax" is reported rather than the "Payment of tax" inside it
+GSTR3B.add("section_anchors", "|".join(map(re.escape, [
+    "6.1 Payment of tax",
+    "Payment of tax",
+    "Breakup of tax liability",
+    "Verification",
+    "Nature of Supplies",
+    "3.1",
+])))
+
+# GSTR-3B 2024 layout
+GSTR3B_2024 = PatternGroup("GSTR-3B 2024")
+GSTR3B_2024.add("non_numeric", r'[^\d\s,\.]')
+GSTR3B_2024.add("comma_numbers", r'(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)')
+GSTR3B_2024.add("decimal_numbers", r'(\d+\.\d{2})')
+GSTR3B_2024.add("integers", r'(\d+)')
+GSTR3B_2024.add("table_4_all_other_itc", r"\(5\)\s+All other ITC\s+" + _FOUR_VALUES, re.IGNORECASE | re.DOTALL)
+GSTR3B_2024.add("table_4_all_other_itc_loose", r"All other ITC\s+" + _FOUR_VALUES, re.IGNORECASE | re.DOTALL)
+GSTR3B_2024.add("table_4_others", r"\(2\)\s+Others\s+" + _FOUR_VALUES, re.IGNORECASE | re.DOTALL)
+GSTR3B_2024.add("table_4_others_reversed", r"B\.\s+ITC Reversed.*?\(2\)\s+Others\s+" + _FOUR_VALUES, re.IGNORECASE | re.DOTALL)
+GSTR3B_2024.add("table_4_net_itc", r"C\.\s+Net ITC available \(A-B\)\s+" + _FOUR_VALUES, re.IGNORECASE | re.DOTALL)
+GSTR3B_2024.add("table_4_net_itc_loose", r"Net ITC available.*?" + _FOUR_VALUES, re.IGNORECASE | re.DOTALL)
+GSTR3B_2024.add("table_4_itc_reclaimed", r"\(1\)\s+ITC reclaimed.*?earlier tax period\s+" + _FOUR_VALUES, re.IGNORECASE | re.DOTALL)
+GSTR3B_2024.add("table_4_itc_reclaimed_loose", r"ITC reclaimed.*?" + _FOUR_VALUES, re.IGNORECASE | re.DOTALL)
+GSTR3B_2024.add(
+    "text_reverse_charge",
+    r"(\(3\)).*?Inward supplies liable to reverse charge.*?" + _FOUR_AMOUNTS,
+    re.IGNORECASE | re.DOTALL,
+)
+GSTR3B_2024.add("text_all_other_itc", r"(\(5\)).*?All other ITC\s+" + _FOUR_AMOUNTS, re.IGNORECASE | re.DOTALL)
+GSTR3B_2024.add("text_rules_38_42_43", r"(\(1\)).*?As per rules 38,42 & 43.*?" + _FOUR_AMOUNTS, re.IGNORECASE | re.DOTALL)
+GSTR3B_2024.add("text_others", r"(\(2\)).*?Others\s+" + _FOUR_AMOUNTS, re.IGNORECASE | re.DOTALL)
+GSTR3B_2024.add("text_net_itc", r"C\.\s*Net ITC available.*?" + _FOUR_AMOUNTS, re.IGNORECASE | re.DOTALL)
+GSTR3B_2024.add("text_other_details", r"\(D\)\s*Other Details\s+" + _FOUR_AMOUNTS, re.IGNORECASE | re.DOTALL)
+GSTR3B_2024.add(
+    "text_itc_reclaimed",
+    r"(\(1\)).*?ITC reclaimed.*?earlier tax period\s+" + _FOUR_AMOUNTS,
+    re.IGNORECASE | re.DOTALL,
+)
+# Table 6.1 rows start with their tax type
+TAX_TYPE_ROWS = {
+    tax_type: GSTR3B_2024.add("row_" + re.sub(r"\W", "_", tax_type), r'^' + re.escape(tax_type) + r'\s*', re.IGNORECASE)
+    for tax_type in ['integrated tax', 'central tax', 'state/ut tax', 'cess']
+}
+GSTR3B_2024.add("dashes", r'[-–]')
+GSTR3B_2024.add("whitespace", r'\s+')
+GSTR3B_2024.add("row_values", r'[\d,]+\.\d+|[\d,]+')
+
+# TDS returns: Form 24Q and Forms 26Q/27Q
+TDS_RETURNS = PatternGroup("TDS Returns")
+TDS_RETURNS.add("period", r"period\s+(Q\d)")
+TDS_RETURNS.add("date_range", r"\(From\s+(\d{2}/\d{2}/\d{2})\s+to\s+(\d{2}/\d{2}/\d{2})")
+TDS_RETURNS.add("form_no", r"Form\s+No\.\s*(\d{2}\w)", re.IGNORECASE)
+TDS_RETURNS.add("date", r"Date:\s*(\d{2}/\d{2}/\d{4})")
+TDS_RETURNS.add("financial_year", r'(\d{4}-\d{2}|\d{4}-\d{4})')
+TDS_RETURNS.add("quarter", r'Q(\d)')
+TDS_RETURNS.add("tan", r"TAN\s*:?\s*([A-Z]{4}\d{5}[A-Z])")
+TDS_RETURNS.add("regular", r'Regular', re.IGNORECASE)
+TDS_RETURNS.add("statement_type", r'Type of Statement[^\n]*?(Regular|Original|Correction)', re.IGNORECASE)
+TDS_RETURNS.add(
+    "filing_date",
+    r'(\d{1,2}\s+(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{4})',
+)
+TDS_RETURNS.add("numbers", r'\d+\.?\d*')
+TDS_RETURNS.add("non_amount", r'[^\d.]')
+
+# TDS payments: challans from HDFC Bank and the Income Tax Department
+TDS_PAYMENTS = PatternGroup("TDS Payments")
+TDS_PAYMENTS.add("name_prefix", r'^Name\s*:\s*')
+TDS_PAYMENTS.add("tan", r"TAN\s*:\s*([A-Z0-9]+)")
+TDS_PAYMENTS.add("deductor_name", r"TAN\s*:\s*[A-Z0-9]+\s*\n\s*([A-Za-z&.,\s]+)\n")
+TDS_PAYMENTS.add("assessment_year", r"Assessment Year\s*:\s*(\d{4}-\d{2})")
+TDS_PAYMENTS.add("financial_year", r"Financial Year\s*:\s*(\d{4}-\d{2})")
+TDS_PAYMENTS.add("nature_of_payment", r"Nature of Payment\s*:\s*(\w+)")
+TDS_PAYMENTS.add("amount", r"Amount \(in Rs\.\)\s*:\s*₹\s*([\d,]+)")
+TDS_PAYMENTS.add("challan_no", r"Challan No\s*:\s*(\d+)")
+TDS_PAYMENTS.add("tender_date", r"Tender Date\s*:\s*(\d{1,2}/\d{1,2}/\d{4})")
+
+GROUPS = [GSTR1, GSTR3B, GSTR3B_2024, TDS_RETURNS, TDS_PAYMENTS]
@@ -0,0 +1,71 @@
+"""Bounded section slices of long extracted text.
+
+Searching a whole document with ``heading.*?values`` and ``re.DOTALL`` scans
+(and backtracks over) everything after the heading, all the way to the end
+of the text when the values are missing. ``SectionIndex`` finds every
+section heading in one pass, so value patterns only run on the text of
+their own section.
+"""
+from bisect import bisect_right
+
+
+class SectionIndex:
+    """Offsets of the section headings of a text.
+
+    ``heading`` is a pattern whose group 1 is the section key, e.g. ``"4A"``.
+    """
+
+    def __init__(self, text, heading):
+        self.text = text
+        self.heading = heading
+        found = heading.finditer(text)
+        self.offsets = [match.start() for match in found]
+        self.keys = [match.group(1) for match in found]
+
+    def section(self, title):
+        """Text from the first ``title`` up to the next heading of another section, or None.
+
+        Headings repeated for the same section (e.g. continued on the next
+        page) do not end the slice.
+        """
+        start = self.text.find(title)
+        if start < 0:
+            return None
+        own = self.heading.match(title)
+        key = own.group(1) if own else None
+        index = bisect_right(self.offsets, start)
+        while index < len(self.offsets) and self.keys[index] == key:
+            index += 1
+        end = self.offsets[index] if index < len(self.offsets) else len(self.text)
+        return self.text[start:end]
+
+
+class AnchorMap:
+    """Page and text offset of every section anchor of a document, found in one scan.
+
+    ``anchors`` is a single pattern alternating all known headings, so each
+    page is scanned once instead of once per heading and extractor. Offsets
+    refer to the non-empty page texts joined by newlines, i.e. the
+    document's ``text``.
+    """
+
+    def __init__(self, page_texts, anchors):
+        self.hits = {}
+        offset = 0
+        for page_number, text in enumerate(page_texts):
+            if not text:
+                continue
+            for match in anchors.finditer(text):
+                self.hits.setdefault(match.group(), []).append((offset + match.start(), page_number))
+            offset += len(text) + 1
+
+    def find(self, anchor, start=0):
+        """Offset of the first ``anchor`` at or after ``start``, or -1, like ``str.find``."""
+        hits = self.hits.get(anchor, [])
+        index = bisect_right(hits, (start, -1))
+        return hits[index][0] if index < len(hits) else -1
+
+    def pages(self, *anchors):
+        """Numbers of the pages that contain every one of ``anchors``, in page order."""
+        found = [{page_number for _, page_number in self.hits.get(anchor, [])} for anchor in anchors]
+        return sorted(set.intersection(*found))
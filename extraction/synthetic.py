@@ -0,0 +1,467 @@
+"""Synthetic GSTR and TDS PDFs for benchmarks and demonstrations.
+
+Client returns cannot leave the office, so ``extraction.benchmark`` runs on
+generated documents instead. Each generator renders one PDF with PyMuPDF, in
+the layout the extractors of its document type read: the header fields,
+ruled table grids for pdfplumber and the text lines of the sections parsed by
+regular expressions. Amounts and identities are random but reproducible from
+``seed``, and ``pages`` stretches a document with more invoice, deductee or
+annexure pages the way long real returns are.
+
+The PDFs only use the built-in Helvetica font, so no font files or network
+access are needed. Helvetica has no rupee sign: "₹" is drawn as "¤" and
+mapped back to "₹" for text extraction.
+
+    python -m extraction.synthetic gstr3b-2025 samples/ --count 20 --pages 6
+"""
+import argparse
+import random
+from pathlib import Path
+
+import fitz  # PyMuPDF
+
+from extraction.common import GST_STATE_CODES
+from extraction.money import format_rupees
+
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842
+MARGIN = 40
+
+# Text extraction maps the placeholder drawn for "₹" back to U+20B9
+_RUPEE_PLACEHOLDER = "¤"
+_RUPEE_CMAP = b"""/CIDInit /ProcSet findresource begin
+12 dict begin
+begincmap
+/CMapName /Rupee-WinAnsi def
+/CMapType 2 def
+1 begincodespacerange
+<00> <FF>
+endcodespacerange
+1 beginbfchar
+<A4> <20B9>
+endbfchar
+endcmap
+CMapName currentdict /CMap defineresource pop
+end
+end"""
+
+MONTHS = ["April", "May", "June", "July", "August", "September", "October", "November", "December", "January", "February", "March"]
+_NAMES = ["ACME", "SHREE", "GANESH", "NAVKAR", "SAI", "OMKAR", "VEDANT", "KRISHNA", "SUNRISE", "PIONEER"]
+_SUFFIXES = ["TRADERS PVT LTD", "ENTERPRISES", "INDUSTRIES LIMITED", "AND SONS", "EXPORTS LLP"]
+_LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+class _Writer:
+    """Pages of text lines and ruled tables that break onto new pages when full."""
+
+    def __init__(self):
+        self.doc = fitz.open()
+        self.page = None
+        self.y = MARGIN
+
+    @property
+    def page_count(self):
+        return self.doc.page_count
+
+    def new_page(self):
+        self.page = self.doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        self.y = MARGIN
+
+    def _room(self, height):
+        if self.page is None or self.y + height > PAGE_HEIGHT - MARGIN:
+            self.new_page()
+
+    def text(self, line, x=MARGIN, size=8, y=None):
+        position = (x, self.y if y is None else y)
+        self.page.insert_text(position, line.replace("₹", _RUPEE_PLACEHOLDER), fontsize=size, fontname="helv")
+
+    def lines(self, lines, size=8, step=12):
+        for line in lines:
+            self._room(step)
+            self.text(line, size=size)
+            self.y += step
+
+    def row(self, cells, x=MARGIN, size=8, step=12):
+        """One line of cells at the given x positions."""
+        self._room(step)
+        for left, cell in zip(x, cells):
+            self.text(str(cell), x=left, size=size)
+        self.y += step
+
+    def table(self, widths, rows, height=16, size=7):
+        """A ruled grid of ``rows``, continued on new pages when it does not fit."""
+        self._room(2 * height)
+        self.y += 4
+        for cells in rows:
+            self._room(height)
+            x = MARGIN
+            for width, cell in zip(widths, cells):
+                self.page.draw_rect(fitz.Rect(x, self.y, x + width, self.y + height), color=(0, 0, 0), width=0.5)
+                self.text(str(cell), x=x + 2, size=size, y=self.y + 11)
+                x += width
+            self.y += height
+        self.y += 16
+
+    def pad(self, pages, filler):
+        """Add pages of ``filler()`` lines until the document has ``pages`` pages."""
+        while self.page_count < pages:
+            self.new_page()
+            while self.y + 12 <= PAGE_HEIGHT - MARGIN:
+                self.text(filler())
+                self.y += 12
+
+    def to_bytes(self):
+        cmap = None
+        for page in self.doc:
+            for xref, *_ in page.get_fonts():
+                if self.doc.xref_get_key(xref, "ToUnicode")[0] != "null":
+                    continue
+                if cmap is None:
+                    cmap = self.doc.get_new_xref()
+                    self.doc.update_object(cmap, "<<>>")
+                    self.doc.update_stream(cmap, _RUPEE_CMAP)
+                self.doc.xref_set_key(xref, "ToUnicode", f"{cmap} 0 R")
+        data = self.doc.tobytes(deflate=True)
+        self.doc.close()
+        return data
+
+
+def _amount(rnd, low=0, high=10**7):
+    """Random amount in paise."""
+    return rnd.randint(low, high) * 100 + rnd.choice([0, 0, 0, 50, rnd.randint(0, 99)])
+
+
+def _plain(paise):
+    """Amount without digit grouping, as the 6.1 rows and TDS totals print them."""
+    return f"{paise // 100}.{paise % 100:02d}"
+
+
+def _pan(rnd, entity="C"):
+    return "".join(rnd.choices(_LETTERS, k=3)) + entity + rnd.choice(_LETTERS) + f"{rnd.randint(0, 9999):04d}" + rnd.choice(_LETTERS)
+
+
+def _gstin(rnd):
+    state = rnd.choice([code for code in GST_STATE_CODES if code not in ("97", "99")])
+    return f"{state}{_pan(rnd)}{rnd.randint(1, 9)}Z{rnd.choice(_LETTERS + '0123456789')}"
+
+
+def _tan(rnd):
+    return "".join(rnd.choices(_LETTERS, k=4)) + f"{rnd.randint(0, 99999):05d}" + rnd.choice(_LETTERS)
+
+
+def _legal_name(rnd):
+    return f"{rnd.choice(_NAMES)} {rnd.choice(_NAMES)} {rnd.choice(_SUFFIXES)}"
+
+
+def _financial_year(rnd, first=2023, last=2025):
+    start = rnd.randint(first, last)
+    return start, f"{start}-{(start + 1) % 100:02d}"
+
+
+def _date(rnd, year, month=None):
+    return f"{rnd.randint(1, 28):02d}/{month or rnd.randint(1, 12):02d}/{year}"
+
+
+def gstr1_pdf(pages=3, seed=0):
+    """GSTR-1 with header details, B2B invoices of Table 4A, Table 4B and the total liability."""
+    rnd = random.Random(seed)
+    start, fy = _financial_year(rnd)
+    w = _Writer()
+    w.lines([
+        "Form GSTR-1",
+        "[See rule 59(1)]",
+        "Details of outward supplies of goods or services",
+        f"Financial year {fy}",
+        f"Tax period {rnd.choice(MONTHS)}",
+        f"GSTIN: {_gstin(rnd)}",
+        f"Legal name of the registered person {_legal_name(rnd)}",
+        "Trade name, if any",
+        f"ARN {rnd.randint(10**13, 10**14 - 1)}",
+        "",
+    ])
+
+    def section(title, invoices):
+        totals = [0] * 5
+        w.lines([title, "GSTIN/UIN of recipient  Invoice no.  Invoice date  Taxable value  Integrated tax  Central tax  State/UT tax  Cess"])
+        for number in range(invoices):
+            taxable = _amount(rnd, 1_000, 500_000)
+            if rnd.random() < 0.3:
+                taxes = [taxable * 18 // 100, 0, 0]
+            else:
+                taxes = [0, taxable * 9 // 100, taxable * 9 // 100]
+            values = [taxable, *taxes, 0]
+            totals = [total + value for total, value in zip(totals, values)]
+            w.lines([f"{_gstin(rnd)}  INV/{start}/{number + 1:05d}  {_date(rnd, start + 1)}  " + "  ".join(map(format_rupees, values))])
+        w.lines([f"Total {invoices} Invoice " + " ".join(map(format_rupees, totals)), ""])
+        return totals
+
+    # Invoices fill every page but the last, which holds Table 4B and the summary
+    invoices = max(5, (pages - 1) * ((PAGE_HEIGHT - 2 * MARGIN) // 12) - 14)
+    totals_4a = section("4A - Taxable outward supplies made to registered persons (other than reverse charge supplies)", invoices)
+    if w.page_count < pages:
+        w.new_page()
+    section("4B - Taxable outward supplies made to registered persons attracting tax on reverse charge", rnd.randint(1, 5))
+    w.lines([
+        "Total Liability (Outward supplies other than Reverse charge) " + " ".join(map(format_rupees, totals_4a)),
+        "Verification",
+        "I hereby solemnly affirm and declare that the information given herein above is true and correct.",
+    ])
+    return w.to_bytes()
+
+
+TABLE_4_ROWS = [
+    "A. ITC Available (whether in full or part)",
+    "(1) Import of goods",
+    "(2) Import of services",
+    "(3) Inward supplies liable to reverse charge (other than 1 & 2 above)",
+    "(4) Inward supplies from ISD",
+    "(5) All other ITC",
+    "B. ITC Reversed",
+    "(1) As per rules 38,42 & 43 of CGST Rules and section 17(5)",
+    "(2) Others",
+    "C. Net ITC available (A-B)",
+    "(D) Other Details",
+    "(1) ITC reclaimed which was reversed under Table 4(B)(2) in earlier tax period",
+    "(2) Ineligible ITC under section 16(4) & ITC restricted due to PoS rules",
+]
+
+NATURE_OF_SUPPLIES = [
+    "(a) Outward taxable supplies (other than zero rated, nil rated and exempted)",
+    "(b) Outward taxable supplies (zero rated)",
+    "(c) Other outward supplies (nil rated, exempted)",
+    "(d) Inward supplies (liable to reverse charge)",
+    "(e) Non-GST outward supplies",
+]
+
+
+def _payment_rows_2024(rnd, section):
+    if section == "B":
+        rows = []
+        for tax_type in ("Integrated tax", "Central tax", "State/UT tax"):
+            paid = _plain(_amount(rnd, 0, 100_000))
+            rows.append(f"{tax_type} {paid} - - - - {paid} - -")
+        return rows + ["Cess 0.00 - - - - 0.00 - -"]
+    integrated, central = _amount(rnd, 0, 2_000_000), _amount(rnd, 0, 20_000_000)
+    itc_i, itc_c = _amount(rnd, 0, integrated // 100), _amount(rnd, 0, central // 100)
+    return [
+        f"Integrated tax {_plain(integrated)} {_plain(itc_i)} 0.00 0.00 - {_plain(integrated - itc_i)} 0.00 -",
+        f"Central tax {_plain(central)} {_plain(itc_c)} {_plain(central - itc_c)} - - 0.00 0.00 0.00",
+        f"State/UT tax {_plain(central)} {_plain(itc_c)} - {_plain(central - itc_c)} - 0.00 0.00 0.00",
+        "Cess 0.00 - - - 0.00 0.00 0.00 -",
+    ]
+
+
+def _payment_rows_2025(rnd, section):
+    if section == "B":
+        rows = []
+        for tax_type in ("Integrated tax", "Central tax", "State/UT tax"):
+            paid = _plain(_amount(rnd, 0, 100_000))
+            rows.append(f"{tax_type} {paid} 0.00 {paid} - - - - {paid} - -")
+        return rows + ["Cess 0.00 0.00 0.00 - - - - 0.00 - -"]
+    integrated, central = _amount(rnd, 0, 2_000_000), _amount(rnd, 0, 2_000_000)
+    itc_i, itc_c = _amount(rnd, 0, integrated // 100), _amount(rnd, 0, central // 100)
+    interest = _plain(rnd.choice([0, _amount(rnd, 0, 500)]))
+    return [
+        f"Integrated tax {_plain(integrated)} 0.00 {_plain(integrated)} {_plain(itc_i)} 0.00 0.00 - "
+        f"{_plain(integrated - itc_i)} 0.00 -",
+        f"Central tax {_plain(central)} 0.00 {_plain(central)} {_plain(itc_c)} 0.00 - - {_plain(central - itc_c)} {interest} 0.00",
+        f"State/UT tax {_plain(central)} 0.00 {_plain(central)} {_plain(itc_c)} - 0.00 - {_plain(central - itc_c)} {interest} 0.00",
+        "Cess 0.00 0.00 0.00 - - - 0.00 0.00 0.00 -",
+    ]
+
+
+def gstr3b_pdf(year="2025", pages=4, seed=0):
+    """GSTR-3B of the 2024 or 2025 layout with Tables 3.1 and 4 as grids and Table 6.1 as text."""
+    rnd = random.Random(seed)
+    start, fy = _financial_year(rnd, int(year) - 1, int(year))
+    month = rnd.randint(1, 12)
+    w = _Writer()
+    w.lines([
+        "Form GSTR-3B",
+        "[See rule 61(5)]",
+        f"Year {fy}",
+        f"Period {MONTHS[(month - 4) % 12]}",
+        f"GSTIN of the supplier {_gstin(rnd)}",
+        f"Legal name of the registered person {_legal_name(rnd)}",
+        "Trade name, if any",
+        f"Date of ARN {_date(rnd, start + (month < 4), month)}",
+        "3.1 Details of Outward supplies and inward supplies liable to reverse charge",
+    ])
+    rows = [["Nature of Supplies", "Total taxable value", "Integrated tax", "Central tax", "State/UT tax", "Cess"]]
+    rows += [[nature[:38]] + [format_rupees(_amount(rnd)) for _ in range(5)] for nature in NATURE_OF_SUPPLIES]
+    w.table([190, 80, 70, 70, 70, 45], rows)
+
+    w.new_page()
+    w.lines(["4. Eligible ITC"])
+    rows = [["Details", "Integrated tax", "Central tax", "State/UT tax", "Cess"]]
+    for label in TABLE_4_ROWS:
+        amounts = ["" if label[0] in "AB" else format_rupees(_amount(rnd, 1)) for _ in range(4)]
+        rows.append([label[:52]] + amounts)
+    w.table([235, 75, 75, 75, 45], rows)
+
+    # Annexure pages between Table 4 and the payment of tax
+    w.pad(pages - 1, lambda: f"{rnd.choice(list(GST_STATE_CODES.values()))}  {format_rupees(_amount(rnd))}  {format_rupees(_amount(rnd, 0, 10**5))}")
+
+    payment_rows = _payment_rows_2024 if year == "2024" else _payment_rows_2025
+    w.new_page()
+    w.lines(
+        ["6.1 Payment of tax", "Description Tax payable", "(A) Other than reverse charge"]
+        + payment_rows(rnd, "A")
+        + ["(B) Reverse charge"]
+        + payment_rows(rnd, "B")
+        + ["Breakup of tax liability declared (for interest computation)", "Verification"]
+    )
+    return w.to_bytes()
+
+
+def form24q_pdf(pages=1, seed=0):
+    """Form 24Q statement with the deducted, challan and deposited totals on its first page."""
+    rnd = random.Random(seed)
+    start, fy = _financial_year(rnd)
+    quarter = rnd.randint(1, 4)
+    deducted = _amount(rnd, 10**6, 10**8)
+    challan = deducted + _amount(rnd, 0, 10**5)
+    w = _Writer()
+    w.lines([
+        f"Form 24Q {fy} Q{quarter} Regular",
+        f"TAN {_tan(rnd)}   Name of Deductor {_legal_name(rnd)}",
+        "Type of Statement Original",
+        f"Filed on {rnd.randint(1, 28)} {MONTHS[(quarter * 3 + rnd.randint(0, 2)) % 12]} {start + (quarter == 4)}",
+        "",
+        "Total Tax Deducted    Total Challan Amount    Total Tax Deposited as per Deductee Details",
+    ])
+    w.row([_plain(deducted), _plain(challan), _plain(deducted)], x=[MARGIN, 200, 360])
+    w.pad(pages, lambda: f"{_pan(rnd, 'P')}  {format_rupees(_amount(rnd, 1_000, 100_000))}  {format_rupees(_amount(rnd, 0, 10_000))}")
+    return w.to_bytes()
+
+
+def form26q_pdf(pages=1, seed=0):
+    """Form 26Q provisional receipt with its statement details and the grid of return records."""
+    rnd = random.Random(seed)
+    start, _ = _financial_year(rnd)
+    quarter = rnd.randint(1, 4)
+    first_month = (quarter * 3 + 1) % 12 or 12
+    year = start + (quarter == 4)
+    w = _Writer()
+    w.lines([
+        "Provisional Receipt",
+        f"Statement for period Q{quarter} (From 01/{first_month:02d}/{year % 100:02d} to 30/{first_month + 2:02d}/{year % 100:02d})",
+        f"Form No. 26Q   TAN {_tan(rnd)}",
+        f"Receipt for Form No. 26Q of {_legal_name(rnd)}",
+        f"Date: {_date(rnd, year)}",
+    ])
+    rows = [["Sr. No.", "Return Type", "No. of Deductee / Party Records", "Amount Paid (₹)", "Tax Deducted / Collected (₹)", "Tax Deposited (₹)"]]
+    # About forty records fit on a page
+    for number in range(max(1, pages * 40 - 8)):
+        paid = _amount(rnd, 10_000, 10**7)
+        tax = paid // 10
+        rows.append([number + 1, rnd.choice(["Regular", "Correction"]), rnd.randint(1, 500), format_rupees(paid), format_rupees(tax), format_rupees(tax)])
+    w.table([45, 70, 130, 90, 110, 70], rows)
+    return w.to_bytes()
+
+
+def hdfc_challan_pdf(pages=1, seed=0):
+    """HDFC Bank ITNS 281 challan counterfoil, one field per line as the bank prints it."""
+    rnd = random.Random(seed)
+    start, _ = _financial_year(rnd)
+    tax, interest, fee = _amount(rnd, 1_000, 10**6), rnd.choice([0, _amount(rnd, 0, 5_000)]), rnd.choice([0, 20_000])
+    received = _date(rnd, start + 1)
+    w = _Writer()
+    w.lines([
+        "HDFC BANK",
+        "Income Tax Challan Counterfoil",
+        "CHALLAN NO./ITNS 281",
+        "Tax Applicable (0020) Company Deductees",
+        f"TAN : {_tan(rnd)}",
+        f"Name : {_legal_name(rnd)}",
+        f"Assessment Year : {start + 1}-{(start + 2) % 100:02d}",
+        f"Nature of Payment {rnd.choice(['92B', '94C', '94J', '94I', '94H'])}",
+        "Type of Payment (200) TDS/TCS Payable by Taxpayer",
+        f"Basic Tax {format_rupees(tax)}",
+        f"Surcharge 0.00 Challan No {rnd.randint(10000, 99999)}",
+        f"Education Cess 0.00 BSR Code {rnd.randint(10**6, 10**7 - 1)}",
+        f"Penalty 0.00 Date of Receipt {received}",
+        f"Others 0.00 Challan Serial No. {rnd.randint(10000, 99999)}",
+        f"Interest {format_rupees(interest)}",
+        f"Fee (Sec. 234E) {format_rupees(fee)}",
+        f"TOTAL {format_rupees(tax + interest + fee)} Drawn on HDFC BANK LTD",
+        "Payment Mode Net Banking",
+        "Taxpayers Counterfoil",
+        f"Payment Realisation Date {received}",
+    ], step=14)
+    w.pad(pages, lambda: "This is a computer generated counterfoil and does not require a signature.")
+    return w.to_bytes()
+
+
+def itd_challan_pdf(breakup=True, pages=1, seed=0):
+    """Income Tax Department challan receipt, with or without the tax breakup details."""
+    rnd = random.Random(seed)
+    start, fy = _financial_year(rnd)
+    tax, interest = _amount(rnd, 1_000, 10**6) // 100 * 100, rnd.choice([0, _amount(rnd, 0, 5_000) // 100 * 100])
+    total = tax + interest
+    challan, tender = rnd.randint(10000, 99999), _date(rnd, start + 1)
+    name = f"{rnd.choice(_NAMES)} {rnd.choice(_SUFFIXES)}"
+    w = _Writer()
+    w.lines([
+        "Challan Receipt",
+        "ITNS No. : 281",
+        f"TAN : {_tan(rnd)}",
+        f"Name : {name}" if breakup else name,
+        f"Assessment Year : {start + 1}-{(start + 2) % 100:02d}",
+        f"Financial Year : {fy}",
+        "Major Head : Corporation Tax (0020)",
+        f"Nature of Payment : {rnd.choice(['92B', '94C', '94J', '94I', '94H'])}",
+        f"Amount (in Rs.) : ₹ {format_rupees(total).split('.')[0]}",
+        f"CIN : {rnd.randint(10**16, 10**17 - 1)}",
+        f"Challan No : {challan}",
+        f"Tender Date : {tender}",
+    ], size=9, step=14)
+    if breakup:
+        w.lines([
+            "Tax Breakup Details (Amount In ₹)",
+            f"ATax ₹ {format_rupees(tax).split('.')[0]}",
+            "BSurcharge ₹ 0",
+            "CCess ₹ 0",
+            f"DInterest ₹ {format_rupees(interest).split('.')[0]}",
+            "EPenalty ₹ 0",
+            "FFee under section 234E ₹ 0",
+            f"Total (A+B+C+D+E+F) ₹ {format_rupees(total).split('.')[0]}",
+        ], size=9, step=14)
+    # PyPDF2 joins pages without a line break, so the receipt ends on a line of its own
+    w.lines(["Taxpayer's Counterfoil"], size=9, step=14)
+    w.pad(pages, lambda: "Please quote the CIN in all correspondence relating to this payment.")
+    return w.to_bytes()
+
+
+# Command-line name -> document type and generator taking ``pages`` and ``seed``
+GENERATORS = {
+    "gstr1": ("GSTR-1", gstr1_pdf),
+    "gstr3b-2024": ("GSTR-3B 2024", lambda pages, seed: gstr3b_pdf("2024", pages, seed)),
+    "gstr3b-2025": ("GSTR-3B 2025", lambda pages, seed: gstr3b_pdf("2025", pages, seed)),
+    "form24q": ("Form24Q", form24q_pdf),
+    "form26q": ("Form26Q & Form27Q", form26q_pdf),
+    "hdfc": ("HDFC Bank", hdfc_challan_pdf),
+    "itd-breakup": ("Income Tax Department with Tax Breakup", lambda pages, seed: itd_challan_pdf(True, pages, seed)),
+    "itd": ("Income Tax Department without Tax Breakup", lambda pages, seed: itd_challan_pdf(False, pages, seed)),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m extraction.synthetic", description="Write synthetic GSTR and TDS PDFs.")
+    parser.add_argument("doc_type", choices=GENERATORS, help="document type to generate")
+    parser.add_argument("output", type=Path, help="directory for the PDFs")
+    parser.add_argument("-n", "--count", type=int, default=10, help="number of PDFs (default: %(default)s)")
+    parser.add_argument("-p", "--pages", type=int, default=1, help="minimum pages per PDF (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first PDF; the others follow (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    _, generate = GENERATORS[args.doc_type]
+    args.output.mkdir(parents=True, exist_ok=True)
+    for number in range(args.count):
+        path = args.output / f"{args.doc_type}_{args.seed + number:05d}.pdf"
+        path.write_bytes(generate(args.pages, args.seed + number))
+    print(f"Wrote {args.count} {args.doc_type} PDFs to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,341 @@
+"""TDS return and challan extractors."""
+from io import BytesIO
+
+import fitz
+import pandas as pd
+import pdfplumber
+import PyPDF2
+
+from extraction.money import format_rupees, parse_paise
+from extraction.patterns import TDS_PAYMENTS, TDS_RETURNS
+from extraction.timing import (
+    DATAFRAME_BUILDING,
+    EXCEL_WRITING,
+    PDF_OPEN,
+    TABLE_EXTRACTION,
+    TEXT_EXTRACTION,
+    stage,
+)
+
+
+# Function to extract details from TDS Returns PDF (For Form 26)
+def extract_details_from_pdf(pdf_path):
+    try:
+        with stage(PDF_OPEN):
+            pdf = pdfplumber.open(pdf_path)
+        with pdf:
+            extracted_text = ""
+
+            # Combine text from all pages
+            with stage(TEXT_EXTRACTION):
+                for page in pdf.pages:
+                    extracted_text += page.extract_text() or ""
+
+            # Extract specific details
+            # Extract Period
+            period = TDS_RETURNS.period.search(extracted_text)
+
+            # Extract Date Range
+            date_range = TDS_RETURNS.date_range.search(extracted_text)
+
+            # Extract the second occurrence of Form No.
+            form_no_matches = TDS_RETURNS.form_no.findall(extracted_text)
+            form_no = form_no_matches[1] if len(form_no_matches) > 1 else "Not found"
+
+            # Extract TAN of the deductor
+            tan = TDS_RETURNS.tan.search(extracted_text)
+
+            # Extract Date
+            date = TDS_RETURNS.date.search(extracted_text)
+
+            # Format extracted details as a single row DataFrame
+            details = {
+                "Period": [period.group(1) if period else "Not found"],
+                "Date Range": [f"{date_range.group(1)} to {date_range.group(2)}" if date_range else "Not found"],
+                "Form No.": [form_no],
+                "TAN": [tan.group(1) if tan else "Not found"],
+                "Date": [date.group(1) if date else "Not found"],
+            }
+
+            with stage(DATAFRAME_BUILDING):
+                return pd.DataFrame(details)
+
+    except Exception as e:
+        return pd.DataFrame({"Error": [str(e)]})
+
+# Function to extract table from TDS Returns PDF (For Form 26)
+def extract_table_from_pdf(pdf_path):
+    try:
+        with stage(PDF_OPEN):
+            pdf = pdfplumber.open(pdf_path)
+        with pdf:
+            extracted_data = []
+
+            for page in pdf.pages:
+                with stage(TABLE_EXTRACTION):
+                    tables = page.extract_tables()
+
+                for table in tables:
+                    if table:
+                        for row in table:
+                            extracted_data.append(row)
+
+            headers = ["Sr. No.", "Return Type", "No. of Deductee / Party Records", "Amount Paid (₹)", "Tax Deducted / Collected (₹)", "Tax Deposited (₹)"]
+            table_data = []
+
+            for row in extracted_data:
+                if len(row) == len(headers):
+                    row_dict = dict(zip(headers, row))
+                    table_data.append(row_dict)
+
+            if len(table_data) > 1 and table_data[0]["Sr. No."] == "Sr. No.":
+                table_data.pop(0)
+
+            with stage(DATAFRAME_BUILDING):
+                df = pd.DataFrame(table_data)
+                df.dropna(subset=headers, how='all', inplace=True)
+
+            return df
+
+    except Exception as e:
+        return pd.DataFrame({"Error": [str(e)]})
+
+# Function: Process HDFC Bank PDF
+def process_hdfc_bank(pdf_file):
+    extracted_text = ""
+    with stage(PDF_OPEN):
+        pdf = pdfplumber.open(pdf_file)
+    with pdf, stage(TEXT_EXTRACTION):
+        for page in pdf.pages:
+            extracted_text += page.extract_text() + "\n"
+    return extracted_text
+
+# Function: Parse HDFC Bank Text
+def parse_hdfc_bank_text(raw_text):
+    lines = raw_text.split("\n")
+    tan = TDS_PAYMENTS.tan.search(raw_text)
+    return {
+        "TAN": tan.group(1) if tan else "Not found",
+        "Date of Receipt": lines[12].split()[-1],
+        "Nature of Payment": lines[7].strip().replace("Nature of Payment ", ""),
+        "Basic Tax": float(lines[9].replace("Basic Tax", "").strip().replace(",", "")),
+        "Interest": float(lines[14].split()[1].replace(",", "")),
+        "Penalty": float(lines[12].split()[1].replace(",", "")),
+        "Fee (Sec. 234E)": float(lines[15].split()[3].replace(",", "")),
+        "TOTAL Amount": float(lines[16].split("Drawn on")[0].replace("TOTAL", "").strip().replace(",", "")),
+        "Drawn on": lines[16].split("Drawn on")[-1].strip(),
+        "Payment Realisation Date": lines[19].split()[-1],
+        "Challan No": int(lines[10].split()[-1].replace(",", "")),
+        "Challan Serial No.": int(lines[13].split()[-1].replace(",", ""))
+    }
+
+# Function: Process Income Tax PDF
+def process_income_tax(pdf_file):
+    with stage(PDF_OPEN):
+        reader = PyPDF2.PdfReader(pdf_file)
+    text = ""
+    with stage(TEXT_EXTRACTION):
+        for page in reader.pages:
+            text += page.extract_text()
+    return text
+
+# Function: Parse Income Tax Text
+def parse_income_tax_text(text):
+    details = {}
+    lines = text.split("\n")
+    
+    for i, line in enumerate(lines):
+        if "TAN" in line:
+            details["TAN"] = line.split(":")[-1].strip() 
+            if i + 1 < len(lines):
+                details["Name"] = TDS_PAYMENTS.name_prefix.sub('', lines[i + 1].strip())  
+        elif "Assessment Year" in line:
+            details["Assessment Year"] = line.split(":")[-1].strip()
+        elif "Financial Year" in line:
+            details["Financial Year"] = line.split(":")[-1].strip()
+        elif "Nature of Payment" in line:
+            details["Nature of Payment"] = line.split(":")[-1].strip()
+        elif "Challan No" in line:
+            details["Challan No."] = line.split(":")[-1].strip()
+        elif "Tender Date" in line:
+            tender_date_raw = line.split(":")[-1]
+            tender_date_cleaned = tender_date_raw.split("Tax Breakup Details")[0].strip()
+            details["Tender Date"] = tender_date_cleaned
+        elif line.startswith("ATax"):
+            details["Tax"] = line.split("₹")[-1].strip()    
+        elif line.startswith("DInterest"):
+            details["Interest"] = line.split("₹")[-1].strip()
+        elif line.startswith("EPenalty"):
+            details["Penalty"] = line.split("₹")[-1].strip()
+        elif line.startswith("FFee under section 234E"):
+            details["Fee (Sec. 234E)"] = line.split("₹")[-1].strip()
+        elif line.startswith("Total (A+B+C+D+E+F)"):
+            details["TOTAL"] = line.split("₹")[-1].strip()
+    return details
+
+# Challan fields of Income Tax Department receipts without tax breakup
+CHALLAN_FIELDS = {
+    "TAN": TDS_PAYMENTS.tan,
+    "Name": TDS_PAYMENTS.deductor_name,
+    "Assessment Year": TDS_PAYMENTS.assessment_year,
+    "Financial Year": TDS_PAYMENTS.financial_year,
+    "Nature of Payment": TDS_PAYMENTS.nature_of_payment,
+    "Amount (in Rs.)": TDS_PAYMENTS.amount,
+    "Challan No.": TDS_PAYMENTS.challan_no,
+    "Tender Date": TDS_PAYMENTS.tender_date,
+}
+
+# Function: Custom Payment Processing
+def extract_pdf_details(pdf_file):
+    with stage(PDF_OPEN):
+        reader = PyPDF2.PdfReader(pdf_file)
+    text = ""
+
+    with stage(TEXT_EXTRACTION):
+        for page in reader.pages:
+            text += page.extract_text()
+
+    extracted_data = {}
+    for key, pattern in CHALLAN_FIELDS.items():
+        match = pattern.search(text)
+        extracted_data[key] = match.group(1) if match else "Not Found"
+
+    return extracted_data
+
+# Function for cleaning an amount to integer paise
+def clean_amount_paise(amount_str):
+    try:
+        return parse_paise(TDS_RETURNS.non_amount.sub('', amount_str))
+    except TypeError:
+        return None
+
+# Function to extract Form24 details
+def extract_details_from_form24(pdf_file):
+    details = {
+        "Form No.": "",
+        "TAN": "",
+        "Financial Year": "",
+        "Quarter": "",
+        "Periodicity": "",
+        "Date of Filing": "",
+        "Total Tax Deducted (₹)": "",
+        "Total Challan Amount (₹)": "",
+        "Total Tax Deposited as per Deductee Details (₹)": ""
+    }
+
+    try:
+        with stage(PDF_OPEN):
+            pdf_document = fitz.open(stream=pdf_file.read(), filetype="pdf")
+        with stage(TEXT_EXTRACTION):
+            page = pdf_document.load_page(0)
+            text_blocks = page.get_text("blocks")
+        text = " ".join(block[4] for block in text_blocks)
+        
+        if '24Q' in text:
+            details["Form No."] = "24Q"
+
+        tan_match = TDS_RETURNS.tan.search(text)
+        if tan_match:
+            details["TAN"] = tan_match.group(1)
+
+        year_match = TDS_RETURNS.financial_year.search(text)
+        if year_match:
+            details["Financial Year"] = year_match.group(1)
+
+        quarter_match = TDS_RETURNS.quarter.search(text)
+        if quarter_match:
+            details["Quarter"] = f"Q{quarter_match.group(1)}"
+
+        periodicity_match = TDS_RETURNS.regular.search(text)
+        if periodicity_match:
+            details["Periodicity"] = "Regular"
+
+        type_match = TDS_RETURNS.statement_type.search(text)
+        if type_match:
+            details["Type of Statement"] = type_match.group(1)
+
+        date_match = TDS_RETURNS.filing_date.search(text)
+        if date_match:
+            details["Date of Filing"] = date_match.group(1)
+
+        table_rows = []
+        current_row = []
+        prev_y = None
+        
+        sorted_blocks = sorted(text_blocks, key=lambda b: (b[1], b[0]))
+        
+        for block in sorted_blocks:
+            y_coord = round(block[1], 1)
+            if prev_y is None:
+                prev_y = y_coord
+            
+            if abs(y_coord - prev_y) > 5:
+                if current_row:
+                    table_rows.append(" ".join(current_row))
+                current_row = [block[4].strip()]
+                prev_y = y_coord
+            else:
+                current_row.append(block[4].strip())
+        
+        if current_row:
+            table_rows.append(" ".join(current_row))
+
+        for row in table_rows:
+            numbers = TDS_RETURNS.numbers.findall(row)
+            large_numbers = [n for n in numbers if len(n.replace('.', '')) >= 8]
+            
+            if len(large_numbers) >= 3:
+                amounts = []
+                for num in large_numbers:
+                    paise = clean_amount_paise(num)
+                    if paise is not None:
+                        amounts.append(paise)
+                
+                if len(amounts) >= 3:
+                    max_index = amounts.index(max(amounts))
+                    
+                    details["Total Challan Amount (₹)"] = format_rupees(amounts[max_index])
+                    details["Total Tax Deducted (₹)"] = format_rupees(amounts[1 if max_index != 1 else 0])
+                    details["Total Tax Deposited as per Deductee Details (₹)"] = format_rupees(amounts[2])
+                    break
+
+        pdf_document.close()
+        with stage(DATAFRAME_BUILDING):
+            return pd.DataFrame([details])
+
+    except Exception as e:
+        return pd.DataFrame({"Error": [str(e)]})
+
+# Function: Save Data to Excel
+def save_to_excel(data_frames):
+    output = BytesIO()
+    with stage(DATAFRAME_BUILDING):
+        combined_df = pd.concat(data_frames, ignore_index=True)
+    with stage(EXCEL_WRITING), pd.ExcelWriter(output, engine='openpyxl') as writer:
+        combined_df.to_excel(writer, index=False, sheet_name="Extracted Data", float_format="%.2f")
+    output.seek(0)
+    return output
+
+# Function: Extract one uploaded PDF for the selected form type or payment source
+def extract_tds_document(pdf_file, doc_type):
+    if doc_type == "Form24Q":
+        return extract_details_from_form24(pdf_file)
+    elif doc_type == "Form26Q & Form27Q":
+        details_df = extract_details_from_pdf(pdf_file)
+        table_df = extract_table_from_pdf(pdf_file)
+        with stage(DATAFRAME_BUILDING):
+            return pd.concat([details_df, table_df], ignore_index=True)
+    elif doc_type == "HDFC Bank":
+        raw_text = process_hdfc_bank(pdf_file)
+        parsed_data = parse_hdfc_bank_text(raw_text)
+        with stage(DATAFRAME_BUILDING):
+            return pd.DataFrame([parsed_data])
+    elif doc_type == "Income Tax Department with Tax Breakup":
+        raw_text = process_income_tax(pdf_file)
+        parsed_data = parse_income_tax_text(raw_text)
+        with stage(DATAFRAME_BUILDING):
+            return pd.DataFrame([parsed_data])
+    else:  # Income Tax Department without Tax Breakup
+        extracted_details = extract_pdf_details(pdf_file)
+        with stage(DATAFRAME_BUILDING):
+            return pd.DataFrame([extracted_details])
@@ -0,0 +1,224 @@
+"""Wall time and call counts of the stages of the extraction pipelines.
+
+The extractors mark their hot paths with ``stage(...)``: opening a PDF,
+extracting its text, finding table grids, matching patterns, building
+DataFrames and writing workbooks. A stage only costs a context variable
+lookup unless a ``StageTimings`` is active, as it is within ``measure``, so
+the instrumentation stays in place in the command line and benchmark runs.
+Patterns check ``active_timings()`` the same way before timing a regex call.
+
+Stage times are exclusive: time spent in a nested stage, such as the
+patterns matched while a table is parsed, is only counted once, in the
+innermost stage. What no stage covers is reported as "other". Regex calls
+are also counted per pattern, with their matches (``pattern_breakdown``).
+
+The tools keep the timings of each extracted file, and of the batch around
+them, for the sidebar panel and append them as JSON lines to a log
+(``log_timings``) for later analysis.
+"""
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from datetime import datetime
+from functools import cache
+from pathlib import Path
+
+import pandas as pd
+
+DEFAULT_TIMING_LOG = Path(os.environ.get(
+    "EXTRACTION_TIMING_LOG", Path.home() / ".local" / "share" / "tds_gst_extraction" / "timings.jsonl"
+))
+
+# Stages of extracting one file
+PDF_OPEN = "PDF open"
+TEXT_EXTRACTION = "text extraction"
+TABLE_EXTRACTION = "extract_tables()"
+REGEX_MATCHING = "regex matching"
+DATAFRAME_BUILDING = "DataFrame building"
+EXCEL_WRITING = "Excel writing"
+# Stages of a batch in the tools, around the extraction of its files
+EXTRACTION_CACHE = "extraction cache"
+FILE_EXTRACTION = "file extraction"
+WAREHOUSE_STORE = "warehouse store"
+STAGES = (
+    EXTRACTION_CACHE, FILE_EXTRACTION, PDF_OPEN, TEXT_EXTRACTION, TABLE_EXTRACTION, REGEX_MATCHING,
+    DATAFRAME_BUILDING, WAREHOUSE_STORE, EXCEL_WRITING,
+)
+OTHER = "other"
+
+_active = ContextVar("stage_timings", default=None)
+_INACTIVE = nullcontext()
+
+# The StageTimings active in this context, or None; a bound C method, so hot
+# paths such as every regex call can check it without a Python call frame
+active_timings = _active.get
+
+
+class StageTimings:
+    """Calls and exclusive seconds per stage, and the total time the timings were active.
+
+    ``patterns`` maps ``(group, name)`` of each pattern called to its calls,
+    matches, misses (calls without a match) and seconds.
+    """
+
+    def __init__(self):
+        self.calls = {}
+        self.seconds = {}
+        self.patterns = {}
+        self.total = 0.0
+        self._open = []
+
+    def __getstate__(self):
+        # Sent back from pool workers between stages, so nothing is open
+        return {"calls": self.calls, "seconds": self.seconds, "patterns": self.patterns, "total": self.total}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state, _open=[])
+
+    def add(self, name, seconds, calls=1):
+        """Count ``seconds`` spent in a stage that has no nested stages."""
+        self.calls[name] = self.calls.get(name, 0) + calls
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+        if self._open:
+            self._open[-1].nested += seconds
+
+    def add_pattern(self, group, name, seconds, matches):
+        """Count one call of a pattern, timed by the caller, as regex matching."""
+        self.add(REGEX_MATCHING, seconds)
+        counters = self.patterns.setdefault((group, name), [0, 0, 0, 0.0])
+        counters[0] += 1
+        counters[1] += matches
+        counters[2] += not matches
+        counters[3] += seconds
+
+    @contextmanager
+    def active(self):
+        """Record the stages run in this block, and its wall time, in these timings."""
+        token = _active.set(self)
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.total += time.perf_counter() - start
+            _active.reset(token)
+
+    def merge(self, other):
+        for name, seconds in other.seconds.items():
+            self.calls[name] = self.calls.get(name, 0) + other.calls[name]
+            self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+        for key, values in other.patterns.items():
+            counters = self.patterns.setdefault(key, [0, 0, 0, 0.0])
+            for index, value in enumerate(values):
+                counters[index] += value
+        self.total += other.total
+
+    def as_dict(self):
+        """Stage -> calls and seconds, in pipeline order, with the unattributed rest as "other"."""
+        names = [name for name in STAGES if name in self.calls]
+        names += sorted(set(self.calls) - set(STAGES))
+        stages = {name: {"calls": self.calls[name], "seconds": self.seconds[name]} for name in names}
+        stages[OTHER] = {"calls": None, "seconds": max(self.total - sum(self.seconds.values()), 0.0)}
+        return stages
+
+
+class _Stage:
+    __slots__ = ("timings", "name", "start", "nested")
+
+    def __init__(self, timings, name):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self):
+        self.nested = 0.0
+        self.timings._open.append(self)
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        self.timings._open.pop()
+        self.timings.add(self.name, elapsed - self.nested)
+        if self.timings._open:
+            # add() counted the exclusive part; the parent excludes all of it
+            self.timings._open[-1].nested += self.nested
+
+
+def stage(name):
+    """Context manager counting its block as one call of the stage ``name``."""
+    timings = active_timings()
+    return _INACTIVE if timings is None else _Stage(timings, name)
+
+
+def measure(func, *args, **kwargs):
+    """``(func(*args, **kwargs), timings)``; picklable as a ``partial`` for ``extract_in_pool``."""
+    timings = StageTimings()
+    with timings.active():
+        result = func(*args, **kwargs)
+    return result, timings
+
+
+def breakdown(timings):
+    """Frame of the calls, seconds and share of the total per stage, summed over ``timings``."""
+    total = StageTimings()
+    for item in timings:
+        total.merge(item)
+    rows = [
+        {"Stage": name, "Calls": values["calls"], "Seconds": values["seconds"]}
+        for name, values in total.as_dict().items()
+    ]
+    df = pd.DataFrame(rows, columns=["Stage", "Calls", "Seconds"]).astype({"Calls": "Int64"})
+    df["Share"] = df["Seconds"] / total.total if total.total else 0.0
+    return df
+
+
+def pattern_breakdown(timings):
+    """Frame of the calls, matches, misses and seconds per pattern, summed over ``timings``, the slowest first."""
+    total = StageTimings()
+    for item in timings:
+        total.merge(item)
+    rows = [
+        {"Group": group, "Pattern": name, "Calls": calls, "Matches": matches, "Misses": misses, "Seconds": seconds}
+        for (group, name), (calls, matches, misses, seconds) in total.patterns.items()
+    ]
+    columns = ["Group", "Pattern", "Calls", "Matches", "Misses", "Seconds"]
+    return pd.DataFrame(rows, columns=columns).sort_values("Seconds", ascending=False, ignore_index=True)
+
+
+def file_breakdown(file_names, timings):
+    """Frame of the seconds per stage and in total, one row per file."""
+    rows = []
+    for file_name, item in zip(file_names, timings):
+        row = {"File Name": file_name, "Total": item.total}
+        row.update({name: values["seconds"] for name, values in item.as_dict().items()})
+        rows.append(row)
+    return pd.DataFrame(rows).fillna(0.0)
+
+
+@cache
+def _timing_logger(path):
+    logger = logging.getLogger(f"{__name__}.{path}")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handler = logging.FileHandler(path, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    return logger
+
+
+def log_timings(event, timings, path=DEFAULT_TIMING_LOG, **fields):
+    """Append one JSON line with the stage timings of ``event`` and ``fields`` such as the file name."""
+    entry = {
+        "time": datetime.now().isoformat(timespec="milliseconds"),
+        "event": event,
+        **fields,
+        "total": timings.total,
+        "stages": timings.as_dict(),
+        "patterns": {
+            f"{group}.{name}": {"calls": calls, "matches": matches, "misses": misses, "seconds": seconds}
+            for (group, name), (calls, matches, misses, seconds) in timings.patterns.items()
+        },
+    }
+    _timing_logger(Path(path)).info(json.dumps(entry, ensure_ascii=False))
@@ -0,0 +1,111 @@
+"""Version fingerprints of the table extractors.
+
+Cached tables are only reused while the code that produced them is
+unchanged. ``fingerprint`` hashes the source of an extractor together with
+everything of the ``extraction`` package it reaches through module globals:
+the helper functions and classes it calls, the patterns it matches and
+module-level constants such as ``TAX_TYPE_ROWS``. Editing
+``extract_table_6_1_2025`` therefore changes the fingerprint of Table 6.1 of
+the 2025 layout, and of nothing else that does not share its helpers.
+
+Extractors reach the document classes through the document they are
+passed, not through globals, so the code of ``ParsedPage``,
+``ParsedDocument`` and ``TextDocument`` is part of every fingerprint: a
+change to how ``ParsedPage.table`` ranks the tables of a page invalidates
+every cached table. Upgrades of pdfplumber, PyMuPDF or pandas are not part
+of any fingerprint.
+"""
+import hashlib
+import inspect
+from functools import cache
+
+from extraction.document import ParsedDocument, ParsedPage, TextDocument
+from extraction.patterns import Pattern, PatternGroup
+
+_CONSTANT_TYPES = (str, bytes, int, float, bool, tuple, list, dict, type(None))
+
+
+def _ours(obj):
+    return (getattr(obj, "__module__", None) or "").split(".")[0] == "extraction"
+
+
+def _source(obj):
+    try:
+        return inspect.getsource(obj)
+    except (OSError, TypeError):
+        # Without the source file, fall back to the compiled code
+        code = getattr(obj, "__code__", None)
+        return repr((code.co_code, code.co_consts)) if code else repr(obj)
+
+
+def _names(code):
+    """Global and attribute names used by a code object and the functions nested in it."""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            names |= _names(const)
+    return names
+
+
+def _pattern_text(pattern):
+    return f"{pattern!r} flags={pattern.regex.flags}"
+
+
+def _collect(func, parts, seen):
+    """Append the fingerprint parts of ``func`` and of everything it reaches."""
+    if func in seen:
+        return
+    seen.add(func)
+    parts.append(_source(func))
+    names = _names(func.__code__)
+    for name in sorted(names):
+        if name not in func.__globals__:
+            continue
+        obj = func.__globals__[name]
+        if isinstance(obj, PatternGroup):
+            # Only the patterns of the group that the function refers to by name
+            parts.extend(_pattern_text(pattern) for pattern in obj if pattern.name in names)
+        elif isinstance(obj, Pattern):
+            parts.append(_pattern_text(obj))
+        elif inspect.isfunction(obj) and _ours(obj):
+            _collect(obj, parts, seen)
+        elif inspect.isclass(obj) and _ours(obj):
+            _collect_class(obj, parts, seen)
+        elif isinstance(obj, (set, frozenset)):
+            parts.append(f"{name}={sorted(map(repr, obj))}")
+        elif isinstance(obj, _CONSTANT_TYPES):
+            parts.append(f"{name}={obj!r}")
+
+
+def _collect_class(cls, parts, seen):
+    """Append the source of ``cls`` and the fingerprint parts of its methods."""
+    if cls in seen:
+        return
+    seen.add(cls)
+    parts.append(_source(cls))
+    for member in vars(cls).values():
+        member = getattr(member, "__func__", getattr(member, "func", member))
+        if inspect.isfunction(member):
+            _collect(member, parts, seen)
+
+
+@cache
+def _document_fingerprint():
+    parts = []
+    seen = set()
+    for cls in (ParsedPage, ParsedDocument, TextDocument):
+        _collect_class(cls, parts, seen)
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+
+@cache
+def _function_fingerprint(func):
+    parts = []
+    _collect(func, parts, set())
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+
+def fingerprint(*functions):
+    """Short hex digest of the code of the functions, applied in that order, and of the document classes."""
+    digest = hashlib.sha256("\0".join([_document_fingerprint(), *(_function_fingerprint(func) for func in functions)]).encode())
+    return digest.hexdigest()[:16]
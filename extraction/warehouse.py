@@ -0,0 +1,213 @@
+"""Persistent warehouse of extracted returns and challans.
+
+Session results are gone once the browser tab closes, and the extraction
+cache only answers "this exact PDF again". The warehouse keeps the tables of
+every extracted GSTR-1, GSTR-3B and TDS document in a local SQLite database,
+indexed on GSTIN or TAN, financial year and period, so trends across months
+can be queried without re-parsing the PDFs.
+
+A document is identified by its type, GSTIN/TAN, financial year and period;
+storing a document with the same identity again (an amended return, or the
+same PDF re-uploaded) replaces the earlier rows. Documents whose identity
+cannot be read completely are keyed by their content hash instead, so they
+never replace another document. TDS statements are identified by TAN,
+financial year and quarter (Form 26Q and 27Q by form and quarter), so a
+correction statement replaces the statement it corrects; challans are
+identified by TAN, financial year and challan number. Table rows are stored as JSON objects, as
+the extractors produce them; GSTR-3B amounts are therefore int64 paise (see
+``extraction.money``).
+"""
+import copy
+import json
+import math
+import os
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+from extraction.gstr1 import gstr1_frames
+from extraction.gstr3b import gstr3b_frames
+
+DEFAULT_WAREHOUSE_PATH = Path(os.environ.get(
+    "EXTRACTION_WAREHOUSE", Path.home() / ".local" / "share" / "tds_gst_extraction" / "warehouse.sqlite3"
+))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    doc_type TEXT NOT NULL,
+    party TEXT NOT NULL,
+    financial_year TEXT NOT NULL,
+    period TEXT NOT NULL,
+    file_name TEXT,
+    content_hash TEXT NOT NULL,
+    stored_at TEXT NOT NULL,
+    UNIQUE (doc_type, party, financial_year, period)
+);
+CREATE INDEX IF NOT EXISTS documents_by_party ON documents (party, financial_year, period);
+CREATE INDEX IF NOT EXISTS documents_by_year ON documents (financial_year, period);
+CREATE TABLE IF NOT EXISTS table_rows (
+    document_id INTEGER NOT NULL REFERENCES documents (id) ON DELETE CASCADE,
+    table_name TEXT NOT NULL,
+    row_no INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (document_id, table_name, row_no)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS table_rows_by_table ON table_rows (table_name, document_id);
+"""
+
+# TDS document type -> columns of its first row holding the TAN, financial year and period
+_TDS_KEY_COLUMNS = {
+    "Form24Q": ("TAN", "Financial Year", "Quarter"),
+    "Income Tax Department with Tax Breakup": ("TAN", "Financial Year", "Challan No."),
+    "Income Tax Department without Tax Breakup": ("TAN", "Financial Year", "Challan No."),
+}
+
+
+def _text(value):
+    """Key part as text; missing and "Not found" values are ""."""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ""
+    value = str(value).strip()
+    return "" if value in ("Not found", "Not Found") else value
+
+
+def _financial_year_of(date):
+    """Financial year ("2023-24") of a dd/mm/yy or dd/mm/yyyy date, or ""."""
+    for date_format in ("%d/%m/%Y", "%d/%m/%y"):
+        try:
+            day = datetime.strptime(_text(date), date_format)
+        except ValueError:
+            continue
+        start = day.year if day.month >= 4 else day.year - 1
+        return f"{start}-{(start + 1) % 100:02d}"
+    return ""
+
+
+def document_key(doc_type, result):
+    """``(party, financial_year, period)`` of an extraction result; unreadable parts are ""."""
+    if doc_type == "GSTR-1":
+        details = result["details"]
+        return _text(details.get("GSTIN")), _text(details.get("Financial Year")), _text(details.get("Month"))
+    if doc_type.startswith("GSTR-3B"):
+        general = result["general_details"]
+        # The return period, not the filing month: returns filed in the same month stay apart
+        return _text(general.get("GSTIN")), _text(general.get("Financial Year")), _text(general.get("Period"))
+    if not len(result):
+        return "", "", ""
+
+    row = result.iloc[0].to_dict()
+    if doc_type == "Form26Q & Form27Q":
+        # The statement details are the first row; the return records follow
+        start = _text(row.get("Date Range")).split(" to ")[0]
+        form_no, quarter = _text(row.get("Form No.")), _text(row.get("Period"))
+        return _text(row.get("TAN")), _financial_year_of(start), f"{form_no} {quarter}" if form_no and quarter else ""
+    if doc_type == "HDFC Bank":
+        return _text(row.get("TAN")), _financial_year_of(row.get("Date of Receipt")), _text(row.get("Challan No"))
+    tan, financial_year, period = _TDS_KEY_COLUMNS[doc_type]
+    return _text(row.get(tan)), _text(row.get(financial_year)), _text(row.get(period))
+
+
+def document_tables(doc_type, result, file_name):
+    """Table name -> DataFrame of one extraction result, the same frames the tools show."""
+    result = copy.deepcopy(result)  # the frame builders add the file name in place
+    if doc_type == "GSTR-1":
+        total_liability, table_4A, table_4B = gstr1_frames([file_name], [result])
+        return {"Total Liability": total_liability, "Table 4A": table_4A, "Table 4B": table_4B}
+    if doc_type.startswith("GSTR-3B"):
+        general_df, table_3_1, table_4, table_6_1, _ = gstr3b_frames([file_name], [result], doc_type.split()[-1])
+        return {"General Details": general_df, "Table 3.1": table_3_1, "Table 4": table_4, "Table 6.1": table_6_1}
+    return {"Extracted Data": result.assign(**{"File Name": file_name})}
+
+
+def _records(df):
+    """Rows of ``df`` as JSON objects; missing values become null."""
+    values = df.astype(object).where(df.notna(), None)
+    return [json.dumps(row, default=str, ensure_ascii=False) for row in values.to_dict(orient="records")]
+
+
+class Warehouse:
+    """SQLite store of extracted document tables with upsert by document identity."""
+
+    def __init__(self, path=DEFAULT_WAREHOUSE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as connection:
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.executescript(_SCHEMA)
+
+    def _connect(self):
+        # One connection per call: Streamlit runs sessions on different threads
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.execute("PRAGMA foreign_keys = ON")
+        return connection
+
+    def store(self, doc_type, file_names, results, digests):
+        """Upsert the tables of each result; returns the document ids."""
+        stored_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        document_ids = []
+        with closing(self._connect()) as connection, connection:
+            for file_name, result, digest in zip(file_names, results, digests):
+                party, financial_year, period = document_key(doc_type, result)
+                if not (party and financial_year and period):
+                    period = f"sha256:{digest}"
+                document_id = connection.execute(
+                    """
+                    INSERT INTO documents (doc_type, party, financial_year, period, file_name, content_hash, stored_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (doc_type, party, financial_year, period) DO UPDATE SET
+                        file_name = excluded.file_name,
+                        content_hash = excluded.content_hash,
+                        stored_at = excluded.stored_at
+                    RETURNING id
+                    """,
+                    (doc_type, party, financial_year, period, file_name, digest, stored_at),
+                ).fetchone()[0]
+                connection.execute("DELETE FROM table_rows WHERE document_id = ?", (document_id,))
+                connection.executemany(
+                    "INSERT INTO table_rows (document_id, table_name, row_no, data) VALUES (?, ?, ?, ?)",
+                    [
+                        (document_id, table_name, row_no, record)
+                        for table_name, df in document_tables(doc_type, result, file_name).items()
+                        for row_no, record in enumerate(_records(df))
+                    ],
+                )
+                document_ids.append(document_id)
+        return document_ids
+
+    @staticmethod
+    def _where(doc_type, party, financial_year, period):
+        conditions, params = [], []
+        for column, value in (("doc_type", doc_type), ("party", party), ("financial_year", financial_year), ("period", period)):
+            if value is None:
+                continue
+            values = [value] if isinstance(value, str) else list(value)
+            conditions.append(f"documents.{column} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+        return (" WHERE " + " AND ".join(conditions) if conditions else ""), params
+
+    def documents(self, doc_type=None, party=None, financial_year=None, period=None):
+        """Stored documents, optionally filtered; each filter is a value or a list of values."""
+        where, params = self._where(doc_type, party, financial_year, period)
+        with closing(self._connect()) as connection:
+            return pd.read_sql_query(
+                f"SELECT * FROM documents{where} ORDER BY party, financial_year, period, doc_type", connection, params=params
+            )
+
+    def table(self, table_name, doc_type=None, party=None, financial_year=None, period=None):
+        """Rows of one table ("Table 6.1", "Extracted Data", ...) across the matching documents."""
+        where, params = self._where(doc_type, party, financial_year, period)
+        where = (where + " AND" if where else " WHERE") + " table_rows.table_name = ?"
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                f"""
+                SELECT table_rows.data FROM documents
+                JOIN table_rows ON table_rows.document_id = documents.id{where}
+                ORDER BY documents.party, documents.financial_year, documents.period, documents.id, table_rows.row_no
+                """,
+                [*params, table_name],
+            ).fetchall()
+        return pd.DataFrame([json.loads(data) for data, in rows])
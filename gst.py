@@ -1,9 +1,22 @@
 import streamlit as st
-import fitz  # PyMuPDF
-import pdfplumber
-import re
-import pandas as pd
+import copy
+from functools import partial
 from pathlib import Path
+
+from extraction.cache import ExtractionCache, content_hash
+from extraction.corpus import Corpus
+from extraction.export import EXPORT_FORMATS, archive_bytes, deferred_export, deferred_workbook, selection_hash
+from extraction.filters import GSTR3B_FILTERS, FilterIndex
+from extraction.money import rupees_frame
+from extraction.gstr1 import GSTR1_TABLES, extract_gstr1, gstr1_frames
+from extraction.gstr3b import GSTR3B_TABLES, extract_gstr3b, gstr3b_frames
+from extraction.incremental import cached_tables, store_tables
+from extraction.parallel import DEFAULT_WORKERS, extract_in_pool
+from extraction.timing import (
+    DATAFRAME_BUILDING, EXTRACTION_CACHE, FILE_EXTRACTION, WAREHOUSE_STORE,
+    StageTimings, breakdown, file_breakdown, log_timings, measure, pattern_breakdown, stage,
+)
+from extraction.warehouse import Warehouse
  
 # Set Streamlit page layout
 st.set_page_config(layout="wide")
@@ -45,2009 +58,141 @@ gstr3b_year = None
 if gst_type == "GSTR-3B":
     gstr3b_year = st.sidebar.radio("Select GSTR-3B Year", ["2024", "2025"])
 
+# Add worker count for parallel extraction
+parallel_workers = st.sidebar.number_input(
+    "Parallel workers", min_value=1, max_value=max(DEFAULT_WORKERS, 1), value=DEFAULT_WORKERS,
+    help="Processes used to extract uploaded GSTR-3B files, or the pages of large GSTR-1 returns."
+)
+
+# Keep extracted returns for month-on-month comparisons
+save_to_warehouse = st.sidebar.checkbox(
+    "Save results to the warehouse", value=True,
+    help="Store the extracted tables by GSTIN, financial year and period; amended returns replace earlier ones."
+)
+
+# Keep the decoded pages so fixed extractors can be re-run without the PDFs
+keep_corpus = st.sidebar.checkbox(
+    "Keep decoded text in the corpus", value=False,
+    help="Also decode the words and table grids of every page of each new PDF and store them, so fixed "
+    "extractors can be replayed without the PDF. Makes the first extraction of a PDF slower."
+)
+
 # Add refresh note
 st.sidebar.info("🔄 Kindly refresh the page to upload new files or start again.")
  
-# GST State Code Mapping
-GST_STATE_CODES = {
-    "01": "Jammu and Kashmir", "02": "Himachal Pradesh", "03": "Punjab", "04": "Chandigarh",
-    "05": "Uttarakhand", "06": "Haryana", "07": "Delhi", "08": "Rajasthan", "09": "Uttar Pradesh",
-    "10": "Bihar", "11": "Sikkim", "12": "Arunachal Pradesh", "13": "Nagaland", "14": "Manipur",
-    "15": "Mizoram", "16": "Tripura", "17": "Meghalaya", "18": "Assam", "19": "West Bengal",
-    "20": "Jharkhand", "21": "Odisha", "22": "Chhattisgarh", "23": "Madhya Pradesh", "24": "Gujarat",
-    "26": "Dadra and Nagar Haveli and Daman and Diu", "27": "Maharashtra", "29": "Karnataka",
-    "30": "Goa", "31": "Lakshadweep", "32": "Kerala", "33": "Tamil Nadu", "34": "Puducherry",
-    "35": "Andaman and Nicobar Islands", "36": "Telangana", "37": "Andhra Pradesh", "38": "Ladakh",
-    "97": "Other Territory", "99": "Centre Jurisdiction",
-}
-
-# Helper function to get state from GSTIN
-def get_state_from_gstin(gstin):
-    if not gstin or len(gstin) < 2:
-        return "Unknown"
-    state_code = gstin[:2]
-    return GST_STATE_CODES.get(state_code, "Unknown")
- 
-# GSTR-1 Functions
-def extract_details(pdf_path):
-    details = {"GSTIN": "", "State": "", "Legal Name": "", "Month": "", "Financial Year": ""}
-   
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            text = page.extract_text()
-            if text:
-                gstin_match = re.search(r'GSTIN\s*[:\-]?\s*(\d{2}[A-Z0-9]{13})', text)
-                if gstin_match:
-                    details["GSTIN"] = gstin_match.group(1)
-                    details["State"] = GST_STATE_CODES.get(details["GSTIN"][:2], "Unknown")
-               
-                legal_name_match = re.search(r'Legal name of the registered person\s*[:\-]?\s*(.*)', text)
-                if legal_name_match:
-                    details["Legal Name"] = legal_name_match.group(1).strip()
-               
-                month_match = re.search(r'Tax period\s*[:\-]?\s*(\w+)', text)
-                if month_match:
-                    details["Month"] = month_match.group(1).strip()
-               
-                fy_match = re.search(r'Financial year\s*[:\-]?\s*(\d{4}-\d{2})', text)
-                if fy_match:
-                    details["Financial Year"] = fy_match.group(1).strip()
-               
-                break
-    return details
- 
-def extract_total_liability(pdf_bytes):
-    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
-        text = "\n".join([page.get_text("text") for page in doc])
-   
-    pattern = r"Total Liability \(Outward supplies other than Reverse charge\)\s+([\d,]+\.\d+)\s+([\d,]+\.\d+)\s+([\d,]+\.\d+)\s+([\d,]+\.\d+)\s+([\d,]+\.\d+)"
-    match = re.search(pattern, text)
-   
-    if match:
-        return [match.group(1), match.group(2), match.group(3), match.group(4), match.group(5)]
-    return ["Not Found", "", "", "", ""]
-
-# New function to extract Tables 4A and 4B
-def extract_tables_4A_4B(pdf_bytes):
-    tables = {
-        "4A": {
-            "description": "Taxable outward supplies made to registered persons (other than reverse charge supplies)",
-            "title": "B2B Regular",
-            "data": None
-        },
-        "4B": {
-            "description": "Taxable outward supplies made to registered persons attracting tax on reverse charge",
-            "title": "B2B Reverse charge",
-            "data": None
-        }
-    }
-    
-    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
-        text = "\n".join([page.get_text("text") for page in doc])
-        
-        # Extract Table 4A
-        pattern_4A = r"4A - Taxable outward supplies made to registered persons.*?Total\s+(\d+)\s+Invoice\s+([\d,]+\.\d+)\s+([\d,]+\.\d+)\s+([\d,]+\.\d+)\s+([\d,]+\.\d+)\s+([\d,]+\.\d+)"
-        match_4A = re.search(pattern_4A, text, re.DOTALL)
-        
-        if match_4A:
-            tables["4A"]["data"] = {
-                "No. of records": match_4A.group(1),
-                "Value": match_4A.group(2),
-                "Integrated Tax": match_4A.group(3),
-                "Central Tax": match_4A.group(4),
-                "State/UT Tax": match_4A.group(5),
-                "Cess": match_4A.group(6)
-            }
-        
-        # Extract Table 4B
-        pattern_4B = r"4B - Taxable outward supplies made to registered persons attracting tax on reverse charge.*?Total\s+(\d+)\s+Invoice\s+([\d,]+\.\d+)\s+([\d,]+\.\d+)\s+([\d,]+\.\d+)\s+([\d,]+\.\d+)\s+([\d,]+\.\d+)"
-        match_4B = re.search(pattern_4B, text, re.DOTALL)
-        
-        if match_4B:
-            tables["4B"]["data"] = {
-                "No. of records": match_4B.group(1),
-                "Value": match_4B.group(2),
-                "Integrated Tax": match_4B.group(3),
-                "Central Tax": match_4B.group(4),
-                "State/UT Tax": match_4B.group(5),
-                "Cess": match_4B.group(6)
-            }
-    
-    return tables
-
-# Common GSTR-3B Functions
-def clean_numeric_value(value):
-    if value is None:
-        return 0.0
-   
-    if isinstance(value, str):
-        value = value.replace("E", "").replace("F", "").strip()
-   
-    try:
-        return float(value.replace(",", ""))
-    except ValueError:
-        return 0.0
-
-def extract_general_details(text):
-    def safe_extract(pattern, text):
-        match = re.search(pattern, text)
-        return match.group(1).strip() if match else None
-   
-    gstin = safe_extract(r"GSTIN(?:\s+of\s+the\s+supplier)?\s+([A-Z0-9]+)", text)
-    state = get_state_from_gstin(gstin)
-    
-    return {
-        "GSTIN": gstin,
-        "State": state,
-        "Legal Name": safe_extract(r"Legal name of the registered person\s+(.+)", text),
-        "Date": safe_extract(r"Date of ARN\s+([\d/]+)", text),
-        "Financial Year": safe_extract(r"Year\s+(\d{4}-\d{2})", text),
-        "Period": safe_extract(r"Period\s+([A-Za-z]+)", text),
-    }
-
-def extract_table_3_1(pdf):
-    expected_columns = ["Nature of Supplies", "Total Taxable Value", "Integrated Tax", "Central Tax", "State/UT Tax", "Cess"]
-   
-    for page in pdf.pages:
-        text = page.extract_text()
-        if "3.1" in text and "Nature of Supplies" in text:
-            table = page.extract_table()
-            if table:
-                df = pd.DataFrame(table[1:], columns=table[0])
-                df = df.iloc[:, :len(expected_columns)]
-                df.columns = expected_columns
-               
-                for col in expected_columns[1:]:
-                    df[col] = df[col].apply(clean_numeric_value)
-                return df
-   
-    return pd.DataFrame(columns=expected_columns)
-
-# GSTR-3B 2024 Functions (Original Code)
-def extract_numbers_from_line(line):
-    """
-    Extract numeric values from a line, handling GSTR-3B number formats
-    """
-    # Remove common non-numeric characters but preserve decimals and commas
-    clean_line = re.sub(r'[^\d\s,\.]', ' ', line)
-    
-    # Find all number patterns
-    patterns = [
-        r'(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',  # Numbers with commas like 42,390.00
-        r'(\d+\.\d{2})',  # Decimal numbers like 42390.00
-        r'(\d+)'  # Plain integers
-    ]
-    
-    numbers = []
-    for pattern in patterns:
-        matches = re.findall(pattern, clean_line)
-        if matches:
-            for match in matches:
-                try:
-                    # Clean and convert
-                    clean_num = match.replace(',', '')
-                    num_val = float(clean_num)
-                    numbers.append(num_val)
-                except ValueError:
-                    continue
-            break  # Use the first pattern that gives us results
-    
-    return numbers
-
-def parse_table_4_data(table_text, full_text):
-    """
-    Parse Table 4 data based on the actual GSTR-3B structure
-    """
-    extracted_data = {}
-    
-    # Define patterns and known values based on the document structure
-    patterns = {
-        "(5) All other ITC": {
-            "patterns": [
-                r"\(5\)\s+All other ITC\s+([\d,]+\.?\d*)\s+([\d,]+\.?\d*)\s+([\d,]+\.?\d*)\s+([\d,]+\.?\d*)",
-                r"All other ITC\s+([\d,]+\.?\d*)\s+([\d,]+\.?\d*)\s+([\d,]+\.?\d*)\s+([\d,]+\.?\d*)"
-            ]
-        },
-        "(2) Others": {
-            "patterns": [
-                r"\(2\)\s+Others\s+([\d,]+\.?\d*)\s+([\d,]+\.?\d*)\s+([\d,]+\.?\d*)\s+([\d,]+\.?\d*)",
-                r"B\.\s+ITC Reversed.*?\(2\)\s+Others\s+([\d,]+\.?\d*)\s+([\d,]+\.?\d*)\s+([\d,]+\.?\d*)\s+([\d,]+\.?\d*)"
-            ]
-        },
-        "C. Net ITC available (A-B)": {
-            "patterns": [
-                r"C\.\s+Net ITC available \(A-B\)\s+([\d,]+\.?\d*)\s+([\d,]+\.?\d*)\s+([\d,]+\.?\d*)\s+([\d,]+\.?\d*)",
-                r"Net ITC available.*?([\d,]+\.?\d*)\s+([\d,]+\.?\d*)\s+([\d,]+\.?\d*)\s+([\d,]+\.?\d*)"
-            ]
-        },
-        "(1) ITC reclaimed which was reversed under Table 4(B)(2) in earlier tax period": {
-            "patterns": [
-                r"\(1\)\s+ITC reclaimed.*?earlier tax period\s+([\d,]+\.?\d*)\s+([\d,]+\.?\d*)\s+([\d,]+\.?\d*)\s+([\d,]+\.?\d*)",
-                r"ITC reclaimed.*?([\d,]+\.?\d*)\s+([\d,]+\.?\d*)\s+([\d,]+\.?\d*)\s+([\d,]+\.?\d*)"
-            ]
-        }
-    }
-    
-    # Try to extract using patterns first
-    for key, config in patterns.items():
-        found = False
-        for pattern in config["patterns"]:
-            match = re.search(pattern, full_text, re.IGNORECASE | re.DOTALL)
-            if match:
-                try:
-                    values = []
-                    for i in range(1, 5):
-                        val_str = match.group(i).replace(',', '')
-                        values.append(float(val_str))
-                    extracted_data[key] = values
-                    found = True
-                    break
-                except (ValueError, IndexError):
-                    continue
-        
-        # If not found through patterns, try line-by-line extraction
-        if not found:
-            lines = full_text.split('\n')
-            for line in lines:
-                if key == "(5) All other ITC" and "All other ITC" in line:
-                    numbers = extract_numbers_from_line(line)
-                    if len(numbers) >= 4:
-                        extracted_data[key] = numbers[:4]
-                        break
-                elif key == "(2) Others" and "(2)" in line and "Others" in line:
-                    numbers = extract_numbers_from_line(line)
-                    if len(numbers) >= 4:
-                        extracted_data[key] = numbers[:4]
-                        break
-                elif key == "C. Net ITC available (A-B)" and "Net ITC available" in line:
-                    numbers = extract_numbers_from_line(line)
-                    if len(numbers) >= 4:
-                        extracted_data[key] = numbers[:4]
-                        break
-                elif key.startswith("(1) ITC reclaimed") and "ITC reclaimed" in line:
-                    numbers = extract_numbers_from_line(line)
-                    if len(numbers) >= 4:
-                        extracted_data[key] = numbers[:4]
-                        break
-    
-    # For items not found, set to zero
-    remaining_items = [
-        "(1) Import of goods",
-        "(2) Import of services", 
-        "(3) Inward supplies liable to reverse charge (other than 1 & 2 above)",
-        "(4) Inward supplies from ISD",
-        "(1) As per rules 38,42 & 43 of CGST Rules and section 17(5)",
-        "(2) Ineligible ITC under section 16(4) & ITC restricted due to PoS rules"
-    ]
-    
-    for item in remaining_items:
-        if item not in extracted_data:
-            extracted_data[item] = [0.0, 0.0, 0.0, 0.0]
-    
-    return extracted_data
-
-def extract_table_4_2024(pdf):
-    """
-    Direct Table 4 extraction using the exact values from the PDF - 2024 version
-    """
-    # Initialize the result structure - FIXED: Added missing "(D) Other Details"
-    table_4_structure = [
-        "(1) Import of goods",
-        "(2) Import of services", 
-        "(3) Inward supplies liable to reverse charge (other than 1 & 2 above)",
-        "(4) Inward supplies from ISD",
-        "(5) All other ITC",
-        "(1) As per rules 38,42 & 43 of CGST Rules and section 17(5)",
-        "(2) Others",
-        "C. Net ITC available (A-B)",
-        "(D) Other Details",  # ADDED: This was missing
-        "(1) ITC reclaimed which was reversed under Table 4(B)(2) in earlier tax period",
-        "(2) Ineligible ITC under section 16(4) & ITC restricted due to PoS rules"
-    ]
-    
-    # Extract all text from PDF
-    full_text = ""
-    for page in pdf.pages:
-        page_text = page.extract_text()
-        if page_text:
-            full_text += page_text + "\n"
-    
-    # Initialize extracted data with known values from PDF
-    extracted_data = {}
-    
-    # Try to extract using pdfplumber table extraction first
-    for page in pdf.pages:
-        tables = page.extract_tables()
-        for table in tables:
-            if not table:
-                continue
-            
-            # Look for Table 4 structure
-            for row_idx, row in enumerate(table):
-                if not row or len(row) < 5:
-                    continue
-                
-                # Clean row data
-                cleaned_row = []
-                for cell in row:
-                    if cell is None:
-                        cleaned_row.append("")
-                    else:
-                        cleaned_row.append(str(cell).strip())
-                
-                first_cell = cleaned_row[0].lower()
-                
-                # Match specific patterns and extract values
-                if "(3)" in first_cell and "inward supplies liable to reverse charge" in first_cell:
-                    try:
-                        values = [clean_numeric_value(cleaned_row[i]) for i in range(1, 5)]
-                        if sum(values) > 0:  # Only if we have actual values
-                            extracted_data["(3) Inward supplies liable to reverse charge (other than 1 & 2 above)"] = values
-                    except:
-                        pass
-                
-                elif "(5)" in first_cell and "all other itc" in first_cell:
-                    try:
-                        values = [clean_numeric_value(cleaned_row[i]) for i in range(1, 5)]
-                        if sum(values) > 0:
-                            extracted_data["(5) All other ITC"] = values
-                    except:
-                        pass
-                
-                elif "(1)" in first_cell and "as per rules" in first_cell:
-                    try:
-                        values = [clean_numeric_value(cleaned_row[i]) for i in range(1, 5)]
-                        if sum(values) > 0:
-                            extracted_data["(1) As per rules 38,42 & 43 of CGST Rules and section 17(5)"] = values
-                    except:
-                        pass
-                
-                elif "(2)" in first_cell and "others" in first_cell:
-                    try:
-                        values = [clean_numeric_value(cleaned_row[i]) for i in range(1, 5)]
-                        if sum(values) > 0:
-                            extracted_data["(2) Others"] = values
-                    except:
-                        pass
-                
-                elif "net itc available" in first_cell:
-                    try:
-                        values = [clean_numeric_value(cleaned_row[i]) for i in range(1, 5)]
-                        if sum(values) > 0:
-                            extracted_data["C. Net ITC available (A-B)"] = values
-                    except:
-                        pass
-                
-                elif "(d)" in first_cell and "other details" in first_cell:
-                    try:
-                        values = [clean_numeric_value(cleaned_row[i]) for i in range(1, 5)]
-                        if sum(values) > 0:
-                            extracted_data["(D) Other Details"] = values
-                    except:
-                        pass
-                
-                elif "(1)" in first_cell and "itc reclaimed" in first_cell:
-                    try:
-                        values = [clean_numeric_value(cleaned_row[i]) for i in range(1, 5)]
-                        if sum(values) > 0:
-                            extracted_data["(1) ITC reclaimed which was reversed under Table 4(B)(2) in earlier tax period"] = values
-                    except:
-                        pass
-    
-    # If table extraction didn't work, try text-based extraction with exact values from your PDF
-    if not extracted_data:
-        # Hardcoded patterns based on the exact PDF format
-        patterns_with_values = [
-            # Pattern: description followed by 4 numbers
-            (r"(\(3\)).*?Inward supplies liable to reverse charge.*?(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s+(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s+(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s+(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)", 
-             "(3) Inward supplies liable to reverse charge (other than 1 & 2 above)"),
-            
-            (r"(\(5\)).*?All other ITC\s+(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s+(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s+(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s+(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)", 
-             "(5) All other ITC"),
-            
-            (r"(\(1\)).*?As per rules 38,42 & 43.*?(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s+(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s+(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s+(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)", 
-             "(1) As per rules 38,42 & 43 of CGST Rules and section 17(5)"),
-            
-            (r"(\(2\)).*?Others\s+(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s+(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s+(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s+(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)", 
-             "(2) Others"),
-            
-            (r"C\.\s*Net ITC available.*?(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s+(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s+(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s+(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)", 
-             "C. Net ITC available (A-B)"),
-            
-            # ADDED: Pattern for (D) Other Details
-            (r"\(D\)\s*Other Details\s+(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s+(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s+(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s+(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)", 
-             "(D) Other Details"),
-            
-            (r"(\(1\)).*?ITC reclaimed.*?earlier tax period\s+(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s+(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s+(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s+(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)", 
-             "(1) ITC reclaimed which was reversed under Table 4(B)(2) in earlier tax period")
-        ]
-        
-        for pattern, key in patterns_with_values:
-            match = re.search(pattern, full_text, re.IGNORECASE | re.DOTALL)
-            if match:
-                try:
-                    # Extract the 4 tax values (groups 2-5, group 1 is the number in parentheses)
-                    values = []
-                    start_group = 2 if match.group(1) else 1
-                    for i in range(start_group, start_group + 4):
-                        if i <= len(match.groups()):
-                            val = clean_numeric_value(match.group(i))
-                            values.append(val)
-                        else:
-                            values.append(0.0)
-                    
-                    if len(values) == 4:
-                        extracted_data[key] = values
-                except Exception as e:
-                    continue
-    
-    # Manual extraction based on the actual PDF values
-    # From the PDF document, I can see the exact values:
-    pdf_values = {
-        "(1) Import of goods": [0.00, 0.00, 0.00, 0.00],
-        "(2) Import of services": [0.00, 0.00, 0.00, 0.00],
-        "(3) Inward supplies liable to reverse charge (other than 1 & 2 above)": [215647.44, 114635.58, 114635.58, 0.00],
-        "(4) Inward supplies from ISD": [0.00, 0.00, 0.00, 0.00],
-        "(5) All other ITC": [4162091.37, 359432.35, 359432.35, 0.00],
-        "(1) As per rules 38,42 & 43 of CGST Rules and section 17(5)": [1047082.05, 261552.43, 261552.43, 0.00],
-        "(2) Others": [0.00, 43560.51, 43560.51, 0.00],
-        "C. Net ITC available (A-B)": [3330656.76, 168954.99, 168954.99, 0.00],
-        "(D) Other Details": [44866.70, 0.00, 0.00, 0.00],
-        "(1) ITC reclaimed which was reversed under Table 4(B)(2) in earlier tax period": [44866.70, 0.00, 0.00, 0.00],
-        "(2) Ineligible ITC under section 16(4) & ITC restricted due to PoS rules": [0.00, 0.00, 0.00, 0.00]
-    }
-    
-    # Use manual values if extraction failed
-    if not extracted_data:
-        extracted_data = pdf_values
-    
-    # Build result DataFrame
-    table_4_result = []
-    for row_desc in table_4_structure:
-        if row_desc in extracted_data:
-            values = extracted_data[row_desc]
-        else:
-            values = [0.0, 0.0, 0.0, 0.0]
-        
-        table_4_result.append({
-            "Details": row_desc,
-            "Integrated tax": values[0] if len(values) > 0 else 0.0,
-            "Central tax": values[1] if len(values) > 1 else 0.0,
-            "State/UT tax": values[2] if len(values) > 2 else 0.0,
-            "Cess": values[3] if len(values) > 3 else 0.0
-        })
-    
-    return pd.DataFrame(table_4_result)
-
-def extract_table_6_1_from_text(text):
-    """
-    Extract Table 6.1 Payment of tax, including all rows and columns as per PDF structure.
-    Handles line breaks between tax type and values, including split tax type names.
-    """
-    table_6_1_data = []
-    lines = text.split('\n')
-    tax_types = ['integrated tax', 'central tax', 'state/ut tax', 'cess']
-    all_rows = []
-
-    # Preprocess: join lines where tax type is split across lines
-    processed_lines = []
-    i = 0
-    while i < len(lines):
-        line_strip = lines[i].strip()
-        line_lower = line_strip.lower()
-        # Handle "Integrated" + "tax" + values (three lines)
-        if line_lower == "integrated" and i + 2 < len(lines) and lines[i + 1].strip().lower() == "tax":
-            values_line = lines[i + 2].strip()
-            processed_lines.append(f"Integrated tax {values_line}")
-            i += 3
-            continue
-        # Handle "Central" + "tax" + values (three lines)
-        elif line_lower == "central" and i + 2 < len(lines) and lines[i + 1].strip().lower() == "tax":
-            values_line = lines[i + 2].strip()
-            processed_lines.append(f"Central tax {values_line}")
-            i += 3
-            continue
-        # Handle "State/UT" + "tax" + values (three lines)
-        elif line_lower == "state/ut" and i + 2 < len(lines) and lines[i + 1].strip().lower() == "tax":
-            values_line = lines[i + 2].strip()
-            processed_lines.append(f"State/UT tax {values_line}")
-            i += 3
-            continue
-        # Handle "Cess" + values (two lines)
-        elif line_lower == "cess" and i + 1 < len(lines):
-            values_line = lines[i + 1].strip()
-            processed_lines.append(f"Cess {values_line}")
-            i += 2
-            continue
-        else:
-            processed_lines.append(line_strip)
-            i += 1
-
-    # Section detection and row extraction
-    current_section = None
-    for line in processed_lines:
-        line_lower = line.lower()
-        # Section detection
-        if line_lower.startswith("(a) other than reverse charge") or line_lower.startswith("other than reverse charge"):
-            current_section = "(A) Other than reverse charge"
-            continue
-        elif line_lower.startswith("(b) reverse charge") or (line_lower.startswith("reverse charge") and "other than" not in line_lower):
-            current_section = "(B) Reverse charge"
-            continue
-
-        # Only process lines that start with a tax type (case-insensitive, allow extra spaces)
-        for tax_type in tax_types:
-            pattern = r'^' + re.escape(tax_type) + r'\s*'
-            match = re.match(pattern, line, re.IGNORECASE)
-            if match:
-                row_text = line[match.end():].strip()
-                # Replace dashes and blanks with zero
-                row_text = re.sub(r'[-–]', ' 0 ', row_text)
-                row_text = re.sub(r'\s+', ' ', row_text)
-                numbers = re.findall(r'[\d,]+\.\d+|[\d,]+', row_text)
-                values = []
-                for num in numbers:
-                    try:
-                        values.append(float(num.replace(',', '')))
-                    except ValueError:
-                        values.append(0.0)
-                while len(values) < 8:
-                    values.append(0.0)
-                all_rows.append({
-                    "Tax Type": tax_type.title(),
-                    "Section": current_section if current_section else "",
-                    "Total tax payable": values[0],
-                    "Tax paid through ITC - Integrated tax": values[1],
-                    "Tax paid through ITC - Central tax": values[2],
-                    "Tax paid through ITC - State/UT tax": values[3],
-                    "Tax paid through ITC - Cess": values[4],
-                    "Tax paid in cash": values[5],
-                    "Interest paid in cash": values[6],
-                    "Late fee paid in cash": values[7]
-                })
-                break  # Only match one tax type per line
-
-    # Ensure every tax type appears for both sections, even if missing
-    sections = ["(A) Other than reverse charge", "(B) Reverse charge"]
-    for section in sections:
-        for tax_type in tax_types:
-            found = [row for row in all_rows if row["Tax Type"] == tax_type.title() and row["Section"] == section]
-            if found:
-                table_6_1_data.extend(found)
-            else:
-                # Add empty row if missing
-                table_6_1_data.append({
-                    "Tax Type": tax_type.title(),
-                    "Section": section,
-                    "Total tax payable": 0.0,
-                    "Tax paid through ITC - Integrated tax": 0.0,
-                    "Tax paid through ITC - Central tax": 0.0,
-                    "Tax paid through ITC - State/UT tax": 0.0,
-                    "Tax paid through ITC - Cess": 0.0,
-                    "Tax paid in cash": 0.0,
-                    "Interest paid in cash": 0.0,
-                    "Late fee paid in cash": 0.0
-                })
-
-    return table_6_1_data
-
-def determine_section_type(text, row_position):
-    """
-    Determine if a row belongs to 'Other than reverse charge' or 'Reverse charge' section
-    """
-    # Look for section headers in the text around the row position
-    text_lower = text.lower()
-    
-    # Find positions of section markers
-    reverse_charge_pos = text_lower.find("reverse charge")
-    other_than_pos = text_lower.find("other than reverse")
-    
-    # Simple heuristic: if reverse charge appears before other_than, 
-    # and we're in the later part of the table, it's likely reverse charge
-    if reverse_charge_pos != -1 and (other_than_pos == -1 or reverse_charge_pos > other_than_pos):
-        return "(B) Reverse charge"
-    else:
-        return "(A) Other than reverse charge"
-
-def extract_payment_data_from_row(row):
-    """
-    Extract payment data from a table row
-    """
-    if len(row) < 2:
-        return None
-    
-    try:
-        return {
-            "Tax Type": row[0],
-            "Total tax payable": clean_numeric_value(row[1]) if len(row) > 1 else 0.0,
-            "Tax paid through ITC - Integrated tax": clean_numeric_value(row[2]) if len(row) > 2 else 0.0,
-            "Tax paid through ITC - Central tax": clean_numeric_value(row[3]) if len(row) > 3 else 0.0,
-            "Tax paid through ITC - State/UT tax": clean_numeric_value(row[4]) if len(row) > 4 else 0.0, 
-            "Tax paid through ITC - Cess": clean_numeric_value(row[5]) if len(row) > 5 else 0.0,
-            "Tax paid in cash": clean_numeric_value(row[6]) if len(row) > 6 else 0.0,
-            "Interest paid in cash": clean_numeric_value(row[7]) if len(row) > 7 else 0.0,
-            "Late fee paid in cash": clean_numeric_value(row[8]) if len(row) > 8 else 0.0
-        }
-    except (IndexError, ValueError):
-        return None
-
-def extract_table_6_1_2024(pdf):
-    """
-    Final corrected Table 6.1 extraction that properly handles the actual PDF structure
-    """
-    full_text = ""
-    for page in pdf.pages:
-        page_text = page.extract_text()
-        if page_text:
-            full_text += page_text + "\n"
-
-    # Find Table 6.1 section
-    table_start = full_text.find("6.1 Payment of tax")
-    if table_start == -1:
-        table_start = full_text.find("Payment of tax")
-    
-    if table_start == -1:
-        return pd.DataFrame()
-    
-    # Find end of table
-    table_end = full_text.find("Breakup of tax liability", table_start)
-    if table_end == -1:
-        table_end = full_text.find("Verification", table_start)
-    if table_end == -1:
-        table_end = len(full_text)
-    
-    table_text = full_text[table_start:table_end]
-    
-    # Extract payment data using line-by-line approach
-    payment_data = extract_payment_data_line_by_line_2024   (table_text)
-    
-    return pd.DataFrame(payment_data)
-
-def extract_payment_data_line_by_line_2024(text):
-    """
-    Extract payment data line by line, properly handling the PDF format
-    """
-    lines = text.split('\n')
-    payment_data = []
-    current_section = ""
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-            
-        line_lower = line.lower()
-        
-        # Detect sections
-        if "other than reverse charge" in line_lower:
-            current_section = "(A) Other than reverse charge"
-            continue
-        elif "reverse charge" in line_lower and "other than" not in line_lower:
-            current_section = "(B) Reverse charge"
-            continue
-        
-        # Skip header lines
-        if any(skip in line_lower for skip in ['description', 'total tax payable', 'tax paid through', 'integrated tax central tax']):
-            continue
-        
-        # Process tax type lines
-        if current_section:
-            result = None
-            if line_lower.startswith('integrated tax') or line_lower.startswith('integrated'):
-                result = extract_integrated_tax_row_2024(line, current_section)
-            elif line_lower.startswith('central tax') or line_lower.startswith('central'):
-                result = extract_central_tax_row_2024(line, current_section)
-            elif line_lower.startswith('state/ut tax') or line_lower.startswith('state/ut'):
-                result = extract_state_tax_row_2024(line, current_section)
-            elif line_lower.startswith('cess'):
-                result = extract_cess_row_2024(line, current_section)
-            
-            if result is not None:
-                payment_data.append(result)
-    
-    return payment_data
-
-def extract_integrated_tax_row_2024(line, section):
-    """
-    Extract Integrated tax row
-    Format: Integrated tax 1825356.00 1825356.00 0.00 0.00 - 0.00 0.00 -
-    """
-    numbers = re.findall(r'[\d,]+\.?\d*', line)
-    values = []
-    for num in numbers:
-        try:
-            values.append(float(num.replace(',', '')))
-        except ValueError:
-            continue
-    
-    if len(values) < 2:
-        return None
-    
-    return {
-        "Tax Type": "Integrated tax",
-        "Section": section,
-        "Total tax payable": values[0],
-        "Tax paid through ITC - Integrated tax": values[1],
-        "Tax paid through ITC - Central tax": values[2] if len(values) > 2 else 0.0,
-        "Tax paid through ITC - State/UT tax": values[3] if len(values) > 3 else 0.0,
-        "Tax paid through ITC - Cess": 0.0,
-        "Tax paid in cash": values[4] if len(values) > 4 else 0.0,
-        "Interest paid in cash": values[5] if len(values) > 5 else 0.0,
-        "Late fee paid in cash": 0.0
-    }
-
-def extract_central_tax_row_2024(line, section):
-    """
-    Extract Central tax row - CORRECTED VERSION
-    Format: Central tax 16730998.00 2122418.00 14608580.00 - - 0.00 0.00 0.00
-    CORRECT MAPPING: 2122418 -> ITC-Integrated, 14608580 -> ITC-Central
-    """
-    numbers = re.findall(r'[\d,]+\.?\d*', line)
-    values = []
-    for num in numbers:
-        try:
-            values.append(float(num.replace(',', '')))
-        except ValueError:
-            continue
-    
-    if section == "(A) Other than reverse charge":
-        if len(values) < 3:
-            return None
-        
-        # CORRECTED MAPPING:
-        # values[0] = 16730998.00 (Total tax payable)
-        # values[1] = 2122418.00 -> Tax paid through ITC - Integrated tax
-        # values[2] = 14608580.00 -> Tax paid through ITC - Central tax
-        return {
-            "Tax Type": "Central tax",
-            "Section": section,
-            "Total tax payable": values[0],  # 16730998.00
-            "Tax paid through ITC - Integrated tax": values[1],  # 2122418.00
-            "Tax paid through ITC - Central tax": values[2],  # 14608580.00
-            "Tax paid through ITC - State/UT tax": 0.0,
-            "Tax paid through ITC - Cess": 0.0,
-            "Tax paid in cash": 0.0,  # Should be 0
-            "Interest paid in cash": values[3] if len(values) > 3 else 0.0,
-            "Late fee paid in cash": values[4] if len(values) > 4 else 0.0
-        }
-    else:  # Section B
-        if len(values) < 1:
-            return None
-        return {
-            "Tax Type": "Central tax",
-            "Section": section,
-            "Total tax payable": values[0],  # 71100.00
-            "Tax paid through ITC - Integrated tax": 0.0,
-            "Tax paid through ITC - Central tax": 0.0,
-            "Tax paid through ITC - State/UT tax": 0.0,
-            "Tax paid through ITC - Cess": 0.0,
-            "Tax paid in cash": values[1] if len(values) > 1 else 0.0,  # 71100.00
-            "Interest paid in cash": 0.0,
-            "Late fee paid in cash": 0.0
-        }
-
-def extract_state_tax_row_2024(line, section):
-    """
-    Extract State/UT tax row - 2024 version
-    Format: State/UT tax 16730998.00 2122418.00 - 14608580.00 - 0.00 0.00 0.00
-    """
-    numbers = re.findall(r'[\d,]+\.?\d*', line)
-    values = []
-    for num in numbers:
-        try:
-            values.append(float(num.replace(',', '')))
-        except ValueError:
-            continue
-    
-    if section == "(A) Other than reverse charge":
-        if len(values) < 3:
-            return None
-        
-        return {
-            "Tax Type": "State/UT tax",
-            "Section": section,
-            "Total tax payable": values[0],  # 16730998.00
-            "Tax paid through ITC - Integrated tax": values[1],  # 2122418.00
-            "Tax paid through ITC - Central tax": 0.0,
-            "Tax paid through ITC - State/UT tax": values[2],  # 14608580.00
-            "Tax paid through ITC - Cess": 0.0,
-            "Tax paid in cash": 0.0,
-            "Interest paid in cash": values[3] if len(values) > 3 else 0.0,
-            "Late fee paid in cash": values[4] if len(values) > 4 else 0.0
-        }
-    else:  # Section B
-        if len(values) < 1:
-            return None
-        
-        return {
-            "Tax Type": "State/UT tax",
-            "Section": section,
-            "Total tax payable": values[0],  # 71100.00
-            "Tax paid through ITC - Integrated tax": 0.0,
-            "Tax paid through ITC - Central tax": 0.0,
-            "Tax paid through ITC - State/UT tax": 0.0,
-            "Tax paid through ITC - Cess": 0.0,
-            "Tax paid in cash": values[1] if len(values) > 1 else 0.0,  # 71100.00
-            "Interest paid in cash": 0.0,
-            "Late fee paid in cash": 0.0
-        }
-
-def extract_cess_row_2024(line, section):
-    """
-    Extract Cess row
-    Format: Cess 0.00 - - - 0.00 0.00 0.00 -
-    """
-    numbers = re.findall(r'[\d,]+\.?\d*', line)
-    values = []
-    for num in numbers:
-        try:
-            values.append(float(num.replace(',', '')))
-        except ValueError:
-            continue
-    
-    if len(values) < 1:
-        return None
-    
-    if section == "(A) Other than reverse charge":
-        return {
-            "Tax Type": "Cess",
-            "Section": section,
-            "Total tax payable": values[0],
-            "Tax paid through ITC - Integrated tax": 0.0,
-            "Tax paid through ITC - Central tax": 0.0,
-            "Tax paid through ITC - State/UT tax": 0.0,
-            "Tax paid through ITC - Cess": values[1] if len(values) > 1 else 0.0,
-            "Tax paid in cash": values[2] if len(values) > 2 else 0.0,
-            "Interest paid in cash": values[3] if len(values) > 3 else 0.0,
-            "Late fee paid in cash": 0.0
-        }
-    else:  # Section B
-        return {
-            "Tax Type": "Cess",
-            "Section": section,
-            "Total tax payable": values[0],
-            "Tax paid through ITC - Integrated tax": 0.0,
-            "Tax paid through ITC - Central tax": 0.0,
-            "Tax paid through ITC - State/UT tax": 0.0,
-            "Tax paid through ITC - Cess": 0.0,
-            "Tax paid in cash": values[1] if len(values) > 1 else 0.0,
-            "Interest paid in cash": 0.0,
-            "Late fee paid in cash": 0.0
-        }
-
-def create_combined_gstr3b_sheet_2024(general_df, table_3_1_df, table_4_df, table_6_1_df):
-    """
-    Create a single combined sheet with all GSTR-3B data organized systematically - 2024 version
-    """
-    # Initialize an empty DataFrame for the combined sheet
-    combined_df = pd.DataFrame()
-   
-    # Process all files
-    unique_files = set(table_3_1_df["File Name"].unique()) | set(table_4_df["File Name"].unique()) | set(table_6_1_df["File Name"].unique())
-   
-    rows = []
-   
-    for idx, file_name in enumerate(unique_files):
-        # Get general details for this file
-        file_general_details = general_df[general_df.index == idx].to_dict(orient='records')
-        if file_general_details:
-            general_info = file_general_details[0]
-        else:
-            general_info = {"GSTIN": "Unknown", "Legal Name": "Unknown", "Date": "Unknown",
-                           "Financial Year": "Unknown", "Period": "Unknown", "State": "Unknown"}
-       
-        # Create a row with file and general information
-        base_row = {
-            "File Name": file_name,
-            "GSTIN": general_info.get("GSTIN", "Unknown"),
-            "State": general_info.get("State", "Unknown"),
-            "Legal Name": general_info.get("Legal Name", "Unknown"),
-            "Date": general_info.get("Date", "Unknown"),
-            "Financial Year": general_info.get("Financial Year", "Unknown"),
-            "Period": general_info.get("Period", "Unknown"),
-            "Data Type": "",
-            "Description": "",
-            "Total Taxable Value": 0.0,
-            "Integrated Tax": 0.0,
-            "Central Tax": 0.0,
-            "State/UT Tax": 0.0,
-            "Cess": 0.0,
-            "Total Tax Payable": 0.0,
-            "Tax Paid Through ITC": 0.0,
-            "Tax Paid in Cash": 0.0,
-            "Interest Paid in Cash": 0.0,
-            "Late Fee Paid in Cash": 0.0
-        }
-       
-        # Add a header row for this file
-        header_row = base_row.copy()
-        header_row["Data Type"] = "FILE INFO"
-        header_row["Description"] = "File Information"
-        rows.append(header_row)
-       
-        # Add 3.1 data
-        file_table_3_1 = table_3_1_df[table_3_1_df["File Name"] == file_name]
-        if not file_table_3_1.empty:
-            for _, row in file_table_3_1.iterrows():
-                data_row = base_row.copy()
-                data_row["Data Type"] = "Table 3.1"
-                data_row["Description"] = row.get("Nature of Supplies", "")
-                data_row["Total Taxable Value"] = row.get("Total taxable value", 0.0)
-                data_row["Integrated Tax"] = row.get("Integrated tax", 0.0)
-                data_row["Central Tax"] = row.get("Central tax", 0.0)
-                data_row["State/UT Tax"] = row.get("State/UT tax", 0.0)
-                data_row["Cess"] = row.get("Cess", 0.0)
-                rows.append(data_row)
-       
-        # Add Table 4 data
-        file_table_4 = table_4_df[table_4_df["File Name"] == file_name]
-        if not file_table_4.empty:
-            for _, row in file_table_4.iterrows():
-                data_row = base_row.copy()
-                data_row["Data Type"] = "Table 4"
-                data_row["Description"] = row.get("Details", "")
-                data_row["Integrated Tax"] = row.get("Integrated tax", 0.0)
-                data_row["Central Tax"] = row.get("Central tax", 0.0)
-                data_row["State/UT Tax"] = row.get("State/UT tax", 0.0)
-                data_row["Cess"] = row.get("Cess", 0.0)
-                rows.append(data_row)
-       
-        # Add Table 6.1 data
-        file_table_6_1 = table_6_1_df[table_6_1_df["File Name"] == file_name]
-        if not file_table_6_1.empty:
-            for _, row in file_table_6_1.iterrows():
-                data_row = base_row.copy()
-                data_row["Data Type"] = "Table 6.1"
-                data_row["Description"] = f"{row.get('Section', '')} - {row.get('Tax Type', '')}"
-                data_row["Total Tax Payable"] = row.get("Total tax payable", 0.0)
-                data_row["Tax Paid Through ITC"] = (
-                    row.get("Tax paid through ITC - Integrated tax", 0.0) +
-                    row.get("Tax paid through ITC - Central tax", 0.0) +
-                    row.get("Tax paid through ITC - State/UT tax", 0.0) +
-                    row.get("Tax paid through ITC - Cess", 0.0)
-                )
-                data_row["Tax Paid in Cash"] = row.get("Tax paid in cash", 0.0)
-                data_row["Interest Paid in Cash"] = row.get("Interest paid in cash", 0.0)
-                data_row["Late Fee Paid in Cash"] = row.get("Late fee paid in cash", 0.0)
-                rows.append(data_row)
-       
-        # Add a separator row
-        separator_row = {k: "" for k in base_row.keys()}
-        separator_row["Description"] = "----------------------"
-        rows.append(separator_row)
-   
-    # Create DataFrame from rows
-    combined_df = pd.DataFrame(rows)
-    return combined_df
-
-# GSTR-3B 2025 Functions (New Code)
-def clean_numeric_value_2025(value_str):
-    """Helper function to clean and convert numeric values - 2025 version"""
-    if not value_str or value_str in ['', '-', 'nil', 'Nil', 'NIL']:
-        return 0.0
-    
-    # Remove commas and convert to float
-    try:
-        cleaned = str(value_str).replace(',', '').replace('₹', '').strip()
-        return float(cleaned)
-    except (ValueError, TypeError):
-        return 0.0
-
-def extract_table_4_2025(pdf):
-    """
-    Direct Table 4 extraction using the exact values from the PDF - 2025 version
-    """
-    # Initialize the result structure - FIXED: Added missing "(D) Other Details"
-    table_4_structure = [
-        "(1) Import of goods",
-        "(2) Import of services", 
-        "(3) Inward supplies liable to reverse charge (other than 1 & 2 above)",
-        "(4) Inward supplies from ISD",
-        "(5) All other ITC",
-        "(1) As per rules 38,42 & 43 of CGST Rules and section 17(5)",
-        "(2) Others",
-        "C. Net ITC available (A-B)",
-        "(D) Other Details",  # ADDED: This was missing
-        "(1) ITC reclaimed which was reversed under Table 4(B)(2) in earlier tax period",
-        "(2) Ineligible ITC under section 16(4) & ITC restricted due to PoS rules"
-    ]
-    
-    # Extract all text from PDF
-    full_text = ""
-    for page in pdf.pages:
-        page_text = page.extract_text()
-        if page_text:
-            full_text += page_text + "\n"
-    
-    # Initialize extracted data with known values from PDF
-    extracted_data = {}
-    
-    # Try to extract using pdfplumber table extraction first
-    for page in pdf.pages:
-        tables = page.extract_tables()
-        for table in tables:
-            if not table:
-                continue
-            
-            # Look for Table 4 structure
-            for row_idx, row in enumerate(table):
-                if not row or len(row) < 5:
-                    continue
-                
-                # Clean row data
-                cleaned_row = []
-                for cell in row:
-                    if cell is None:
-                        cleaned_row.append("")
-                    else:
-                        cleaned_row.append(str(cell).strip())
-                
-                first_cell = cleaned_row[0].lower()
-                
-                # Match specific patterns and extract values
-                if "(3)" in first_cell and "inward supplies liable to reverse charge" in first_cell:
-                    try:
-                        values = [clean_numeric_value(cleaned_row[i]) for i in range(1, 5)]
-                        if sum(values) > 0:  # Only if we have actual values
-                            extracted_data["(3) Inward supplies liable to reverse charge (other than 1 & 2 above)"] = values
-                    except:
-                        pass
-                
-                elif "(5)" in first_cell and "all other itc" in first_cell:
-                    try:
-                        values = [clean_numeric_value(cleaned_row[i]) for i in range(1, 5)]
-                        if sum(values) > 0:
-                            extracted_data["(5) All other ITC"] = values
-                    except:
-                        pass
-                
-                elif "(1)" in first_cell and "as per rules" in first_cell:
-                    try:
-                        values = [clean_numeric_value(cleaned_row[i]) for i in range(1, 5)]
-                        if sum(values) > 0:
-                            extracted_data["(1) As per rules 38,42 & 43 of CGST Rules and section 17(5)"] = values
-                    except:
-                        pass
-                
-                elif "(2)" in first_cell and "others" in first_cell:
-                    try:
-                        values = [clean_numeric_value(cleaned_row[i]) for i in range(1, 5)]
-                        if sum(values) > 0:
-                            extracted_data["(2) Others"] = values
-                    except:
-                        pass
-                
-                elif "net itc available" in first_cell:
-                    try:
-                        values = [clean_numeric_value(cleaned_row[i]) for i in range(1, 5)]
-                        if sum(values) > 0:
-                            extracted_data["C. Net ITC available (A-B)"] = values
-                    except:
-                        pass
-                
-                elif "(d)" in first_cell and "other details" in first_cell:
-                    try:
-                        values = [clean_numeric_value(cleaned_row[i]) for i in range(1, 5)]
-                        if sum(values) > 0:
-                            extracted_data["(D) Other Details"] = values
-                    except:
-                        pass
-                
-                elif "(1)" in first_cell and "itc reclaimed" in first_cell:
-                    try:
-                        values = [clean_numeric_value(cleaned_row[i]) for i in range(1, 5)]
-                        if sum(values) > 0:
-                            extracted_data["(1) ITC reclaimed which was reversed under Table 4(B)(2) in earlier tax period"] = values
-                    except:
-                        pass
-    
-    # Build result DataFrame
-    table_4_result = []
-    for row_desc in table_4_structure:
-        if row_desc in extracted_data:
-            values = extracted_data[row_desc]
-        else:
-            values = [0.0, 0.0, 0.0, 0.0]
-        
-        table_4_result.append({
-            "Details": row_desc,
-            "Integrated tax": values[0] if len(values) > 0 else 0.0,
-            "Central tax": values[1] if len(values) > 1 else 0.0,
-            "State/UT tax": values[2] if len(values) > 2 else 0.0,
-            "Cess": values[3] if len(values) > 3 else 0.0
-        })
-    
-    return pd.DataFrame(table_4_result)
-
-def extract_table_6_1_2025(pdf):
-    """
-    Updated Table 6.1 extraction that handles the actual PDF structure - 2025 version
-    Based on the provided PDF sample
-    """
-    full_text = ""
-    for page in pdf.pages:
-        page_text = page.extract_text()
-        if page_text:
-            full_text += page_text + "\n"
-
-    # Find Table 6.1 section
-    table_start = full_text.find("6.1 Payment of tax")
-    if table_start == -1:
-        table_start = full_text.find("Payment of tax")
-    
-    if table_start == -1:
-        return pd.DataFrame()
-    
-    # Find end of table
-    table_end = full_text.find("Breakup of tax liability", table_start)
-    if table_end == -1:
-        table_end = full_text.find("Verification", table_start)
-    if table_end == -1:
-        table_end = len(full_text)
-    
-    table_text = full_text[table_start:table_end]
-    
-    # Extract payment data using updated line-by-line approach
-    payment_data = extract_payment_data_line_by_line_2025(table_text)
-    
-    return pd.DataFrame(payment_data)
-
-def extract_payment_data_line_by_line_2025(text):
-    """
-    Updated payment data extraction based on actual PDF format - 2025 version
-    """
-    lines = text.split('\n')
-    payment_data = []
-    current_section = ""
-    
-    for line in lines:
-        line = line.strip()
-        if not line or len(line) < 10:
-            continue
-            
-        line_lower = line.lower()
-        
-        # Detect sections
-        if "(a) other than reverse charge" in line_lower:
-            current_section = "(A) Other than reverse charge"
-            continue
-        elif "(b) reverse charge" in line_lower:
-            current_section = "(B) Reverse charge"
-            continue
-        
-        # Skip header and description lines
-        skip_patterns = [
-            'description', 'tax payable', 'adjustment of negative',
-            'net tax payable', 'tax paid through itc', 'tax paid in cash',
-            'interest paid', 'late fee paid', 'integrated tax central tax'
-        ]
-        if any(skip in line_lower for skip in skip_patterns):
-            continue
-        
-        # Process tax type lines
-        if current_section:
-            result = None
-            if line_lower.startswith('integrated'):
-                result = extract_integrated_tax_row_updated_2025(line, current_section)
-            elif line_lower.startswith('central'):
-                result = extract_central_tax_row_updated_2025(line, current_section)
-            elif line_lower.startswith('state/ut'):
-                result = extract_state_tax_row_updated_2025(line, current_section)
-            elif line_lower.startswith('cess'):
-                result = extract_cess_row_updated_2025(line, current_section)
-            
-            if result is not None:
-                payment_data.append(result)
-    
-    return payment_data
-
-def extract_integrated_tax_row_updated_2025(line, section):
-    """
-    Extract Integrated tax row based on actual PDF format - 2025 version
-    Example: Integrated tax 712435.00 0.00 712435.00 712435.00 0.00 0.00 - 0.00 0.00 -
-    """
-    numbers = re.findall(r'[\d,]+\.?\d*', line)
-    values = []
-    for num in numbers:
-        try:
-            values.append(float(num.replace(',', '')))
-        except ValueError:
-            continue
-    
-    if len(values) < 3:
-        return None
-    
-    if section == "(A) Other than reverse charge":
-        return {
-            "Tax Type": "Integrated tax",
-            "Section": section,
-            "Tax payable": values[0] if len(values) > 0 else 0.0,
-            "Adjustment of negative liability": values[1] if len(values) > 1 else 0.0,
-            "Net Tax Payable": values[2] if len(values) > 2 else 0.0,
-            "Tax paid through ITC - Integrated tax": values[3] if len(values) > 3 else 0.0,
-            "Tax paid through ITC - Central tax": values[4] if len(values) > 4 else 0.0,
-            "Tax paid through ITC - State/UT tax": values[5] if len(values) > 5 else 0.0,
-            "Tax paid through ITC - Cess": 0.0,
-            "Tax paid in cash": values[6] if len(values) > 6 else 0.0,
-            "Interest paid in cash": values[7] if len(values) > 7 else 0.0,
-            "Late fee paid in cash": values[8] if len(values) > 8 else 0.0
-        }
-    else:  # Section B
-        return {
-            "Tax Type": "Integrated tax",
-            "Section": section,
-            "Tax payable": values[0] if len(values) > 0 else 0.0,
-            "Adjustment of negative liability": values[1] if len(values) > 1 else 0.0,
-            "Net Tax Payable": values[2] if len(values) > 2 else 0.0,
-            "Tax paid through ITC - Integrated tax": 0.0,
-            "Tax paid through ITC - Central tax": 0.0,
-            "Tax paid through ITC - State/UT tax": 0.0,
-            "Tax paid through ITC - Cess": 0.0,
-            "Tax paid in cash": values[3] if len(values) > 3 else 0.0,
-            "Interest paid in cash": 0.0,
-            "Late fee paid in cash": 0.0
-        }
-
-def extract_central_tax_row_updated_2025(line, section):
-    """
-    Extract Central tax row based on actual PDF format - 2025 version
-    Example: Central tax 1333936.00 0.00 1333936.00 1333936.00 0.00 - - 0.00 55.00 0.00
-    """
-    numbers = re.findall(r'[\d,]+\.?\d*', line)
-    values = []
-    for num in numbers:
-        try:
-            values.append(float(num.replace(',', '')))
-        except ValueError:
-            continue
-    
-    if len(values) < 3:
-        return None
-    
-    if section == "(A) Other than reverse charge":
-        return {
-            "Tax Type": "Central tax",
-            "Section": section,
-            "Tax payable": values[0] if len(values) > 0 else 0.0,
-            "Adjustment of negative liability": values[1] if len(values) > 1 else 0.0,
-            "Net Tax Payable": values[2] if len(values) > 2 else 0.0,
-            "Tax paid through ITC - Integrated tax": values[3] if len(values) > 3 else 0.0,
-            "Tax paid through ITC - Central tax": values[4] if len(values) > 4 else 0.0,
-            "Tax paid through ITC - State/UT tax": 0.0,
-            "Tax paid through ITC - Cess": 0.0,
-            "Tax paid in cash": values[5] if len(values) > 5 else 0.0,
-            "Interest paid in cash": values[6] if len(values) > 6 else 0.0,
-            "Late fee paid in cash": values[7] if len(values) > 7 else 0.0
-        }
-    else:  # Section B
-        return {
-            "Tax Type": "Central tax",
-            "Section": section,
-            "Tax payable": values[0] if len(values) > 0 else 0.0,
-            "Adjustment of negative liability": values[1] if len(values) > 1 else 0.0,
-            "Net Tax Payable": values[2] if len(values) > 2 else 0.0,
-            "Tax paid through ITC - Integrated tax": 0.0,
-            "Tax paid through ITC - Central tax": 0.0,
-            "Tax paid through ITC - State/UT tax": 0.0,
-            "Tax paid through ITC - Cess": 0.0,
-            "Tax paid in cash": values[3] if len(values) > 3 else 0.0,
-            "Interest paid in cash": 0.0,
-            "Late fee paid in cash": 0.0
-        }
-
-def extract_state_tax_row_updated_2025(line, section):
-    """
-    Extract State/UT tax row based on actual PDF format - 2025 version
-    Example: State/UT tax 1333936.00 0.00 1333936.00 1284286.00 - 49650.00 - 0.00 55.00 0.00
-    """
-    numbers = re.findall(r'[\d,]+\.?\d*', line)
-    values = []
-    for num in numbers:
-        try:
-            values.append(float(num.replace(',', '')))
-        except ValueError:
-            continue
-    
-    if len(values) < 3:
-        return None
-    
-    if section == "(A) Other than reverse charge":
-        return {
-            "Tax Type": "State/UT tax",
-            "Section": section,
-            "Tax payable": values[0] if len(values) > 0 else 0.0,
-            "Adjustment of negative liability": values[1] if len(values) > 1 else 0.0,
-            "Net Tax Payable": values[2] if len(values) > 2 else 0.0,
-            "Tax paid through ITC - Integrated tax": values[3] if len(values) > 3 else 0.0,
-            "Tax paid through ITC - Central tax": 0.0,
-            "Tax paid through ITC - State/UT tax": values[4] if len(values) > 4 else 0.0,
-            "Tax paid through ITC - Cess": 0.0,
-            "Tax paid in cash": values[5] if len(values) > 5 else 0.0,
-            "Interest paid in cash": values[6] if len(values) > 6 else 0.0,
-            "Late fee paid in cash": values[7] if len(values) > 7 else 0.0
-        }
-    else:  # Section B
-        return {
-            "Tax Type": "State/UT tax",
-            "Section": section,
-            "Tax payable": values[0] if len(values) > 0 else 0.0,
-            "Adjustment of negative liability": values[1] if len(values) > 1 else 0.0,
-            "Net Tax Payable": values[2] if len(values) > 2 else 0.0,
-            "Tax paid through ITC - Integrated tax": 0.0,
-            "Tax paid through ITC - Central tax": 0.0,
-            "Tax paid through ITC - State/UT tax": 0.0,
-            "Tax paid through ITC - Cess": 0.0,
-            "Tax paid in cash": values[3] if len(values) > 3 else 0.0,
-            "Interest paid in cash": 0.0,
-            "Late fee paid in cash": 0.0
-        }
-
-def extract_cess_row_updated_2025(line, section):
-    """
-    Extract Cess row based on actual PDF format - 2025 version
-    Example: Cess 0.00 0.00 0.00 - - - 0.00 0.00 0.00 -
-    """
-    numbers = re.findall(r'[\d,]+\.?\d*', line)
-    values = []
-    for num in numbers:
-        try:
-            values.append(float(num.replace(',', '')))
-        except ValueError:
-            continue
-    
-    if len(values) < 3:
-        return None
-    
-    return {
-        "Tax Type": "Cess",
-        "Section": section,
-        "Tax payable": values[0] if len(values) > 0 else 0.0,
-        "Adjustment of negative liability": values[1] if len(values) > 1 else 0.0,
-        "Net Tax Payable": values[2] if len(values) > 2 else 0.0,
-        "Tax paid through ITC - Integrated tax": 0.0,
-        "Tax paid through ITC - Central tax": 0.0,
-        "Tax paid through ITC - State/UT tax": 0.0,
-        "Tax paid through ITC - Cess": values[3] if len(values) > 3 else 0.0,
-        "Tax paid in cash": values[4] if len(values) > 4 else 0.0,
-        "Interest paid in cash": values[5] if len(values) > 5 else 0.0,
-        "Late fee paid in cash": values[6] if len(values) > 6 else 0.0
-    }
-
-def create_combined_gstr3b_sheet_2025(general_df, table_3_1_df, table_4_df, table_6_1_df):
-    """
-    Updated combined sheet creation with proper Table 6.1 structure - 2025 version
-    """
-    rows = []
-    unique_files = set(table_3_1_df["File Name"].unique()) | set(table_4_df["File Name"].unique()) | set(table_6_1_df["File Name"].unique())
-   
-    for idx, file_name in enumerate(unique_files):
-        # Get general details
-        file_general_details = general_df[general_df.index == idx].to_dict(orient='records')
-        if file_general_details:
-            general_info = file_general_details[0]
-        else:
-            general_info = {"GSTIN": "Unknown", "Legal Name": "Unknown", "Date": "Unknown",
-                           "Financial Year": "Unknown", "Period": "Unknown", "State": "Unknown"}
-       
-        base_row = {
-            "File Name": file_name,
-            "GSTIN": general_info.get("GSTIN", "Unknown"),
-            "State": general_info.get("State", "Unknown"),
-            "Legal Name": general_info.get("Legal Name", "Unknown"),
-            "Date": general_info.get("Date", "Unknown"),
-            "Financial Year": general_info.get("Financial Year", "Unknown"),
-            "Period": general_info.get("Period", "Unknown"),
-            "Data Type": "",
-            "Section": "",
-            "Description": "",
-            "Tax Payable": 0.0,
-            "Adjustment of Negative Liability": 0.0,
-            "Net Tax Payable": 0.0,
-            "Total Taxable Value": 0.0,
-            "Integrated Tax": 0.0,
-            "Central Tax": 0.0,
-            "State/UT Tax": 0.0,
-            "Cess": 0.0,
-            "Tax Paid Through ITC - Integrated": 0.0,
-            "Tax Paid Through ITC - Central": 0.0,
-            "Tax Paid Through ITC - State/UT": 0.0,
-            "Tax Paid Through ITC - Cess": 0.0,
-            "Tax Paid in Cash": 0.0,
-            "Interest Paid in Cash": 0.0,
-            "Late Fee Paid in Cash": 0.0
-        }
-       
-        # File header
-        header_row = base_row.copy()
-        header_row["Data Type"] = "FILE INFO"
-        header_row["Description"] = "File Information"
-        rows.append(header_row)
-       
-        # Table 3.1 data
-        file_table_3_1 = table_3_1_df[table_3_1_df["File Name"] == file_name]
-        if not file_table_3_1.empty:
-            for _, row in file_table_3_1.iterrows():
-                data_row = base_row.copy()
-                data_row["Data Type"] = "Table 3.1"
-                data_row["Description"] = row.get("Nature of Supplies", "")
-                data_row["Total Taxable Value"] = row.get("Total taxable value", 0.0)
-                data_row["Integrated Tax"] = row.get("Integrated tax", 0.0)
-                data_row["Central Tax"] = row.get("Central tax", 0.0)
-                data_row["State/UT Tax"] = row.get("State/UT tax", 0.0)
-                data_row["Cess"] = row.get("Cess", 0.0)
-                rows.append(data_row)
-       
-        # Table 4 data
-        file_table_4 = table_4_df[table_4_df["File Name"] == file_name]
-        if not file_table_4.empty:
-            for _, row in file_table_4.iterrows():
-                data_row = base_row.copy()
-                data_row["Data Type"] = "Table 4"
-                data_row["Description"] = row.get("Details", "")
-                data_row["Integrated Tax"] = row.get("Integrated tax", 0.0)
-                data_row["Central Tax"] = row.get("Central tax", 0.0)
-                data_row["State/UT Tax"] = row.get("State/UT tax", 0.0)
-                data_row["Cess"] = row.get("Cess", 0.0)
-                rows.append(data_row)
-       
-        # Table 6.1 data - Updated structure
-        file_table_6_1 = table_6_1_df[table_6_1_df["File Name"] == file_name]
-        if not file_table_6_1.empty:
-            for _, row in file_table_6_1.iterrows():
-                data_row = base_row.copy()
-                data_row["Data Type"] = "Table 6.1"
-                data_row["Section"] = row.get("Section", "")
-                data_row["Description"] = row.get("Tax Type", "")
-                data_row["Tax Payable"] = row.get("Tax payable", 0.0)
-                data_row["Adjustment of Negative Liability"] = row.get("Adjustment of negative liability", 0.0)
-                data_row["Net Tax Payable"] = row.get("Net Tax Payable", 0.0)
-                data_row["Tax Paid Through ITC - Integrated"] = row.get("Tax paid through ITC - Integrated tax", 0.0)
-                data_row["Tax Paid Through ITC - Central"] = row.get("Tax paid through ITC - Central tax", 0.0)
-                data_row["Tax Paid Through ITC - State/UT"] = row.get("Tax paid through ITC - State/UT tax", 0.0)
-                data_row["Tax Paid Through ITC - Cess"] = row.get("Tax paid through ITC - Cess", 0.0)
-                data_row["Tax Paid in Cash"] = row.get("Tax paid in cash", 0.0)
-                data_row["Interest Paid in Cash"] = row.get("Interest paid in cash", 0.0)
-                data_row["Late Fee Paid in Cash"] = row.get("Late fee paid in cash", 0.0)
-                rows.append(data_row)
-       
-        # Separator
-        separator_row = {k: "" for k in base_row.keys()}
-        separator_row["Description"] = "----------------------"
-        rows.append(separator_row)
-   
-    return pd.DataFrame(rows)
-
-# Additional helper function for clean numeric conversion in 2025 version
-def clean_numeric_value_2025(value_str):
-    """Helper function to clean and convert numeric values - 2025 version"""
-    if not value_str or value_str in ['', '-', 'nil', 'Nil', 'NIL']:
-        return 0.0
-    
-    # Remove commas and convert to float
-    try:
-        cleaned = str(value_str).replace(',', '').replace('₹', '').strip()
-        return float(cleaned)
-    except (ValueError, TypeError):
-        return 0.0
-
-# Example usage function for testing the 2025 extraction
-def test_extract_table_6_1_2025(pdf_file_path):
-    """
-    Test function to demonstrate usage of the 2025 Table 6.1 extraction
-    """
-    import pdfplumber
-    
-    try:
-        with pdfplumber.open(pdf_file_path) as pdf:
-            result_df = extract_table_6_1_2025(pdf)
-            print("Extraction completed successfully!")
-            print(f"Extracted {len(result_df)} rows of payment data")
-            
-            # Display basic information about extracted data
-            if not result_df.empty:
-                print("\nExtracted columns:")
-                for col in result_df.columns:
-                    print(f"  - {col}")
-                
-                print("\nSample data (first 3 rows):")
-                print(result_df.head(3).to_string())
-                
-                # Summary statistics
-                print(f"\nData Summary:")
-                print(f"  - Total rows: {len(result_df)}")
-                print(f"  - Unique tax types: {result_df['Tax Type'].nunique() if 'Tax Type' in result_df.columns else 'N/A'}")
-                print(f"  - Unique sections: {result_df['Section'].nunique() if 'Section' in result_df.columns else 'N/A'}")
-                
-                # Check for data completeness
-                numeric_columns = ['Tax payable', 'Net Tax Payable', 'Tax paid in cash']
-                for col in numeric_columns:
-                    if col in result_df.columns:
-                        non_zero_count = (result_df[col] != 0).sum()
-                        print(f"  - {col}: {non_zero_count} non-zero entries")
-            else:
-                print("No data extracted - please check the PDF format")
-                
-            return result_df
-            
-    except FileNotFoundError:
-        print(f"Error: File '{pdf_file_path}' not found")
-        return pd.DataFrame()
-    except Exception as e:
-        print(f"Error during extraction: {str(e)}")
-        print(f"Error type: {type(e).__name__}")
-        return pd.DataFrame()
-
-# Additional utility functions for 2025 version
-def validate_table_6_1_data_2025(df):
-    """
-    Validate the extracted Table 6.1 data for 2025 format
-    """
-    if df.empty:
-        return False, "No data to validate"
-    
-    required_columns = [
-        'Tax Type', 'Section', 'Tax payable', 'Net Tax Payable',
-        'Tax paid through ITC - Integrated tax', 'Tax paid through ITC - Central tax',
-        'Tax paid through ITC - State/UT tax', 'Tax paid in cash'
-    ]
-    
-    missing_columns = [col for col in required_columns if col not in df.columns]
-    if missing_columns:
-        return False, f"Missing required columns: {missing_columns}"
-    
-    # Check for expected tax types
-    expected_tax_types = ['Integrated Tax', 'Central Tax', 'State/Ut Tax', 'Cess']
-    actual_tax_types = df['Tax Type'].unique()
-    
-    # Check for expected sections
-    expected_sections = ['(A) Other than reverse charge', '(B) Reverse charge']
-    actual_sections = df['Section'].unique()
-    
-    validation_results = {
-        'total_rows': len(df),
-        'tax_types_found': list(actual_tax_types),
-        'sections_found': list(actual_sections),
-        'has_numeric_data': any(df[col].sum() > 0 for col in ['Tax payable', 'Tax paid in cash'] if col in df.columns)
-    }
-    
-    return True, validation_results
-
-def export_table_6_1_to_excel_2025(df, output_path):
-    """
-    Export Table 6.1 data to Excel with formatting for 2025 version
-    """
-    try:
-        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-            # Main data sheet
-            df.to_excel(writer, sheet_name='Table_6_1_Payment_Data', index=False)
-            
-            # Summary sheet
-            summary_data = []
-            for section in df['Section'].unique():
-                section_data = df[df['Section'] == section]
-                for tax_type in section_data['Tax Type'].unique():
-                    tax_data = section_data[section_data['Tax Type'] == tax_type]
-                    if not tax_data.empty:
-                        row = tax_data.iloc[0]
-                        summary_data.append({
-                            'Section': section,
-                            'Tax Type': tax_type,
-                            'Tax Payable': row.get('Tax payable', 0),
-                            'Net Tax Payable': row.get('Net Tax Payable', 0),
-                            'Total ITC Used': (
-                                row.get('Tax paid through ITC - Integrated tax', 0) +
-                                row.get('Tax paid through ITC - Central tax', 0) +
-                                row.get('Tax paid through ITC - State/UT tax', 0) +
-                                row.get('Tax paid through ITC - Cess', 0)
-                            ),
-                            'Cash Payment': row.get('Tax paid in cash', 0),
-                            'Interest': row.get('Interest paid in cash', 0),
-                            'Late Fee': row.get('Late fee paid in cash', 0)
-                        })
-            
-            summary_df = pd.DataFrame(summary_data)
-            summary_df.to_excel(writer, sheet_name='Summary', index=False)
-            
-        print(f"Data exported successfully to: {output_path}")
-        return True
-        
-    except Exception as e:
-        print(f"Error exporting to Excel: {str(e)}")
-        return False
-
-# Complete example usage
-def complete_table_6_1_extraction_example_2025():
-    """
-    Complete example showing how to use all the 2025 Table 6.1 functions
-    """
-    print("=== GSTR-3B Table 6.1 Extraction (2025 Version) ===")
-    print()
-    
-    # Example file path (replace with actual path)
-    pdf_path = "sample_gstr3b_2025.pdf"
-    
-    print("Step 1: Extracting data from PDF...")
-    df = test_extract_table_6_1_2025(pdf_path)
-    
-    if not df.empty:
-        print("\nStep 2: Validating extracted data...")
-        is_valid, validation_result = validate_table_6_1_data_2025(df)
-        
-        if is_valid:
-            print("✓ Data validation passed")
-            print(f"Validation details: {validation_result}")
-        else:
-            print(f"✗ Data validation failed: {validation_result}")
-        
-        print("\nStep 3: Exporting to Excel...")
-        export_success = export_table_6_1_to_excel_2025(df, "gstr3b_table_6_1_2025_output.xlsx")
-        
-        if export_success:
-            print("✓ Export completed successfully")
-        else:
-            print("✗ Export failed")
-    else:
-        print("No data extracted. Please check the PDF file and format.")
-    
-    print("\n=== Extraction Complete ===")
-
-# End of all Table 6.1 2025 extraction functions and utilities
-
-def extract_table_6_1_2025(pdf):
-    """
-    Updated Table 6.1 extraction that handles the actual PDF structure - 2025 version
-    Based on the provided PDF sample
-    """
-    full_text = ""
-    for page in pdf.pages:
-        page_text = page.extract_text()
-        if page_text:
-            full_text += page_text + "\n"
-
-    # Find Table 6.1 section
-    table_start = full_text.find("6.1 Payment of tax")
-    if table_start == -1:
-        table_start = full_text.find("Payment of tax")
-    
-    if table_start == -1:
-        return pd.DataFrame()
-    
-    # Find end of table
-    table_end = full_text.find("Breakup of tax liability", table_start)
-    if table_end == -1:
-        table_end = full_text.find("Verification", table_start)
-    if table_end == -1:
-        table_end = len(full_text)
-    
-    table_text = full_text[table_start:table_end]
-    
-    # Extract payment data using updated line-by-line approach
-    payment_data = extract_payment_data_line_by_line_2025(table_text)
-    
-    return pd.DataFrame(payment_data)
-
-def extract_payment_data_line_by_line_2025(text):
-    """
-    Updated payment data extraction based on actual PDF format - 2025 version
-    """
-    lines = text.split('\n')
-    payment_data = []
-    current_section = ""
-    
-    for line in lines:
-        line = line.strip()
-        if not line or len(line) < 10:
-            continue
-            
-        line_lower = line.lower()
-        
-        # Detect sections
-        if "(a) other than reverse charge" in line_lower:
-            current_section = "(A) Other than reverse charge"
-            continue
-        elif "(b) reverse charge" in line_lower:
-            current_section = "(B) Reverse charge"
-            continue
-        
-        # Skip header and description lines
-        skip_patterns = [
-            'description', 'tax payable', 'adjustment of negative',
-            'net tax payable', 'tax paid through itc', 'tax paid in cash',
-            'interest paid', 'late fee paid', 'integrated tax central tax'
-        ]
-        if any(skip in line_lower for skip in skip_patterns):
-            continue
-        
-        # Process tax type lines
-        if current_section:
-            result = None
-            if line_lower.startswith('integrated'):
-                result = extract_integrated_tax_row_updated_2025(line, current_section)
-            elif line_lower.startswith('central'):
-                result = extract_central_tax_row_updated_2025(line, current_section)
-            elif line_lower.startswith('state/ut'):
-                result = extract_state_tax_row_updated_2025(line, current_section)
-            elif line_lower.startswith('cess'):
-                result = extract_cess_row_updated_2025(line, current_section)
-            
-            if result is not None:
-                payment_data.append(result)
-    
-    return payment_data
-
-def extract_integrated_tax_row_updated_2025(line, section):
-    """
-    Extract Integrated tax row based on actual PDF format - 2025 version
-    """
-    numbers = re.findall(r'[\d,]+\.?\d*', line)
-    values = []
-    for num in numbers:
-        try:
-            values.append(float(num.replace(',', '')))
-        except ValueError:
-            continue
-    
-    if len(values) < 3:
-        return None
-    
-    if section == "(A) Other than reverse charge":
-        return {
-            "Tax Type": "Integrated tax",
-            "Section": section,
-            "Tax payable": values[0] if len(values) > 0 else 0.0,
-            "Adjustment of negative liability": values[1] if len(values) > 1 else 0.0,
-            "Net Tax Payable": values[2] if len(values) > 2 else 0.0,
-            "Tax paid through ITC - Integrated tax": values[3] if len(values) > 3 else 0.0,
-            "Tax paid through ITC - Central tax": values[4] if len(values) > 4 else 0.0,
-            "Tax paid through ITC - State/UT tax": values[5] if len(values) > 5 else 0.0,
-            "Tax paid through ITC - Cess": 0.0,
-            "Tax paid in cash": values[6] if len(values) > 6 else 0.0,
-            "Interest paid in cash": values[7] if len(values) > 7 else 0.0,
-            "Late fee paid in cash": values[8] if len(values) > 8 else 0.0
-        }
-    else:  # Section B
-        return {
-            "Tax Type": "Integrated tax",
-            "Section": section,
-            "Tax payable": values[0] if len(values) > 0 else 0.0,
-            "Adjustment of negative liability": values[1] if len(values) > 1 else 0.0,
-            "Net Tax Payable": values[2] if len(values) > 2 else 0.0,
-            "Tax paid through ITC - Integrated tax": 0.0,
-            "Tax paid through ITC - Central tax": 0.0,
-            "Tax paid through ITC - State/UT tax": 0.0,
-            "Tax paid through ITC - Cess": 0.0,
-            "Tax paid in cash": values[3] if len(values) > 3 else 0.0,
-            "Interest paid in cash": 0.0,
-            "Late fee paid in cash": 0.0
-        }
-
-def extract_central_tax_row_updated_2025(line, section):
-    """
-    Extract Central tax row based on actual PDF format - 2025 version
-    """
-    numbers = re.findall(r'[\d,]+\.?\d*', line)
-    values = []
-    for num in numbers:
-        try:
-            values.append(float(num.replace(',', '')))
-        except ValueError:
-            continue
-    
-    if len(values) < 3:
-        return None
-    
-    if section == "(A) Other than reverse charge":
-        return {
-            "Tax Type": "Central tax",
-            "Section": section,
-            "Tax payable": values[0] if len(values) > 0 else 0.0,
-            "Adjustment of negative liability": values[1] if len(values) > 1 else 0.0,
-            "Net Tax Payable": values[2] if len(values) > 2 else 0.0,
-            "Tax paid through ITC - Integrated tax": values[3] if len(values) > 3 else 0.0,
-            "Tax paid through ITC - Central tax": values[4] if len(values) > 4 else 0.0,
-            "Tax paid through ITC - State/UT tax": 0.0,
-            "Tax paid through ITC - Cess": 0.0,
-            "Tax paid in cash": values[5] if len(values) > 5 else 0.0,
-            "Interest paid in cash": values[6] if len(values) > 6 else 0.0,
-            "Late fee paid in cash": values[7] if len(values) > 7 else 0.0
-        }
-    else:  # Section B
-        return {
-            "Tax Type": "Central tax",
-            "Section": section,
-            "Tax payable": values[0] if len(values) > 0 else 0.0,
-            "Adjustment of negative liability": values[1] if len(values) > 1 else 0.0,
-            "Net Tax Payable": values[2] if len(values) > 2 else 0.0,
-            "Tax paid through ITC - Integrated tax": 0.0,
-            "Tax paid through ITC - Central tax": 0.0,
-            "Tax paid through ITC - State/UT tax": 0.0,
-            "Tax paid through ITC - Cess": 0.0,
-            "Tax paid in cash": values[3] if len(values) > 3 else 0.0,
-            "Interest paid in cash": 0.0,
-            "Late fee paid in cash": 0.0
-        }
-
-def extract_state_tax_row_updated_2025(line, section):
-    """
-    Extract State/UT tax row based on actual PDF format - 2025 version
-    """
-    numbers = re.findall(r'[\d,]+\.?\d*', line)
-    values = []
-    for num in numbers:
-        try:
-            values.append(float(num.replace(',', '')))
-        except ValueError:
-            continue
-    
-    if len(values) < 3:
-        return None
-    
-    if section == "(A) Other than reverse charge":
-        return {
-            "Tax Type": "State/UT tax",
-            "Section": section,
-            "Tax payable": values[0] if len(values) > 0 else 0.0,
-            "Adjustment of negative liability": values[1] if len(values) > 1 else 0.0,
-            "Net Tax Payable": values[2] if len(values) > 2 else 0.0,
-            "Tax paid through ITC - Integrated tax": values[3] if len(values) > 3 else 0.0,
-            "Tax paid through ITC - Central tax": 0.0,
-            "Tax paid through ITC - State/UT tax": values[4] if len(values) > 4 else 0.0,
-            "Tax paid through ITC - Cess": 0.0,
-            "Tax paid in cash": values[5] if len(values) > 5 else 0.0,
-            "Interest paid in cash": values[6] if len(values) > 6 else 0.0,
-            "Late fee paid in cash": values[7] if len(values) > 7 else 0.0
-        }
-    else:  # Section B
-        return {
-            "Tax Type": "State/UT tax",
-            "Section": section,
-            "Tax payable": values[0] if len(values) > 0 else 0.0,
-            "Adjustment of negative liability": values[1] if len(values) > 1 else 0.0,
-            "Net Tax Payable": values[2] if len(values) > 2 else 0.0,
-            "Tax paid through ITC - Integrated tax": 0.0,
-            "Tax paid through ITC - Central tax": 0.0,
-            "Tax paid through ITC - State/UT tax": 0.0,
-            "Tax paid through ITC - Cess": 0.0,
-            "Tax paid in cash": values[3] if len(values) > 3 else 0.0,
-            "Interest paid in cash": 0.0,
-            "Late fee paid in cash": 0.0
-        }
-
-def extract_cess_row_updated_2025(line, section):
-    """
-    Extract Cess row based on actual PDF format - 2025 version
-    """
-    numbers = re.findall(r'[\d,]+\.?\d*', line)
-    values = []
-    for num in numbers:
-        try:
-            values.append(float(num.replace(',', '')))
-        except ValueError:
-            continue
-    
-    if len(values) < 3:
-        return None
-    
-    return {
-        "Tax Type": "Cess",
-        "Section": section,
-        "Tax payable": values[0] if len(values) > 0 else 0.0,
-        "Adjustment of negative liability": values[1] if len(values) > 1 else 0.0,
-        "Net Tax Payable": values[2] if len(values) > 2 else 0.0,
-        "Tax paid through ITC - Integrated tax": 0.0,
-        "Tax paid through ITC - Central tax": 0.0,
-        "Tax paid through ITC - State/UT tax": 0.0,
-        "Tax paid through ITC - Cess": values[3] if len(values) > 3 else 0.0,
-        "Tax paid in cash": values[4] if len(values) > 4 else 0.0,
-        "Interest paid in cash": values[5] if len(values) > 5 else 0.0,
-        "Late fee paid in cash": values[6] if len(values) > 6 else 0.0
+# Results are reused across sessions and restarts when the same PDF is uploaded again
+extraction_cache = ExtractionCache()
+warehouse = Warehouse()
+corpus = Corpus() if keep_corpus else None
+
+# Extract each uploaded PDF once per session. Widget changes rerun the whole script,
+# so results are memoized by file identity and content hash in the session state.
+# Files with tables missing from both the session and the disk cache are extracted by
+# max_workers processes; only the missing tables are extracted, see extraction.incremental.
+# The stage timings of each extracted file are kept in the batch run of session_memo.
+def extract_uploaded_files(uploaded_files, doc_type, extract, tables, max_workers=1):
+    run = st.session_state["stage_timings"]
+    run["doc_type"] = doc_type
+    digests = st.session_state.setdefault("upload_digests", {})
+    memo = st.session_state.get("extraction_memo", {})
+    result_keys = []
+    pending = {}
+    pending_names = {}
+    missing = {}
+    with stage(EXTRACTION_CACHE):
+        for uploaded_file in uploaded_files:
+            file_key = (uploaded_file.file_id, uploaded_file.name, uploaded_file.size)
+            if file_key not in digests:
+                digests[file_key] = content_hash(uploaded_file.getvalue())
+            result_key = (doc_type, digests[file_key])
+            result_keys.append(result_key)
+            if result_key not in memo and result_key not in pending:
+                cached, missing[result_key] = cached_tables(extraction_cache, doc_type, digests[file_key], tables)
+                if not missing[result_key]:
+                    memo[result_key] = cached
+                else:
+                    pending[result_key] = uploaded_file.getvalue()
+                    pending_names[result_key] = uploaded_file.name
+    run["reused"] = len(result_keys) - len(pending)
+
+    if pending:
+        progress = st.progress(0.0, text=f"Extracting {len(pending)} file(s)...")
+        with stage(FILE_EXTRACTION):
+            extracted = extract_in_pool(
+                partial(measure, extract), list(pending.values()), max_workers=max_workers,
+                on_result=lambda done, total: progress.progress(done / total, text=f"Extracted {done} of {total} file(s)"),
+            )
+        for result_key, (result, timings) in zip(pending, extracted):
+            with stage(EXTRACTION_CACHE):
+                store_tables(extraction_cache, doc_type, result_key[1], tables, result, keys=missing[result_key])
+            memo[result_key] = result
+            run["files"].append((pending_names[result_key], timings))
+            log_timings(
+                "extract", timings, doc_type=doc_type, file=pending_names[result_key], digest=result_key[1],
+                workers=max_workers,
+            )
+
+    st.session_state["extraction_memo"] = {key: memo[key] for key in result_keys}
+    if save_to_warehouse:
+        with stage(WAREHOUSE_STORE):
+            warehouse.store(
+                doc_type, [uploaded_file.name for uploaded_file in uploaded_files],
+                [memo[key] for key in result_keys], [key[1] for key in result_keys],
+            )
+    # Callers add the file name to the frames, so hand out copies
+    return [copy.deepcopy(memo[key]) for key in result_keys]
+
+# Build the batch frames once per set of uploaded files; filter changes reuse them.
+# Each build starts a new run of stage timings for the sidebar panel.
+def session_memo(name, uploaded_files, build):
+    batch_key = tuple((f.file_id, f.name, f.size) for f in uploaded_files)
+    memo = st.session_state.get(name)
+    if memo is None or memo[0] != batch_key:
+        run = {"doc_type": None, "files": [], "reused": 0, "batch": StageTimings()}
+        st.session_state["stage_timings"] = run
+        # Whatever the other stages do not cover is building the batch frames
+        with run["batch"].active(), stage(DATAFRAME_BUILDING):
+            memo = (batch_key, build())
+        st.session_state[name] = memo
+        log_timings("batch", run["batch"], doc_type=run["doc_type"], files=len(uploaded_files), extracted=len(run["files"]))
+    return memo[1]
+
+# Workbooks are built when their download is clicked; count that time in the current run
+def timed_download(generate, file_name):
+    run = st.session_state.get("stage_timings")
+    if run is None:
+        return generate
+    def timed():
+        timings = StageTimings()
+        with timings.active():
+            data = generate()
+        # Nothing was timed when the workbook was built before
+        if timings.calls:
+            run["batch"].merge(timings)
+            log_timings("export", timings, doc_type=run["doc_type"], file=file_name)
+        return data
+    return timed
+
+# Sidebar panel with the stage timings of the last batch
+def show_stage_timings():
+    run = st.session_state.get("stage_timings")
+    if run is None:
+        return
+    columns = {
+        "Seconds": st.column_config.NumberColumn(format="%.3f"),
+        "Share": st.column_config.NumberColumn(format="percent"),
     }
-
-def create_combined_gstr3b_sheet_2025(general_df, table_3_1_df, table_4_df, table_6_1_df):
-    """
-    Updated combined sheet creation with proper Table 6.1 structure - 2025 version
-    """
-    rows = []
-    unique_files = set(table_3_1_df["File Name"].unique()) | set(table_4_df["File Name"].unique()) | set(table_6_1_df["File Name"].unique())
-   
-    for idx, file_name in enumerate(unique_files):
-        # Get general details
-        file_general_details = general_df[general_df.index == idx].to_dict(orient='records')
-        if file_general_details:
-            general_info = file_general_details[0]
-        else:
-            general_info = {"GSTIN": "Unknown", "Legal Name": "Unknown", "Date": "Unknown",
-                           "Financial Year": "Unknown", "Period": "Unknown", "State": "Unknown"}
-       
-        base_row = {
-            "File Name": file_name,
-            "GSTIN": general_info.get("GSTIN", "Unknown"),
-            "State": general_info.get("State", "Unknown"),
-            "Legal Name": general_info.get("Legal Name", "Unknown"),
-            "Date": general_info.get("Date", "Unknown"),
-            "Financial Year": general_info.get("Financial Year", "Unknown"),
-            "Period": general_info.get("Period", "Unknown"),
-            "Data Type": "",
-            "Section": "",
-            "Description": "",
-            "Tax Payable": 0.0,
-            "Adjustment of Negative Liability": 0.0,
-            "Net Tax Payable": 0.0,
-            "Total Taxable Value": 0.0,
-            "Integrated Tax": 0.0,
-            "Central Tax": 0.0,
-            "State/UT Tax": 0.0,
-            "Cess": 0.0,
-            "Tax Paid Through ITC - Integrated": 0.0,
-            "Tax Paid Through ITC - Central": 0.0,
-            "Tax Paid Through ITC - State/UT": 0.0,
-            "Tax Paid Through ITC - Cess": 0.0,
-            "Tax Paid in Cash": 0.0,
-            "Interest Paid in Cash": 0.0,
-            "Late Fee Paid in Cash": 0.0
-        }
-       
-        # File header
-        header_row = base_row.copy()
-        header_row["Data Type"] = "FILE INFO"
-        header_row["Description"] = "File Information"
-        rows.append(header_row)
-       
-        # Table 3.1 data
-        file_table_3_1 = table_3_1_df[table_3_1_df["File Name"] == file_name]
-        if not file_table_3_1.empty:
-            for _, row in file_table_3_1.iterrows():
-                data_row = base_row.copy()
-                data_row["Data Type"] = "Table 3.1"
-                data_row["Description"] = row.get("Nature of Supplies", "")
-                data_row["Total Taxable Value"] = row.get("Total taxable value", 0.0)
-                data_row["Integrated Tax"] = row.get("Integrated tax", 0.0)
-                data_row["Central Tax"] = row.get("Central tax", 0.0)
-                data_row["State/UT Tax"] = row.get("State/UT tax", 0.0)
-                data_row["Cess"] = row.get("Cess", 0.0)
-                rows.append(data_row)
-       
-        # Table 4 data
-        file_table_4 = table_4_df[table_4_df["File Name"] == file_name]
-        if not file_table_4.empty:
-            for _, row in file_table_4.iterrows():
-                data_row = base_row.copy()
-                data_row["Data Type"] = "Table 4"
-                data_row["Description"] = row.get("Details", "")
-                data_row["Integrated Tax"] = row.get("Integrated tax", 0.0)
-                data_row["Central Tax"] = row.get("Central tax", 0.0)
-                data_row["State/UT Tax"] = row.get("State/UT tax", 0.0)
-                data_row["Cess"] = row.get("Cess", 0.0)
-                rows.append(data_row)
-       
-        # Table 6.1 data - Updated structure for 2025
-        file_table_6_1 = table_6_1_df[table_6_1_df["File Name"] == file_name]
-        if not file_table_6_1.empty:
-            for _, row in file_table_6_1.iterrows():
-                data_row = base_row.copy()
-                data_row["Data Type"] = "Table 6.1"
-                data_row["Section"] = row.get("Section", "")
-                data_row["Description"] = row.get("Tax Type", "")
-                data_row["Tax Payable"] = row.get("Tax payable", 0.0)
-                data_row["Adjustment of Negative Liability"] = row.get("Adjustment of negative liability", 0.0)
-                data_row["Net Tax Payable"] = row.get("Net Tax Payable", 0.0)
-                data_row["Tax Paid Through ITC - Integrated"] = row.get("Tax paid through ITC - Integrated tax", 0.0)
-                data_row["Tax Paid Through ITC - Central"] = row.get("Tax paid through ITC - Central tax", 0.0)
-                data_row["Tax Paid Through ITC - State/UT"] = row.get("Tax paid through ITC - State/UT tax", 0.0)
-                data_row["Tax Paid Through ITC - Cess"] = row.get("Tax paid through ITC - Cess", 0.0)
-                data_row["Tax Paid in Cash"] = row.get("Tax paid in cash", 0.0)
-                data_row["Interest Paid in Cash"] = row.get("Interest paid in cash", 0.0)
-                data_row["Late Fee Paid in Cash"] = row.get("Late fee paid in cash", 0.0)
-                rows.append(data_row)
-       
-        # Separator
-        separator_row = {k: "" for k in base_row.keys()}
-        separator_row["Description"] = "----------------------"
-        rows.append(separator_row)
-   
-    return pd.DataFrame(rows)
-
-# ...existing code...
+    with st.sidebar.expander("⏱️ Timing breakdown"):
+        st.caption(f"{run['doc_type']}: {len(run['files'])} file(s) extracted, {run['reused']} reused")
+        if run["files"]:
+            file_names, timings = zip(*run["files"])
+            st.write("Extraction, all files")
+            st.dataframe(breakdown(timings), hide_index=True, column_config=columns)
+            st.dataframe(file_breakdown(file_names, timings), hide_index=True)
+            st.write("Patterns, slowest first")
+            st.dataframe(pattern_breakdown(timings), hide_index=True, column_config=columns)
+        st.write("Batch")
+        st.dataframe(breakdown([run["batch"]]), hide_index=True, column_config=columns)
 
 # MAIN APPLICATION FLOW (fix: ensure all interfaces show up and filtering works)
 # Main Application Logic
@@ -2058,60 +203,13 @@ if gst_type == "GSTR-1":
     uploaded_files = st.file_uploader("", type=["pdf"], accept_multiple_files=True)
    
     if uploaded_files:
-        data = []
-        table_4A_data = []
-        table_4B_data = []
-        
-        for uploaded_file in uploaded_files:
-            pdf_bytes = uploaded_file.read()
-            details = extract_details(uploaded_file)
-            total_liability = extract_total_liability(pdf_bytes)
-            data.append([uploaded_file.name] + list(details.values()) + total_liability)
-            
-            # Extract Tables 4A and 4B
-            tables_4A_4B = extract_tables_4A_4B(pdf_bytes)
-            
-            # Process Table 4A
-            if tables_4A_4B["4A"]["data"]:
-                table_4A_data.append([
-                    uploaded_file.name,
-                    details["GSTIN"],
-                    details["State"],  # Added State column here
-                    details["Legal Name"],
-                    details["Month"],
-                    details["Financial Year"],
-                    tables_4A_4B["4A"]["data"]["No. of records"],
-                    tables_4A_4B["4A"]["data"]["Value"],
-                    tables_4A_4B["4A"]["data"]["Integrated Tax"],
-                    tables_4A_4B["4A"]["data"]["Central Tax"],
-                    tables_4A_4B["4A"]["data"]["State/UT Tax"],
-                    tables_4A_4B["4A"]["data"]["Cess"]
-                ])
-            
-            # Process Table 4B
-            if tables_4A_4B["4B"]["data"]:
-                table_4B_data.append([
-                    uploaded_file.name,
-                    details["GSTIN"],
-                    details["State"],  # Added State column here
-                    details["Legal Name"],
-                    details["Month"],
-                    details["Financial Year"],
-                    tables_4A_4B["4B"]["data"]["No. of records"],
-                    tables_4A_4B["4B"]["data"]["Value"],
-                    tables_4A_4B["4B"]["data"]["Integrated Tax"],
-                    tables_4A_4B["4B"]["data"]["Central Tax"],
-                    tables_4A_4B["4B"]["data"]["State/UT Tax"],
-                    tables_4A_4B["4B"]["data"]["Cess"]
-                ])
-       
-        columns = ["File Name", "GSTIN", "State", "Legal Name", "Month", "Financial Year", "Taxable Value", "IGST", "CGST", "SGST", "Cess"]
-        df = pd.DataFrame(data, columns=columns)
-        
-        # Create DataFrames for Tables 4A and 4B
-        columns_4AB = ["File Name", "GSTIN", "State", "Legal Name", "Month", "Financial Year", "No. of records", "Value", "Integrated Tax", "Central Tax", "State/UT Tax", "Cess"]
-        df_4A = pd.DataFrame(table_4A_data, columns=columns_4AB)
-        df_4B = pd.DataFrame(table_4B_data, columns=columns_4AB)
+        def build_batch():
+            gstr1_results = extract_uploaded_files(
+                uploaded_files, "GSTR-1", partial(extract_gstr1, max_workers=parallel_workers, corpus=corpus, cache=extraction_cache),
+                GSTR1_TABLES,
+            )
+            return gstr1_frames([uploaded_file.name for uploaded_file in uploaded_files], gstr1_results)
+        df, df_4A, df_4B = session_memo("gstr1_batch", uploaded_files, build_batch)
        
         st.write("### Total Liability (Outward supplies other than Reverse charge) ")
         st.dataframe(df)
@@ -2166,72 +264,64 @@ if gst_type == "GSTR-1":
         st.dataframe(filtered_df_4B)
        
         # Add Excel download functionality for GSTR-1
-        output_excel = "GSTR1_Filtered.xlsx"
-        with pd.ExcelWriter(output_excel) as writer:
-            # Only include filtered data in the Excel file
-            filtered_df.to_excel(writer, sheet_name="Filtered Total Liability", index=False)
-            filtered_df_4A.to_excel(writer, sheet_name="Filtered Table 4A", index=False)
-            filtered_df_4B.to_excel(writer, sheet_name="Filtered Table 4B", index=False)
-       
-        with open(output_excel, "rb") as f:
-            st.download_button("Download Filtered Data as Excel", f, file_name="GSTR1_Filtered.xlsx")
+        # Only include filtered data in the exports; they are built when a download is clicked
+        selection = [selected_month, selected_state, selected_gstin, selected_legal_name, selected_year]
+        exports = st.session_state.setdefault("gstr1_exports", {})
+        export_key = selection_hash([f.file_id for f in uploaded_files], selection)
+        sheets = {
+            "Filtered Total Liability": filtered_df,
+            "Filtered Table 4A": filtered_df_4A,
+            "Filtered Table 4B": filtered_df_4B,
+        }
+        st.download_button("Download Filtered Data as Excel", timed_download(deferred_workbook(exports, export_key, sheets), "GSTR1_Filtered.xlsx"), file_name="GSTR1_Filtered.xlsx", on_click="ignore")
+        for export_format in EXPORT_FORMATS:
+            st.download_button(
+                f"Download Filtered Data as {export_format.upper()}",
+                deferred_export(exports, (export_key, export_format), partial(archive_bytes, sheets, export_format)),
+                file_name=f"GSTR1_Filtered_{export_format}.zip", mime="application/zip", on_click="ignore",
+            )
 
 elif gst_type == "GSTR-3B" and gstr3b_year == "2024":
     st.title("📄 GSTR-3B Data Extraction Tool (2024)")
     st.write("Drag and Drop or Upload GSTR-3B PDFs to extract details")
     uploaded_files = st.file_uploader("", type="pdf", accept_multiple_files=True)
     if uploaded_files:
-        all_general_details = []
-        all_table_3_1 = []
-        all_table_4 = []
-        all_table_6_1 = []
-        for pdf_file in uploaded_files:
-            with pdfplumber.open(pdf_file) as pdf:
-                full_text = "\n".join([page.extract_text() for page in pdf.pages if page.extract_text()])
-                general_details = extract_general_details(full_text)
-                all_general_details.append(general_details)
-                table_3_1 = extract_table_3_1(pdf)
-                table_3_1["File Name"] = pdf_file.name
-                all_table_3_1.append(table_3_1)
-                table_4 = extract_table_4_2024(pdf)
-                table_4["File Name"] = pdf_file.name
-                all_table_4.append(table_4)
-                table_6_1 = extract_table_6_1_2024(pdf)
-                table_6_1["File Name"] = pdf_file.name
-                all_table_6_1.append(table_6_1)
+        def build_batch():
+            file_names = [pdf_file.name for pdf_file in uploaded_files]
+            results = extract_uploaded_files(
+                uploaded_files, "GSTR-3B 2024", partial(extract_gstr3b, year="2024", corpus=corpus, cache=extraction_cache),
+                GSTR3B_TABLES["2024"],
+                max_workers=parallel_workers,
+            )
+            general_df, final_table_3_1, final_table_4, final_table_6_1, combined_df = gstr3b_frames(
+                file_names, results, "2024", period_from_date=False
+            )
+            filter_index = FilterIndex(general_df, file_names, GSTR3B_FILTERS, {
+                "Table 3.1": final_table_3_1,
+                "Table 4": final_table_4,
+                "Table 6.1": final_table_6_1,
+                "Combined": combined_df,
+            })
+            return general_df, final_table_3_1, final_table_4, final_table_6_1, combined_df, filter_index
+        general_df, final_table_3_1, final_table_4, final_table_6_1, combined_df, filter_index = session_memo(
+            "gstr3b_2024_batch", uploaded_files, build_batch
+        )
         st.subheader("General Details")
-        general_df = pd.DataFrame(all_general_details)
         st.dataframe(general_df)
-        final_table_3_1 = pd.concat(all_table_3_1, ignore_index=True)
-        final_table_4 = pd.concat(all_table_4, ignore_index=True)
-        final_table_6_1 = pd.concat(all_table_6_1, ignore_index=True)
-        combined_df = create_combined_gstr3b_sheet_2024(general_df, final_table_3_1, final_table_4, final_table_6_1)
         st.write("### Filter Data")
         def multiselect_with_select_all(label, options):
             selected = st.multiselect(label, ["Select All"] + options, default=["Select All"])
             return options if "Select All" in selected else selected
-        months = general_df["Period"].dropna().unique().tolist()
-        states = [GST_STATE_CODES.get(gstin[:2], "Unknown") if gstin else "Unknown" for gstin in general_df["GSTIN"].dropna().unique()]
-        gstins = general_df["GSTIN"].dropna().unique().tolist()
-        legal_names = general_df["Legal Name"].dropna().unique().tolist()
-        financial_years = general_df["Financial Year"].dropna().unique().tolist()
-        selected_month = multiselect_with_select_all("Filter by Month", months)
-        selected_state = multiselect_with_select_all("Filter by State", states)
-        selected_gstin = multiselect_with_select_all("Filter by GSTIN", gstins)
-        selected_legal_name = multiselect_with_select_all("Filter by Legal Name", legal_names)
-        selected_year = multiselect_with_select_all("Filter by Financial Year", financial_years)
+        selections = {
+            column: multiselect_with_select_all(label, filter_index.options(column))
+            for column, label in GSTR3B_FILTERS.items()
+        }
         # Apply filters
-        filtered_general_df = general_df[
-            general_df["Period"].isin(selected_month) &
-            general_df["State"].isin(selected_state) &
-            general_df["GSTIN"].isin(selected_gstin) &
-            general_df["Legal Name"].isin(selected_legal_name) &
-            general_df["Financial Year"].isin(selected_year)
-        ]
-        filtered_table_3_1 = final_table_3_1[final_table_3_1["File Name"].isin(filtered_general_df.index.map(lambda i: uploaded_files[i].name))]
-        filtered_table_4 = final_table_4[final_table_4["File Name"].isin(filtered_general_df.index.map(lambda i: uploaded_files[i].name))]
-        filtered_table_6_1 = final_table_6_1[final_table_6_1["File Name"].isin(filtered_general_df.index.map(lambda i: uploaded_files[i].name))]
-        filtered_combined_df = combined_df[combined_df["File Name"].isin(filtered_general_df.index.map(lambda i: uploaded_files[i].name))]
+        filtered_general_df, filtered_tables = filter_index.apply(selections)
+        filtered_table_3_1 = rupees_frame(filtered_tables["Table 3.1"])
+        filtered_table_4 = rupees_frame(filtered_tables["Table 4"])
+        filtered_table_6_1 = rupees_frame(filtered_tables["Table 6.1"])
+        filtered_combined_df = rupees_frame(filtered_tables["Combined"])
         st.write("### Filtered General Details")
         st.dataframe(filtered_general_df)
         st.write("### Filtered Table 3.1 - Outward and Reverse Charge Supplies")
@@ -2242,72 +332,63 @@ elif gst_type == "GSTR-3B" and gstr3b_year == "2024":
         st.dataframe(filtered_table_6_1)
         st.write("### Filtered Combined GSTR-3B Data")
         st.dataframe(filtered_combined_df)
-        output_excel = "GSTR3B_2024_Filtered.xlsx"
-        with pd.ExcelWriter(output_excel) as writer:
-            filtered_combined_df.to_excel(writer, sheet_name="Filtered Combined Data", index=False)
-            filtered_general_df.to_excel(writer, sheet_name="Filtered General Details", index=False)
-            filtered_table_3_1.to_excel(writer, sheet_name="Filtered Table 3.1", index=False)
-            filtered_table_4.to_excel(writer, sheet_name="Filtered Table 4", index=False)
-            filtered_table_6_1.to_excel(writer, sheet_name="Filtered Table 6.1", index=False)
-        with open(output_excel, "rb") as f:
-            st.download_button("Download Filtered Data", f, file_name="GSTR3B_2024_Filtered.xlsx")
+        # Exports are built when a download is clicked
+        exports = st.session_state.setdefault("gstr3b_2024_exports", {})
+        export_key = selection_hash([f.file_id for f in uploaded_files], selections)
+        sheets = {
+            "Filtered Combined Data": filtered_combined_df,
+            "Filtered General Details": filtered_general_df,
+            "Filtered Table 3.1": filtered_table_3_1,
+            "Filtered Table 4": filtered_table_4,
+            "Filtered Table 6.1": filtered_table_6_1,
+        }
+        st.download_button("Download Filtered Data", timed_download(deferred_workbook(exports, export_key, sheets), "GSTR3B_2024_Filtered.xlsx"), file_name="GSTR3B_2024_Filtered.xlsx", on_click="ignore")
+        for export_format in EXPORT_FORMATS:
+            st.download_button(
+                f"Download Filtered Data as {export_format.upper()}",
+                deferred_export(exports, (export_key, export_format), partial(archive_bytes, sheets, export_format)),
+                file_name=f"GSTR3B_2024_Filtered_{export_format}.zip", mime="application/zip", on_click="ignore",
+            )
 
 elif gst_type == "GSTR-3B" and gstr3b_year == "2025":
     st.title("📄 GSTR-3B Data Extraction Tool (2025)")
     st.write("Drag and Drop or Upload GSTR-3B PDFs to extract details")
     uploaded_files = st.file_uploader("", type="pdf", accept_multiple_files=True)
     if uploaded_files:
-        all_general_details = []
-        all_table_3_1 = []
-        all_table_4 = []
-        all_table_6_1 = []
-        for pdf_file in uploaded_files:
-            with pdfplumber.open(pdf_file) as pdf:
-                full_text = "\n".join([page.extract_text() for page in pdf.pages if page.extract_text()])
-                general_details = extract_general_details(full_text)
-                all_general_details.append(general_details)
-                table_3_1 = extract_table_3_1(pdf)
-                table_3_1["File Name"] = pdf_file.name
-                all_table_3_1.append(table_3_1)
-                table_4 = extract_table_4_2025(pdf)
-                table_4["File Name"] = pdf_file.name
-                all_table_4.append(table_4)
-                table_6_1 = extract_table_6_1_2025(pdf)
-                table_6_1["File Name"] = pdf_file.name
-                all_table_6_1.append(table_6_1)
+        def build_batch():
+            file_names = [pdf_file.name for pdf_file in uploaded_files]
+            results = extract_uploaded_files(
+                uploaded_files, "GSTR-3B 2025", partial(extract_gstr3b, year="2025", corpus=corpus, cache=extraction_cache),
+                GSTR3B_TABLES["2025"],
+                max_workers=parallel_workers,
+            )
+            general_df, final_table_3_1, final_table_4, final_table_6_1, combined_df = gstr3b_frames(file_names, results, "2025")
+            filter_index = FilterIndex(general_df, file_names, GSTR3B_FILTERS, {
+                "Table 3.1": final_table_3_1,
+                "Table 4": final_table_4,
+                "Table 6.1": final_table_6_1,
+                "Combined": combined_df,
+            })
+            return general_df, final_table_3_1, final_table_4, final_table_6_1, combined_df, filter_index
+        general_df, final_table_3_1, final_table_4, final_table_6_1, combined_df, filter_index = session_memo(
+            "gstr3b_2025_batch", uploaded_files, build_batch
+        )
         st.subheader("General Details")
-        general_df = pd.DataFrame(all_general_details)
         st.dataframe(general_df)
-        final_table_3_1 = pd.concat(all_table_3_1, ignore_index=True)
-        final_table_4 = pd.concat(all_table_4, ignore_index=True)
-        final_table_6_1 = pd.concat(all_table_6_1, ignore_index=True)
-        combined_df = create_combined_gstr3b_sheet_2025(general_df, final_table_3_1, final_table_4, final_table_6_1)
         st.write("### Filter Data")
         def multiselect_with_select_all(label, options):
             selected = st.multiselect(label, ["Select All"] + options, default=["Select All"])
             return options if "Select All" in selected else selected
-        months = general_df["Period"].dropna().unique().tolist()
-        states = [GST_STATE_CODES.get(gstin[:2], "Unknown") if gstin else "Unknown" for gstin in general_df["GSTIN"].dropna().unique()]
-        gstins = general_df["GSTIN"].dropna().unique().tolist()
-        legal_names = general_df["Legal Name"].dropna().unique().tolist()
-        financial_years = general_df["Financial Year"].dropna().unique().tolist()
-        selected_month = multiselect_with_select_all("Filter by Month", months)
-        selected_state = multiselect_with_select_all("Filter by State", states)
-        selected_gstin = multiselect_with_select_all("Filter by GSTIN", gstins)
-        selected_legal_name = multiselect_with_select_all("Filter by Legal Name", legal_names)
-        selected_year = multiselect_with_select_all("Filter by Financial Year", financial_years)
+        selections = {
+            column: multiselect_with_select_all(label, filter_index.options(column))
+            for column, label in GSTR3B_FILTERS.items()
+        }
         # Apply filters
-        filtered_general_df = general_df[
-            general_df["Period"].isin(selected_month) &
-            general_df["State"].isin(selected_state) &
-            general_df["GSTIN"].isin(selected_gstin) &
-            general_df["Legal Name"].isin(selected_legal_name) &
-            general_df["Financial Year"].isin(selected_year)
-        ]
-        filtered_table_3_1 = final_table_3_1[final_table_3_1["File Name"].isin(filtered_general_df.index.map(lambda i: uploaded_files[i].name))]
-        filtered_table_4 = final_table_4[final_table_4["File Name"].isin(filtered_general_df.index.map(lambda i: uploaded_files[i].name))]
-        filtered_table_6_1 = final_table_6_1[final_table_6_1["File Name"].isin(filtered_general_df.index.map(lambda i: uploaded_files[i].name))]
-        filtered_combined_df = combined_df[combined_df["File Name"].isin(filtered_general_df.index.map(lambda i: uploaded_files[i].name))]
+        filtered_general_df, filtered_tables = filter_index.apply(selections)
+        filtered_table_3_1 = rupees_frame(filtered_tables["Table 3.1"])
+        filtered_table_4 = rupees_frame(filtered_tables["Table 4"])
+        filtered_table_6_1 = rupees_frame(filtered_tables["Table 6.1"])
+        filtered_combined_df = rupees_frame(filtered_tables["Combined"])
         st.write("### Filtered General Details")
         st.dataframe(filtered_general_df)
         st.write("### Filtered Table 3.1 - Outward and Reverse Charge Supplies")
@@ -2318,12 +399,22 @@ elif gst_type == "GSTR-3B" and gstr3b_year == "2025":
         st.dataframe(filtered_table_6_1)
         st.write("### Filtered Combined GSTR-3B Data")
         st.dataframe(filtered_combined_df)
-        output_excel = "GSTR3B_2025_Filtered.xlsx"
-        with pd.ExcelWriter(output_excel) as writer:
-            filtered_combined_df.to_excel(writer, sheet_name="Filtered Combined Data", index=False)
-            filtered_general_df.to_excel(writer, sheet_name="Filtered General Details", index=False)
-            filtered_table_3_1.to_excel(writer, sheet_name="Filtered Table 3.1", index=False)
-            filtered_table_4.to_excel(writer, sheet_name="Filtered Table 4", index=False)
-            filtered_table_6_1.to_excel(writer, sheet_name="Filtered Table 6.1", index=False)
-        with open(output_excel, "rb") as f:
-            st.download_button("Download Filtered Data", f, file_name="GSTR3B_2025_Filtered.xlsx")
+        # Exports are built when a download is clicked
+        exports = st.session_state.setdefault("gstr3b_2025_exports", {})
+        export_key = selection_hash([f.file_id for f in uploaded_files], selections)
+        sheets = {
+            "Filtered Combined Data": filtered_combined_df,
+            "Filtered General Details": filtered_general_df,
+            "Filtered Table 3.1": filtered_table_3_1,
+            "Filtered Table 4": filtered_table_4,
+            "Filtered Table 6.1": filtered_table_6_1,
+        }
+        st.download_button("Download Filtered Data", timed_download(deferred_workbook(exports, export_key, sheets), "GSTR3B_2025_Filtered.xlsx"), file_name="GSTR3B_2025_Filtered.xlsx", on_click="ignore")
+        for export_format in EXPORT_FORMATS:
+            st.download_button(
+                f"Download Filtered Data as {export_format.upper()}",
+                deferred_export(exports, (export_key, export_format), partial(archive_bytes, sheets, export_format)),
+                file_name=f"GSTR3B_2025_Filtered_{export_format}.zip", mime="application/zip", on_click="ignore",
+            )
+
+show_stage_timings()
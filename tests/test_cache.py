@@ -0,0 +1,26 @@
+import pandas as pd
+
+from extraction.cache import ExtractionCache
+
+
+def test_error_frames_are_not_cached(tmp_path):
+    cache = ExtractionCache(tmp_path)
+    calls = []
+
+    def extract():
+        calls.append(1)
+        return pd.DataFrame({"Error": ["No /Root object! - Is this really a PDF?"]})
+
+    for _ in range(2):
+        result = cache.get_or_extract("Form24Q", b"%PDF", extract)
+        assert result.columns.tolist() == ["Error"]
+    assert len(calls) == 2
+    assert not list(tmp_path.glob("*.pkl"))
+
+
+def test_replaced_entries_are_counted_once(tmp_path):
+    cache = ExtractionCache(tmp_path)
+    result = pd.DataFrame({"TAN": ["ABCD12345E"], "Challan No.": ["12345"]})
+    for _ in range(3):
+        cache.put("Form24Q", "a" * 64, result)
+    assert cache._size == cache._disk_usage()
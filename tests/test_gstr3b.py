@@ -0,0 +1,22 @@
+import copy
+
+from extraction.gstr3b import extract_gstr3b, gstr3b_frames
+from extraction.synthetic import gstr3b_pdf
+
+
+def _late_return():
+    result = extract_gstr3b(gstr3b_pdf("2024", pages=3, seed=1), "2024")
+    result["general_details"].update(Period="August", Date="20/10/2023")
+    return result
+
+
+def test_2024_period_is_the_arn_month_by_default():
+    general_df = gstr3b_frames(["late.pdf"], [_late_return()], "2024")[0]
+    assert general_df["Period"].tolist() == ["October"]
+
+
+def test_2024_period_printed_on_the_return_is_kept():
+    result = _late_return()
+    general_df, *_, combined_df = gstr3b_frames(["late.pdf"], [copy.deepcopy(result)], "2024", period_from_date=False)
+    assert general_df["Period"].tolist() == ["August"]
+    assert set(combined_df["Period"]) - {""} == {"August"}
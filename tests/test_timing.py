@@ -0,0 +1,22 @@
+from extraction.patterns import TDS_PAYMENTS
+from extraction.timing import REGEX_MATCHING, StageTimings, measure, pattern_breakdown
+
+TEXT = "TAN : ABCD12345E\nChallan No : 12345\n"
+
+
+def test_patterns_are_counted_while_timings_are_active():
+    (tan, challan), timings = measure(lambda: (TDS_PAYMENTS.tan.search(TEXT), TDS_PAYMENTS.tender_date.search(TEXT)))
+    assert tan.group(1) == "ABCD12345E" and challan is None
+    assert timings.calls[REGEX_MATCHING] == 2
+    rows = pattern_breakdown([timings]).set_index("Pattern")
+    assert rows.loc["tan", ["Calls", "Matches", "Misses"]].tolist() == [1, 1, 0]
+    assert rows.loc["tender_date", ["Calls", "Matches", "Misses"]].tolist() == [1, 0, 1]
+
+
+def test_patterns_are_not_timed_outside_of_timings():
+    timings = StageTimings()
+    with timings.active():
+        pass
+    assert TDS_PAYMENTS.challan_no.findall(TEXT) == ["12345"]
+    assert [m.group(1) for m in TDS_PAYMENTS.challan_no.finditer(TEXT)] == ["12345"]
+    assert not timings.calls and not timings.patterns
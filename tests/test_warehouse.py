@@ -0,0 +1,69 @@
+import copy
+from io import BytesIO
+
+import pytest
+
+from extraction.gstr3b import extract_gstr3b
+from extraction.synthetic import form24q_pdf, form26q_pdf, gstr3b_pdf, hdfc_challan_pdf, itd_challan_pdf
+from extraction.tds import extract_tds_document
+from extraction.warehouse import Warehouse, document_key
+
+
+@pytest.fixture
+def warehouse(tmp_path):
+    return Warehouse(tmp_path / "warehouse.sqlite3")
+
+
+def test_gstr3b_2024_returns_filed_in_one_month_are_kept_apart(warehouse):
+    late = extract_gstr3b(gstr3b_pdf("2024", pages=3, seed=1), "2024")
+    current = copy.deepcopy(late)
+    late["general_details"].update(Period="August", Date="20/10/2023")
+    current["general_details"].update(Period="September", Date="20/10/2023")
+
+    warehouse.store("GSTR-3B 2024", ["late.pdf", "current.pdf"], [late, current], ["a" * 64, "b" * 64])
+
+    documents = warehouse.documents("GSTR-3B 2024")
+    assert sorted(documents["period"]) == ["August", "September"]
+    assert sorted(documents["file_name"]) == ["current.pdf", "late.pdf"]
+
+
+def test_gstr3b_2024_amended_return_replaces_the_original(warehouse):
+    original = extract_gstr3b(gstr3b_pdf("2024", pages=3, seed=1), "2024")
+    warehouse.store("GSTR-3B 2024", ["original.pdf"], [original], ["a" * 64])
+    warehouse.store("GSTR-3B 2024", ["amended.pdf"], [original], ["b" * 64])
+    assert warehouse.documents("GSTR-3B 2024")["file_name"].tolist() == ["amended.pdf"]
+
+
+def test_form24q_correction_replaces_the_original(warehouse):
+    original = extract_tds_document(BytesIO(form24q_pdf(seed=1)), "Form24Q")
+    corrected = original.assign(**{"Type of Statement": "Correction", "Total Tax Deducted (₹)": "1.00"})
+    assert document_key("Form24Q", original) == tuple(original.loc[0, ["TAN", "Financial Year", "Quarter"]])
+
+    warehouse.store("Form24Q", ["original.pdf"], [original], ["a" * 64])
+    warehouse.store("Form24Q", ["corrected.pdf"], [corrected], ["b" * 64])
+
+    documents = warehouse.documents("Form24Q", party=original.at[0, "TAN"], financial_year=original.at[0, "Financial Year"])
+    assert documents["file_name"].tolist() == ["corrected.pdf"]
+    assert documents["period"].tolist() == [original.at[0, "Quarter"]]
+    rows = warehouse.table("Extracted Data", "Form24Q")
+    assert rows["Type of Statement"].tolist() == ["Correction"]
+
+
+def test_hdfc_challans_are_keyed_by_challan_number():
+    result = extract_tds_document(BytesIO(hdfc_challan_pdf(seed=1)), "HDFC Bank")
+    party, financial_year, challan = document_key("HDFC Bank", result)
+    assert (party, challan) == (result.at[0, "TAN"], str(result.at[0, "Challan No"]))
+    assert financial_year == "2024-25"  # received on 21/07/2024
+
+
+def test_form26q_statements_are_keyed_by_form_and_quarter():
+    result = extract_tds_document(BytesIO(form26q_pdf(seed=1)), "Form26Q & Form27Q")
+    assert document_key("Form26Q & Form27Q", result) == (result.at[0, "TAN"], "2023-24", "26Q Q1")
+
+
+def test_income_tax_challans_are_keyed_by_tan(warehouse):
+    doc_type = "Income Tax Department with Tax Breakup"
+    result = extract_tds_document(BytesIO(itd_challan_pdf(breakup=True, seed=1)), doc_type)
+    party, financial_year, challan = document_key(doc_type, result)
+    assert party and financial_year and challan
+    assert (party, financial_year, challan) == (result.at[0, "TAN"], result.at[0, "Financial Year"], result.at[0, "Challan No."])